@@ -1,38 +1,36 @@
 # agents/news_agent.py
 import asyncio
-import os
-import sys
-from typing import Dict, List, Any
-from dotenv import load_dotenv
-import google.generativeai as genai
+from typing import Dict, List, Any, Optional
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.news_tool import get_news_for_intent
+from tools.enhanced_news_tool import MultiSourceNewsAggregator
+from tools.llm_client import LLMClient
+from tools.intent_parser import parse_intent, FAST_PATH_MIN_CONFIDENCE
+from models.intent import BriefingIntent, clean_value, normalize_country
+from models.deadline import Deadline
 
-from tools.news_tool import get_news_data
-
-# Load environment variables from parent directory
-load_dotenv(os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env'))
+class NewsDataError(Exception):
+    """The news tool answered with an error instead of articles"""
 
 class NewsAgent:
-    def __init__(self):
+    def __init__(self, llm: Optional[LLMClient] = None, aggregator: Optional[MultiSourceNewsAggregator] = None):
         """
         Your second intelligent agent, Master Aniruddh!
         This agent specializes in curating and presenting news for your daily briefing.
+        The application container passes its shared LLM client and news aggregator.
         """
-        # Configure Google AI Studio
-        api_key = os.getenv("GOOGLE_AI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("Google AI API key not found. Please set GOOGLE_AI_API_KEY in your .env file")
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-flash-lite-latest')
+        # Share the caller's client when given one; standalone use creates its own
+        self.llm = llm or LLMClient('gemini-flash-lite-latest')
+        self.aggregator = aggregator
         
     async def get_news_briefing(
         self,
-        user_request: str,
+        user_request: str = "",
         location: str = None,
         country: str = None,
-        category: str = None
+        category: str = None,
+        intent: Optional[BriefingIntent] = None,
+        deadline: Optional[Deadline] = None
     ) -> str:
         """
         Enhanced news curation with robust fallback strategies.
@@ -43,96 +41,69 @@ class NewsAgent:
             location: Specific city/region (e.g., "Mumbai", "London") - makes news location-specific
             country: Country code (e.g., "in", "us", "uk") - filters news by country
             category: News category (e.g., "technology", "business")
+            intent: Intent already parsed by the orchestrator - takes precedence over
+                the other parameters and skips all request parsing
+            deadline: Request deadline; news sources still running when it passes
+                are dropped and the briefing is written from what arrived
+
+        Failures come back as an apology for the user; the orchestrator calls
+        write_news_briefing instead so it can retry them.
         """
-        # If structured parameters provided, use them directly (no re-parsing needed)
-        if location or country or category:
-            final_category = category or "general"
-            final_country = country or "us"
-            final_location = location or ""
-            count = 5
-        else:
-            # Fall back to AI analysis if no structured parameters
-            analysis_prompt = f"""
-Analyze this news request: "{user_request}"
+        if intent is None:
+            intent = await self._resolve_intent(user_request, location, country, category, deadline)
+        try:
+            return await self.write_news_briefing(user_request, intent=intent, deadline=deadline)
+        except NewsDataError:
+            # Try to provide a fallback response based on the request
+            return await self._generate_fallback_response(
+                user_request or intent.user_request, intent.primary_category, intent.country or "us",
+                intent.news_location or intent.city or "", deadline
+            )
+        except Exception as e:
+            return f"I encountered an error processing your news request: {str(e)}"
 
-Extract these parameters clearly:
-1. Category: technology, business, health, sports, entertainment, general. Use 'general' if no strong category is detected.
-2. Country preference: use valid country code (us, in, uk, etc.). Extract from request, do not default.
-3. Specific location: city or region name if mentioned (e.g., Mumbai, London, New York)
-4. Number of articles to retrieve: default 5, maximum 10.
+    async def write_news_briefing(
+        self,
+        user_request: str = "",
+        location: str = None,
+        country: str = None,
+        category: str = None,
+        intent: Optional[BriefingIntent] = None,
+        deadline: Optional[Deadline] = None
+    ) -> str:
+        """Same as get_news_briefing, but failures raise (NewsDataError when no source answered)"""
+        # Resolve parameters once: orchestrator intent, explicit arguments, local parser, then LLM
+        if intent is None:
+            intent = await self._resolve_intent(user_request, location, country, category, deadline)
+        user_request = user_request or intent.user_request
 
-Respond ONLY in this format exactly:
-CATEGORY: [category]
-COUNTRY: [country code or "none"]
-LOCATION: [location name or "none"]
-COUNT: [number]
-"""
+        final_category = intent.primary_category
+        final_country = intent.country or "us"
+        final_location = intent.news_location or intent.city or ""
 
-            try:
-                # Get AI analysis
-                response = await self.model.generate_content_async(analysis_prompt)
-                analysis = response.text
+        # Fetch location-aware news (query includes the location for geo-specific results)
+        news_data = await get_news_for_intent(intent, deadline=deadline, aggregator=self.aggregator)
+        
+        # Enhanced error handling
+        if news_data.get("status") == "error" or "error" in news_data:
+            raise NewsDataError(news_data.get("error", "Unknown error occurred"))
 
-                # Parse the analysis
-                final_category = self._extract_value(analysis, "CATEGORY:") or "general"
-                extracted_country = self._extract_value(analysis, "COUNTRY:")
-                extracted_location = self._extract_value(analysis, "LOCATION:")
+        # Check if we have valid articles
+        articles = news_data.get("articles", [])
+        if not articles:
+            # Generate a meaningful response even without articles
+            fallback_response = await self._generate_fallback_response(
+                user_request, final_category, final_country, final_location, deadline
+            )
+            return fallback_response
 
-                # Only use defaults if truly not specified
-                final_country = extracted_country if extracted_country and extracted_country not in ["unspecified", "unknown", "none"] else "us"
-                final_location = extracted_location if extracted_location and extracted_location not in ["unspecified", "unknown", "none"] else ""
-                count = int(self._extract_value(analysis, "COUNT:") or "5")
+        # Let AI create a curated briefing with enhanced context
+        articles_summary = self._format_articles_for_ai(articles)
 
-            except Exception as e:
-                # Fallback to safe defaults on analysis error
-                final_category = "general"
-                final_country = "us"
-                final_location = ""
-                count = 5
+        # Build location context for briefing
+        location_context = f"Location: {final_location}, Country: {final_country.upper()}" if final_location else f"Country: {final_country.upper()}"
 
-        try:
-            # Build location-aware search query
-            # CRITICAL FIX: Include location in query for geo-specific results
-            if final_location:
-                # Location-specific query: "Mumbai technology" or "London business"
-                search_query = f"{final_location} {final_category}"
-            else:
-                # Category-only query if no location
-                search_query = final_category
-
-            # Fetch news data using enhanced tool with fallbacks
-            news_data = await get_news_data(
-                query=search_query,  # Now includes location for geo-specific results!
-                category=final_category,
-                country=final_country,
-                max_articles=min(count, 10)  # Respect rate limits
-            )
-            
-            # Enhanced error handling
-            if news_data.get("status") == "error" or "error" in news_data:
-                error_msg = news_data.get("error", "Unknown error occurred")
-                # Try to provide a fallback response based on the request
-                fallback_response = await self._generate_fallback_response(
-                    user_request, final_category, final_country, final_location
-                )
-                return fallback_response
-
-            # Check if we have valid articles
-            articles = news_data.get("articles", [])
-            if not articles:
-                # Generate a meaningful response even without articles
-                fallback_response = await self._generate_fallback_response(
-                    user_request, final_category, final_country, final_location
-                )
-                return fallback_response
-
-            # Let AI create a curated briefing with enhanced context
-            articles_summary = self._format_articles_for_ai(articles)
-
-            # Build location context for briefing
-            location_context = f"Location: {final_location}, Country: {final_country.upper()}" if final_location else f"Country: {final_country.upper()}"
-
-            briefing_prompt = f"""
+        briefing_prompt = f"""
 Create a professional news briefing based on these articles:
 
 {articles_summary}
@@ -151,18 +122,77 @@ Guidelines:
 Make it sound like a professional news briefing {"for " + final_location if final_location else "for " + final_country.upper() + " audience"}.
 """
 
-            final_response = await self.model.generate_content_async(briefing_prompt)
-            return final_response.text
-            
-        except Exception as e:
-            return f"I encountered an error processing your news request: {str(e)}"
+        return await self.llm.generate(briefing_prompt, call_site="news_briefing", deadline=deadline)
     
+    async def _resolve_intent(
+        self,
+        user_request: str,
+        location: str = None,
+        country: str = None,
+        category: str = None,
+        deadline: Optional[Deadline] = None
+    ) -> BriefingIntent:
+        """Build a news intent from explicit parameters, the local parser or, as a last resort, the LLM"""
+        # If structured parameters provided, use them directly (no re-parsing needed)
+        if location or country or category:
+            return BriefingIntent(
+                needs_news=True,
+                country=normalize_country(country),
+                news_categories=(category,) if clean_value(category) else (),
+                news_location=clean_value(location),
+                source="structured",
+                user_request=user_request
+            )
+
+        # Common request shapes resolve locally without an LLM round-trip
+        intent = parse_intent(user_request)
+        if intent.confidence >= FAST_PATH_MIN_CONFIDENCE and intent.needs_news:
+            return intent
+
+        # Fall back to AI analysis if no structured parameters
+        analysis_prompt = f"""
+Analyze this news request: "{user_request}"
+
+Extract these parameters clearly:
+1. Category: technology, business, health, sports, entertainment, general. Use 'general' if no strong category is detected.
+2. Country preference: use valid country code (us, in, uk, etc.). Extract from request, do not default.
+3. Specific location: city or region name if mentioned (e.g., Mumbai, London, New York)
+4. Number of articles to retrieve: default 5, maximum 10.
+
+Respond ONLY in this format exactly:
+CATEGORY: [category]
+COUNTRY: [country code or "none"]
+LOCATION: [location name or "none"]
+COUNT: [number]
+"""
+
+        try:
+            # Get AI analysis
+            analysis = await self.llm.generate(analysis_prompt, call_site="news_analysis", deadline=deadline)
+
+            # Parse the analysis - placeholders such as "none" become None
+            extracted_category = clean_value(self._extract_value(analysis, "CATEGORY:"))
+            return BriefingIntent(
+                needs_news=True,
+                country=normalize_country(self._extract_value(analysis, "COUNTRY:")),
+                news_categories=(extracted_category.lower(),) if extracted_category else (),
+                news_location=clean_value(self._extract_value(analysis, "LOCATION:")),
+                article_count=int(self._extract_value(analysis, "COUNT:") or "5"),
+                source="llm",
+                user_request=user_request
+            )
+
+        except Exception:
+            # Fallback to safe defaults on analysis error
+            return BriefingIntent(needs_news=True, source="llm", user_request=user_request)
+
     async def _generate_fallback_response(
         self,
         user_request: str,
         category: str,
         country: str,
-        location: str = None
+        location: str = None,
+        deadline: Optional[Deadline] = None
     ) -> str:
         """Generate a meaningful response when no news articles are available"""
         location_info = f"location: {location}, " if location else ""
@@ -180,8 +210,7 @@ Keep it concise and actionable.
 """
 
         try:
-            response = await self.model.generate_content_async(fallback_prompt)
-            return response.text
+            return await self.llm.generate(fallback_prompt, call_site="news_fallback", deadline=deadline)
         except Exception:
             location_str = f" in {location}" if location else ""
             return f"I apologize, but I'm currently unable to fetch news for {category}{location_str} from {country}. This could be due to API limitations or regional availability. Please try again later or consider a broader search term."
@@ -202,16 +231,25 @@ Keep it concise and actionable.
             if not article.get('title') or not article.get('description'):
                 continue
                 
+            # Aggregator and article store use published_at; NewsAPI passthroughs use publishedAt
+            published = article.get('published_at') or article.get('publishedAt') or "Unknown"
             formatted.append(f"""
 Article {i}:
 Title: {article['title']}
-Source: {article['source']['name']}
+Source: {self._source_name(article.get('source'))}
 Description: {article['description']}
-Published: {article['publishedAt']}
+Published: {published}
 """)
         
         return "\n".join(formatted)
 
+    @staticmethod
+    def _source_name(source: Any) -> str:
+        """Source is {"name": ...} from most providers, a plain string from some"""
+        if isinstance(source, dict):
+            return source.get('name') or "Unknown"
+        return source or "Unknown"
+
 # Test function following your testing best practices
 async def test_news_agent():
     """Comprehensive testing as per your deployment checklist"""
@@ -233,5 +271,6 @@ async def test_news_agent():
         print(f"📰 Agent: {response}")
         print("-" * 50)
 
+# Run from daily_briefing_generator/: python -m agents.news_agent
 if __name__ == "__main__":
     asyncio.run(test_news_agent())
@@ -1,36 +1,62 @@
 # agents/weather_agent.py
 import asyncio
-import os
-import sys
-from typing import Dict, Any
-from dotenv import load_dotenv
-import google.generativeai as genai
+from typing import Dict, Any, Optional
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.weather_tool import get_weather_for_intent
+from tools.llm_client import LLMClient
+from tools.intent_parser import parse_intent, FAST_PATH_MIN_CONFIDENCE
+from models.intent import BriefingIntent, clean_value, normalize_country
+from models.deadline import Deadline
 
-from tools.weather_tool import get_weather_data
+class WeatherDataError(Exception):
+    """The weather tool answered with an error instead of a reading"""
 
-load_dotenv()
+class LocationUnknownError(Exception):
+    """Neither the request nor the analysis named a city to report on"""
 
 class WeatherAgent:
-    def __init__(self):
+    def __init__(self, llm: Optional[LLMClient] = None):
         """
         Your first intelligent agent, Master Aniruddh!
         This agent combines AI reasoning with real-world weather data.
+        The application container passes its shared LLM client.
         """
-        # Configure Google AI Studio
-        api_key = os.getenv("GOOGLE_AI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("Google AI API key not found. Please set GOOGLE_AI_API_KEY in your .env file")
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-flash-lite-latest')
+        # Share the caller's client when given one; standalone use creates its own
+        self.llm = llm or LLMClient('gemini-flash-lite-latest')
         
-    async def get_weather_briefing(self, user_request: str) -> str:
+    async def get_weather_briefing(self, user_request: str = "", intent: Optional[BriefingIntent] = None,
+                                   deadline: Optional[Deadline] = None) -> str:
         """
         This is where your agent becomes intelligent!
         It analyzes the user's request and decides how to respond.
+
+        Args:
+            user_request: Natural language request from user
+            intent: Intent already parsed by the orchestrator - when it names a
+                city, no further parsing (and no analysis LLM call) is needed
+            deadline: Request deadline; the weather call and LLM calls stay within it
+
+        Failures come back as an apology for the user; the orchestrator calls
+        write_weather_briefing instead so it can retry them.
         """
+        try:
+            return await self.write_weather_briefing(user_request, intent, deadline)
+        except LocationUnknownError:
+            return "I couldn't identify which city you're asking about. Could you please specify?"
+        except WeatherDataError as e:
+            return f"Sorry, I couldn't get weather data: {str(e)}"
+        except Exception as e:
+            return f"I encountered an error processing your request: {str(e)}"
+
+    async def write_weather_briefing(self, user_request: str = "", intent: Optional[BriefingIntent] = None,
+                                     deadline: Optional[Deadline] = None) -> str:
+        """
+        Same as get_weather_briefing, but failures raise: WeatherDataError for
+        the weather tool's errors, LocationUnknownError when no city was named
+        """
+        if intent is not None:
+            user_request = user_request or intent.user_request
+        
         # First, let the AI understand what the user wants
         analysis_prompt = f"""
         Analyze this weather request: "{user_request}"
@@ -46,45 +72,48 @@ class WeatherAgent:
         REQUEST_TYPE: [brief description]
         """
         
-        try:
-            # Get AI analysis
-            response = await self.model.generate_content_async(analysis_prompt)
-            analysis = response.text
-            
-            # Parse the AI's analysis
-            city = self._extract_value(analysis, "CITY:")
-            country = self._extract_value(analysis, "COUNTRY:")
-            
-            if not city:
-                return "I couldn't identify which city you're asking about. Could you please specify?"
-            
-            # Fetch real weather data using your tool
-            weather_data = await get_weather_data(city, country or "US")
-            
-            if "error" in weather_data:
-                return f"Sorry, I couldn't get weather data: {weather_data['error']}"
-            
-            # Let AI create a natural response
-            briefing_prompt = f"""
-            Create a natural, conversational weather briefing based on this data:
-            
-            City: {weather_data['name']}, {weather_data['sys']['country']}
-            Temperature: {weather_data['main']['temp']}°C
-            Feels like: {weather_data['main']['feels_like']}°C
-            Weather: {weather_data['weather'][0]['description']}
-            Humidity: {weather_data['main']['humidity']}%
-            Wind: {weather_data['wind']['speed']} m/s
-            
-            User's original request: "{user_request}"
-            
-            Make it conversational and helpful, addressing their specific request.
-            """
-            
-            final_response = await self.model.generate_content_async(briefing_prompt)
-            return final_response.text
-            
-        except Exception as e:
-            return f"I encountered an error processing your request: {str(e)}"
+        # Use the orchestrator's intent, then the local parser, and only then the LLM
+        if intent is None or not intent.city:
+            intent = parse_intent(user_request)
+            if intent.confidence < FAST_PATH_MIN_CONFIDENCE or not intent.city:
+                # Get AI analysis
+                analysis = await self.llm.generate(analysis_prompt, call_site="weather_analysis", deadline=deadline)
+                
+                # Parse the AI's analysis
+                intent = BriefingIntent(
+                    needs_weather=True,
+                    city=clean_value(self._extract_value(analysis, "CITY:")),
+                    country=normalize_country(self._extract_value(analysis, "COUNTRY:")),
+                    source="llm",
+                    user_request=user_request
+                )
+        
+        if not intent.city:
+            raise LocationUnknownError(user_request)
+        
+        # Fetch real weather data using your tool
+        weather_data = await get_weather_for_intent(intent, deadline=deadline)
+        
+        if "error" in weather_data:
+            raise WeatherDataError(weather_data['error'])
+        
+        # Let AI create a natural response
+        briefing_prompt = f"""
+        Create a natural, conversational weather briefing based on this data:
+        
+        City: {weather_data['name']}, {weather_data['sys']['country']}
+        Temperature: {weather_data['main']['temp']}°C
+        Feels like: {weather_data['main']['feels_like']}°C
+        Weather: {weather_data['weather'][0]['description']}
+        Humidity: {weather_data['main']['humidity']}%
+        Wind: {weather_data['wind']['speed']} m/s
+        
+        User's original request: "{user_request}"
+        
+        Make it conversational and helpful, addressing their specific request.
+        """
+        
+        return await self.llm.generate(briefing_prompt, call_site="weather_briefing", deadline=deadline)
     
     def _extract_value(self, text: str, key: str) -> str:
         """Helper method to parse AI responses"""
@@ -111,5 +140,6 @@ async def test_weather_agent():
         print(f"🌤️  Agent: {response}")
         print("-" * 50)
 
+# Run from daily_briefing_generator/: python -m agents.weather_agent
 if __name__ == "__main__":
     asyncio.run(test_weather_agent())
@@ -0,0 +1,157 @@
+"""
+Daily Briefing Generator - Startup Benchmark
+
+Measures cold-start cost of the two entry points in fresh interpreters:
+  - import time: `python -X importtime`, summed per top-level package
+  - time to serving: process start until the CLI shows its prompt, or the
+    web app has finished its startup (lifespan) and answers probes
+  - time to ready: until the web app's readiness check passes (the Gemini
+    SDK is loaded in the background after startup)
+
+Run from the daily_briefing_generator/ directory:
+  python benchmark_startup.py                 # 5 runs per target, median reported
+  python benchmark_startup.py --runs 10 --top 15
+  python benchmark_startup.py --json          # Machine-readable, e.g. to track in CI
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(PACKAGE_DIR, "web_interface", "backend")
+
+# Each child prints a line per milestone, then shuts down cleanly
+CLI_READY = """
+import asyncio
+import main
+
+async def ready():
+    container = main.build_container()
+    print('SERVING', flush=True)
+    print('READY', flush=True)
+    await container.close()
+
+asyncio.run(ready())
+"""
+WEB_READY = """
+import asyncio
+from app import app
+from routes.health import health_monitor
+
+async def ready():
+    async with app.router.lifespan_context(app):
+        print('SERVING', flush=True)
+        while not health_monitor.readiness()[0]:
+            await asyncio.sleep(0.01)
+        print('READY', flush=True)
+
+asyncio.run(ready())
+"""
+MILESTONES = ("SERVING", "READY")
+
+TARGETS = {
+    "main.py": (PACKAGE_DIR, "import main", CLI_READY),
+    "web_interface/backend/app.py": (BACKEND_DIR, "import app", WEB_READY),
+}
+
+
+def _child_env() -> Dict[str, str]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = PACKAGE_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    # Startup must not depend on real credentials or reach out to upstreams
+    env.setdefault("GOOGLE_AI_API_KEY", "benchmark-placeholder")
+    env["HEALTH_CANARY_ENABLED"] = "false"
+    env["NEWS_INGESTION_ENABLED"] = "false"
+    return env
+
+
+def time_to_milestones(cwd: str, code: str) -> Dict[str, float]:
+    """Seconds from spawning the interpreter until the child reports each milestone"""
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", code], cwd=cwd, env=_child_env(),
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    reached = {}
+    try:
+        for line in process.stdout:
+            if line.strip() in MILESTONES:
+                reached[line.strip()] = time.perf_counter() - started
+    finally:
+        process.stdout.close()
+        process.wait()
+    if len(reached) < len(MILESTONES):
+        raise RuntimeError(f"child exited with {process.returncode} before becoming ready")
+    return reached
+
+
+def import_times(cwd: str, code: str) -> Tuple[float, Dict[str, float]]:
+    """Total import seconds and seconds spent per top-level package, from -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=_child_env(),
+                            capture_output=True, text=True, check=True)
+    packages: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        # Self time, so google.generativeai's dependencies count towards their own packages
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1e6
+    return sum(packages.values()), packages
+
+
+def benchmark(runs: int, top: int) -> Dict[str, Dict[str, object]]:
+    report = {}
+    for target, (cwd, import_code, ready_code) in TARGETS.items():
+        samples = [time_to_milestones(cwd, ready_code) for _ in range(runs)]
+        total, packages = import_times(cwd, import_code)
+        slowest: List[Tuple[str, float]] = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        report[target] = {
+            f"time_to_{milestone.lower()}_ms": _summary([sample[milestone] for sample in samples])
+            for milestone in MILESTONES
+        }
+        report[target].update({
+            "import_ms": round(total * 1000, 1),
+            "slowest_imports_ms": {name: round(seconds * 1000, 1) for name, seconds in slowest}
+        })
+    return report
+
+
+def _summary(seconds: List[float]) -> Dict[str, float]:
+    return {
+        "median": round(statistics.median(seconds) * 1000, 1),
+        "min": round(min(seconds) * 1000, 1),
+        "max": round(max(seconds) * 1000, 1),
+        "runs": len(seconds)
+    }
+
+
+def print_report(report: Dict[str, Dict[str, object]]):
+    for target, result in report.items():
+        print(f"⏱️  {target}")
+        for milestone in MILESTONES:
+            times = result[f"time_to_{milestone.lower()}_ms"]
+            print(f"   Time to {milestone.lower()}: {times['median']} ms median "
+                  f"({times['min']}-{times['max']} ms, {times['runs']} runs)")
+        print(f"   Imports: {result['import_ms']} ms")
+        for name, ms in result["slowest_imports_ms"].items():
+            print(f"     {ms:>9.1f} ms  {name}")
+        print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the CLI and the web server")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per target (median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = benchmark(args.runs, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
@@ -2,15 +2,52 @@
 Settings and configuration for the daily briefing generator.
 """
 
+import logging
 import os
 from typing import Dict, List, Optional
-from dotenv import load_dotenv
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# daily_briefing_generator/.env, falling back to one at the repository root
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FILES = (os.path.join(_PACKAGE_DIR, ".env"), os.path.join(os.path.dirname(_PACKAGE_DIR), ".env"))
+
+_environment_loaded = False
+
+def load_environment() -> None:
+    """
+    Load the first of ENV_FILES that exists into the process environment,
+    once per process.
+    
+    Modules read their settings from the environment when they are imported,
+    so this runs before any of them (see tools/__init__.py). Variables that
+    are already set in the environment take precedence over the file.
+    """
+    global _environment_loaded
+    if _environment_loaded:
+        return
+    from dotenv import load_dotenv
+    for env_file in ENV_FILES:
+        if os.path.exists(env_file):
+            load_dotenv(env_file)
+            break
+    _environment_loaded = True
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Configure root logging. Called by the entry points (main.py, the web app),
+    never at import time, so importing modules has no side effects.
+    
+    Args:
+        level (int): Root log level
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
 
 class Settings:
     def __init__(self):
         """Initialize settings with default values and load from environment."""
         # Load environment variables
-        load_dotenv()
+        load_environment()
         
         # Default settings
         self.default_location = os.getenv("DEFAULT_LOCATION", "New York, NY")
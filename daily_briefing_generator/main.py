@@ -8,11 +8,10 @@ Run from the daily_briefing_generator/ directory:
 
 import asyncio
 import sys
-import os
 from datetime import datetime
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
+from config.settings import configure_logging
+from orchestrator.container import AppContainer
 from orchestrator.master_agent import MasterAgent
 
 
@@ -25,12 +24,23 @@ def print_banner():
     print()
 
 
+def build_container() -> AppContainer:
+    """Build the same shared components the web server uses (no ingestion daemon)."""
+    container = AppContainer()
+    container.build_agents()  # The HTTP pool and the Gemini SDK are created on first use
+    return container
+
+
 async def run_briefing(query: str):
     """Run a single briefing request."""
-    master_agent = MasterAgent()
+    container = build_container()
     print(f"📋 Query: {query}\n")
-    result = await master_agent.run_with_recovery(query)
-    print(result)
+    try:
+        await container.start_rate_limiter()
+        result = await container.master_agent.run_with_recovery(query)
+        print(result)
+    finally:
+        await container.close()
 
 
 async def interactive_mode():
@@ -39,8 +49,19 @@ async def interactive_mode():
     print("🎯 Interactive Mode — type your briefing request")
     print("   Type 'quit' or press Ctrl+C to exit\n")
 
-    master_agent = MasterAgent()
+    container = build_container()
+    # Show the prompt right away; the SDKs load while the user types
+    container.preload()
+
+    try:
+        await container.start_rate_limiter()
+        await _interactive_loop(container.master_agent)
+    finally:
+        await container.close()
+
 
+async def _interactive_loop(master_agent: MasterAgent):
+    """Read and answer briefing requests until the user quits."""
     while True:
         try:
             query = input("📝 Request: ").strip()
@@ -59,6 +80,7 @@ async def interactive_mode():
 
 
 if __name__ == "__main__":
+    configure_logging()
     if len(sys.argv) > 1 and sys.argv[1] == "--interactive":
         asyncio.run(interactive_mode())
     else:
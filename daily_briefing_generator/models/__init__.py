@@ -0,0 +1,4 @@
+"""
+Models module for the daily briefing generator.
+Contains typed data structures shared by the orchestrator, agents and tools.
+"""
@@ -0,0 +1,11 @@
+# models/briefing.py - Outcome of one briefing pipeline run
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class BriefingOutcome:
+    """The briefing text, and whether the pipeline had to degrade to produce it"""
+    content: str
+    failed_services: Tuple[str, ...] = ()  # Sub-agents replaced by their fallback section
+    degraded: bool = False  # A sub-agent failed, synthesis was skipped or a canned reply came back instead
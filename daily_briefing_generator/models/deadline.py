@@ -0,0 +1,60 @@
+# models/deadline.py - Request deadline passed from the HTTP boundary down to every tool
+import asyncio
+import time
+from typing import Any, Awaitable, Optional
+
+
+class Deadline:
+    """
+    Absolute point in time (monotonic clock) by which a request must finish.
+
+    Created once per request and handed down through the orchestrator, agents
+    and tools. Each layer derives its own timeouts from the remaining budget
+    instead of using a fixed number, so nested timeouts can never add up to
+    more than the client is willing to wait.
+    """
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """A deadline the given number of seconds from now"""
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Remaining budget, optionally capped by the caller's own per-call limit"""
+        remaining = self.remaining()
+        return remaining if cap is None else min(remaining, cap)
+
+    def child(self, seconds: Optional[float] = None, share: Optional[float] = None) -> "Deadline":
+        """A tighter deadline for one step: a fixed number of seconds or a share of what is left"""
+        now = time.monotonic()
+        expires_at = self.expires_at
+        if seconds is not None:
+            expires_at = min(expires_at, now + seconds)
+        if share is not None:
+            expires_at = min(expires_at, now + self.remaining() * share)
+        return Deadline(expires_at)
+
+    async def wait_for(self, awaitable: Awaitable[Any], cap: Optional[float] = None) -> Any:
+        """Await under the remaining budget, raising asyncio.TimeoutError once it is spent"""
+        return await asyncio.wait_for(awaitable, timeout=self.timeout(cap))
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
+
+
+def timeout_for(deadline: Optional[Deadline], cap: float) -> float:
+    """Per-call timeout: the cap alone without a deadline, otherwise whichever is shorter"""
+    return cap if deadline is None else deadline.timeout(cap)
@@ -0,0 +1,64 @@
+# models/intent.py - Structured briefing intent shared by orchestrator, agents and tools
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+# Values the analysis LLM uses to mean "not specified"
+_UNSPECIFIED = {"", "default", "none", "unknown", "unspecified", "general", "multiple", "n/a"}
+
+# Non-ISO country codes the LLM likes to produce
+_COUNTRY_ALIASES = {"uk": "gb", "usa": "us", "england": "gb", "india": "in"}
+
+# News feed region per country code (any other country reads the global feeds)
+_COUNTRY_REGIONS = {"in": "india", "us": "us", "gb": "uk", "uk": "uk"}
+
+
+def clean_value(value: Optional[str]) -> Optional[str]:
+    """Normalise an extracted slot value, mapping placeholders to None"""
+    if value is None:
+        return None
+    value = value.strip().strip('"').strip("[]").strip()
+    return None if value.lower() in _UNSPECIFIED else value
+
+
+def normalize_country(code: Optional[str]) -> Optional[str]:
+    """Lower-case a country code and map common aliases to ISO codes"""
+    code = clean_value(code)
+    if not code:
+        return None
+    code = code.lower()
+    return _COUNTRY_ALIASES.get(code, code)
+
+
+def news_region(country: Optional[str]) -> str:
+    """Map a country code to the region the news aggregator organises feeds by"""
+    return _COUNTRY_REGIONS.get(country, "global")
+
+
+@dataclass(slots=True)
+class BriefingIntent:
+    """What the user asked for, parsed once and handed to every sub-agent"""
+    needs_weather: bool = False
+    needs_news: bool = False
+    city: Optional[str] = None
+    country: Optional[str] = None  # Lower-case ISO code, e.g. "in", "us", "gb"
+    news_categories: Tuple[str, ...] = ()
+    news_location: Optional[str] = None
+    article_count: int = 5
+    confidence: float = 0.0
+    source: str = "fast_path"  # fast_path or llm
+    user_request: str = ""
+
+    @property
+    def primary_category(self) -> str:
+        """First requested news category, or general"""
+        return self.news_categories[0] if self.news_categories else "general"
+
+    @property
+    def weather_country(self) -> str:
+        """Country code in the form OpenWeatherMap expects"""
+        return (self.country or "us").upper()
+
+    @property
+    def is_empty(self) -> bool:
+        """True when neither weather nor news was requested"""
+        return not self.needs_weather and not self.needs_news
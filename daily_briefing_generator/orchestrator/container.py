@@ -0,0 +1,93 @@
+# orchestrator/container.py - Long-lived application components, built once and shared
+import asyncio
+import importlib
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from agents.weather_agent import WeatherAgent
+from agents.news_agent import NewsAgent
+from orchestrator.master_agent import MasterAgent
+from tools.enhanced_news_tool import MultiSourceNewsAggregator, get_news_aggregator
+from tools.http_client import close_http_client, start_http_client
+from tools.llm_client import DEFAULT_MODEL, LLMClient
+from tools.news_ingestion import IngestionLock, NewsIngestionService
+from tools.rate_limiter import RateLimiter, flush_rate_limiter, get_rate_limiter
+from tools.tracing import close_tracing
+
+if TYPE_CHECKING:
+    import aiohttp
+
+# Heavy SDKs only imported on first use; preload() warms them off the request path
+PRELOAD_MODULES = ("google.generativeai", "aiohttp")
+SDK_PRELOAD = os.getenv("SDK_PRELOAD", "background").lower()  # background, or startup to finish before serving
+
+
+def _import_modules() -> None:
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+
+class AppContainer:
+    """
+    The instances every request shares: the HTTP pool, the news aggregator
+    (API keys and RSS feed tables resolved once), one Gemini client and the
+    agents built on top of them. The web app builds it in its lifespan and
+    the CLI in main.py; neither constructs components per request.
+    """
+
+    def __init__(self):
+        self.http: Optional["aiohttp.ClientSession"] = None
+        self.aggregator: MultiSourceNewsAggregator = get_news_aggregator()
+        self.llm: Optional[LLMClient] = None
+        self.weather_agent: Optional[WeatherAgent] = None
+        self.news_agent: Optional[NewsAgent] = None
+        self.master_agent: Optional[MasterAgent] = None
+        self.news_ingestion: Optional[NewsIngestionService] = None
+        self.rate_limiter: Optional[RateLimiter] = None
+        self.preload_thread: Optional[threading.Thread] = None
+
+    async def start_http(self) -> None:
+        self.http = await start_http_client()
+
+    async def start_rate_limiter(self) -> RateLimiter:
+        """Open the quota ledger and drop previous days' counts off the event loop"""
+        self.rate_limiter = await asyncio.to_thread(get_rate_limiter)
+        await asyncio.to_thread(self.rate_limiter.ledger.prune)
+        return self.rate_limiter
+
+    def build_agents(self) -> MasterAgent:
+        """Wire the agents (cheap: the Gemini SDK loads on first use); raises ValueError when no API key is set"""
+        self.llm = LLMClient(DEFAULT_MODEL)
+        self.weather_agent = WeatherAgent(self.llm)
+        self.news_agent = NewsAgent(self.llm, self.aggregator)
+        self.master_agent = MasterAgent(self.llm, self.weather_agent, self.news_agent)
+        return self.master_agent
+
+    def preload(self) -> None:
+        """Import the heavy SDKs so the first briefing doesn't wait for them"""
+        if SDK_PRELOAD == "startup":
+            # Production workers: load before accepting connections, others keep serving meanwhile
+            _import_modules()
+            return
+        self.preload_thread = threading.Thread(target=_import_modules, name="sdk-preload", daemon=True)
+        self.preload_thread.start()
+
+    def preloading(self) -> bool:
+        return self.preload_thread is not None and self.preload_thread.is_alive()
+
+    def start_ingestion(self) -> NewsIngestionService:
+        # Every worker starts the service; the lock lets only one of them sweep
+        self.news_ingestion = NewsIngestionService(self.aggregator, lock=IngestionLock())
+        self.news_ingestion.start()
+        return self.news_ingestion
+
+    async def close(self) -> None:
+        if self.news_ingestion is not None:
+            await self.news_ingestion.stop()
+            self.news_ingestion = None
+        await close_http_client()
+        self.http = None
+        # Calls counted since the last flush, whether or not start_rate_limiter() ran: tools create it on first use
+        await asyncio.to_thread(flush_rate_limiter)
+        await asyncio.to_thread(close_tracing)  # Spans the JSONL writer still has queued
@@ -2,11 +2,6 @@
 Test location-specific news after fix
 """
 import asyncio
-import sys
-import os
-
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from orchestrator.master_agent import MasterAgent
 
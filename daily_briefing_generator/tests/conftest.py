@@ -0,0 +1,74 @@
+# tests/conftest.py - Offline fakes shared by the test suite
+import asyncio
+import os
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+# Settings are read at import time: keep the suite offline and deterministic whatever .env says
+os.environ["GOOGLE_AI_API_KEY"] = "test-key"
+os.environ["LLM_CACHE_BACKEND"] = "memory"
+os.environ["WEATHER_CACHE_BACKEND"] = "memory"
+os.environ["TRACING_EXPORTER"] = "none"
+os.environ["HEALTH_CANARY_ENABLED"] = "false"
+os.environ["NEWS_INGESTION_ENABLED"] = "false"
+os.environ["NEWS_STORE_ENABLED"] = "false"
+
+
+class FakeLLM:
+    def __init__(self, reply: Optional[Callable[[str, str], str]] = None, delay: float = 0.0):
+        """Stands in for LLMClient: answers by call site and records every call"""
+        self.reply = reply or (lambda prompt, call_site: f"{call_site} response")
+        self.delay = delay
+        self.calls: List[str] = []
+
+    async def generate(self, prompt: str, call_site: str = "default", deadline=None, **kwargs) -> str:
+        self.calls.append(call_site)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.reply(prompt, call_site)
+
+    async def stream(self, prompt: str, call_site: str = "default", deadline=None, **kwargs):
+        yield await self.generate(prompt, call_site, deadline)
+
+
+class FakeAgent:
+    def __init__(self, name: str, delay: float = 0.0, failures: int = 0):
+        """A sub-agent that takes delay seconds and raises on its first failures calls"""
+        self.name = name
+        self.delay = delay
+        self.failures = failures
+        self.calls = 0
+
+    async def _briefing(self, *args, **kwargs) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.calls <= self.failures:
+            raise RuntimeError(f"{self.name} upstream failed")
+        return f"{self.name} briefing"
+
+    async def write_weather_briefing(self, *args, **kwargs) -> str:
+        return await self._briefing(*args, **kwargs)
+
+    async def write_news_briefing(self, *args, **kwargs) -> str:
+        return await self._briefing(*args, **kwargs)
+
+
+@pytest.fixture
+def fake_llm() -> FakeLLM:
+    return FakeLLM()
+
+
+@pytest.fixture
+def make_master() -> Callable[..., "MasterAgent"]:
+    """Build a MasterAgent over fakes, with retries that don't sleep"""
+    from orchestrator.master_agent import MasterAgent
+
+    def build(llm: Optional[FakeLLM] = None, weather: Optional[FakeAgent] = None,
+              news: Optional[FakeAgent] = None) -> MasterAgent:
+        master = MasterAgent(llm or FakeLLM(), weather or FakeAgent("weather"), news or FakeAgent("news"))
+        master.stage_retry_backoff = 0
+        return master
+
+    return build
@@ -0,0 +1,13 @@
+# tests/test_app.py - The web app resolves its files from its own location, not the working directory
+import os
+
+from app import templates
+from static_assets import FRONTEND_DIR
+
+
+def test_templates_resolve_from_the_module_not_the_cwd():
+    search_path = templates.env.loader.searchpath[0]
+
+    assert os.path.isabs(search_path)
+    assert search_path == os.path.join(FRONTEND_DIR, "templates")
+    assert os.path.isdir(os.path.dirname(search_path))
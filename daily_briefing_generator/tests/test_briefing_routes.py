@@ -0,0 +1,82 @@
+# tests/test_briefing_routes.py - Quick briefing HTTP cache: what is cached and what the ETag covers
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from agents.weather_agent import WeatherAgent
+
+from routes.briefing import briefing_router
+from routes.dependencies import get_master_agent
+from routes.response_cache import response_cache
+from tests.conftest import FakeAgent, FakeLLM
+
+QUICK_TECH = "/api/v1/briefing/quick/technology"
+
+
+@pytest.fixture
+def client_for(make_master):
+    """A test client whose briefing routes run on a MasterAgent over fakes"""
+    response_cache.clear()
+
+    def build(**agents):
+        master = make_master(**agents)
+        app = FastAPI()
+        app.include_router(briefing_router, prefix="/api/v1")
+        app.dependency_overrides[get_master_agent] = lambda: master
+        return TestClient(app), master
+
+    yield build
+    response_cache.clear()
+
+
+def test_successful_briefing_is_cached_and_revalidated(client_for):
+    client, master = client_for()
+
+    first = client.get(QUICK_TECH)
+    assert first.status_code == 200
+    assert first.json()["metadata"]["degraded"] is False
+    assert first.headers["cache-control"].startswith("public, max-age=")
+    assert first.headers["x-coalesced-waiters"] == "0"
+    assert "x-llm-tokens" in first.headers and "x-budget-remaining-ms" in first.headers
+    calls = len(master.llm.calls)
+
+    again = client.get(QUICK_TECH, headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert len(master.llm.calls) == calls  # Served from the response cache
+
+
+def test_etag_covers_the_briefing_not_the_run(client_for):
+    client, _ = client_for()
+    first = client.get(QUICK_TECH, headers={"X-Request-Budget": "30"})
+
+    response_cache.clear()  # Rebuild: same briefing, different budget, tokens and timing
+    second = client.get(QUICK_TECH, headers={"X-Request-Budget": "20"})
+
+    assert second.headers["etag"] == first.headers["etag"]
+    assert set(second.json()["metadata"]) == {"briefing_type", "location", "query", "degraded", "failed_services"}
+
+
+def test_degraded_briefing_is_not_cached(client_for):
+    client, master = client_for(news=FakeAgent("news", failures=100))
+
+    first = client.get(QUICK_TECH)
+    assert first.status_code == 200
+    assert first.json()["metadata"]["degraded"] is True
+    assert first.json()["metadata"]["failed_services"] == ["news"]
+    assert first.headers["cache-control"] == "no-store"
+    assert "etag" not in first.headers
+
+    client.get(QUICK_TECH)
+    assert master.news_agent.calls == 2 * master.max_retries  # Rebuilt, not served from cache
+
+
+def test_briefing_without_a_city_is_not_cached(client_for):
+    weather_llm = FakeLLM()  # Its analysis names no city either
+    client, _ = client_for(weather=WeatherAgent(weather_llm))
+
+    response = client.get("/api/v1/briefing/quick/weather")
+
+    assert response.json()["metadata"]["degraded"] is True
+    assert response.json()["metadata"]["failed_services"] == ["weather"]
+    assert response.headers["cache-control"] == "no-store"
+    assert weather_llm.calls == ["weather_analysis"]  # Not retried: asking again finds no city either
@@ -0,0 +1,83 @@
+# tests/test_circuit_breaker.py - Breaker state machine: closed, open, half-open and back
+import asyncio
+
+import pytest
+
+from tools.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+def _fail(breaker: CircuitBreaker, error: Exception = RuntimeError("upstream down")) -> None:
+    with pytest.raises(type(error)):
+        with breaker.guard():
+            raise error
+
+
+def test_opens_after_enough_failures_and_fails_fast():
+    breaker = CircuitBreaker("test", window=4, min_calls=4, failure_ratio=0.5, open_seconds=60)
+    with breaker.guard():
+        pass
+    with breaker.guard():
+        pass
+    _fail(breaker)
+    assert breaker.state == CLOSED  # Three calls are fewer than min_calls
+    _fail(breaker)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pass
+    assert breaker.rejected == 1
+
+
+def test_half_open_lets_one_trial_through_and_closes_on_success():
+    breaker = CircuitBreaker("test", window=2, min_calls=2, open_seconds=0)
+    _fail(breaker)
+    _fail(breaker)
+    assert breaker.state == HALF_OPEN
+
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one trial at a time
+    breaker.record_success(0.01)
+
+    assert breaker.state == CLOSED
+
+
+def test_failed_trial_reopens():
+    breaker = CircuitBreaker("test", window=2, min_calls=2, open_seconds=0)
+    _fail(breaker)
+    _fail(breaker)
+    _fail(breaker)  # The half-open trial
+
+    assert breaker.times_opened == 2
+
+
+def test_slow_calls_count_against_the_upstream():
+    breaker = CircuitBreaker("test", window=2, min_calls=2, slow_call_seconds=0.01, open_seconds=60)
+    breaker.record_success(0.5)
+    breaker.record_success(0.5)
+
+    assert breaker.state == OPEN
+
+
+def test_timeouts_count_as_failures_below_the_slow_call_threshold():
+    breaker = CircuitBreaker("test", window=2, min_calls=2, slow_call_seconds=60, open_seconds=60)
+
+    async def call():
+        with breaker.guard():
+            await asyncio.wait_for(asyncio.sleep(1), timeout=0.01)
+
+    for _ in range(2):
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(call())
+
+    assert breaker.state == OPEN
+
+
+def test_cancelled_calls_are_not_judged():
+    breaker = CircuitBreaker("test", window=2, min_calls=2, open_seconds=0)
+    _fail(breaker)
+    _fail(breaker)
+    _fail(breaker, asyncio.CancelledError())  # Abandoned trial
+
+    assert breaker.allow()  # The trial slot was released
+    assert breaker.times_opened == 1
@@ -0,0 +1,37 @@
+# tests/test_deadline.py - Request deadlines and the budgets derived from them
+import asyncio
+import time
+
+import pytest
+
+from models.deadline import Deadline, timeout_for
+
+
+def test_child_deadlines_never_outlive_the_parent():
+    parent = Deadline.after(1.0)
+
+    assert parent.child(seconds=5).expires_at == parent.expires_at
+    assert parent.child(seconds=0.1).remaining() <= 0.1
+    assert 0.45 <= parent.child(share=0.5).remaining() <= 0.5
+
+
+def test_timeouts_are_capped_by_the_remaining_budget():
+    deadline = Deadline.after(0.5)
+
+    assert deadline.timeout(10) <= 0.5
+    assert deadline.timeout(0.1) == 0.1
+    assert timeout_for(None, 7) == 7
+    assert timeout_for(deadline, 7) <= 0.5
+
+
+def test_expired_deadline():
+    deadline = Deadline(time.monotonic() - 1)
+
+    assert deadline.expired
+    assert deadline.remaining() == 0.0
+
+
+def test_wait_for_raises_once_the_budget_is_spent():
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(Deadline.after(0.05).wait_for(asyncio.sleep(1)))
+    assert asyncio.run(Deadline.after(1).wait_for(asyncio.sleep(0, result="done"))) == "done"
@@ -0,0 +1,95 @@
+# tests/test_health.py - Canary probe and agent health answered from the monitor's state
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from routes import health
+from routes.health import HealthMonitor
+from tests.conftest import FakeLLM
+from tools.circuit_breaker import CircuitBreakerRegistry
+
+
+@pytest.fixture
+def breakers(monkeypatch):
+    """A fresh breaker registry, so other tests' Gemini successes don't skip the canary"""
+    registry = CircuitBreakerRegistry()
+    monkeypatch.setattr(health, "get_circuit_breakers", lambda: registry)
+    return registry
+
+
+def _monitor(make_master, llm):
+    monitor = HealthMonitor()
+    monitor.container = SimpleNamespace(llm=llm, master_agent=make_master(llm=llm), preloading=lambda: False)
+    return monitor
+
+
+def test_canary_probes_the_llm_uncached(make_master, breakers):
+    calls = []
+
+    class ProbeLLM(FakeLLM):
+        async def generate(self, prompt, call_site="default", deadline=None, **kwargs):
+            calls.append(kwargs)
+            return "OK"
+
+    monitor = _monitor(make_master, ProbeLLM())
+    asyncio.run(monitor.run_canary())
+
+    assert monitor.canary["ok"] is True
+    assert calls == [{"use_cache": False}]
+
+
+@pytest.mark.parametrize("reply, error", [
+    ("", "empty response"),
+    ("I encountered an error while preparing your briefing: quota", "error response"),
+    ("I'm not sure what kind of briefing you need. Could you please specify if you want weather, news, or both?",
+     "fallback response"),
+])
+def test_canary_fails_on_fallback_or_error_output(make_master, breakers, reply, error):
+    monitor = _monitor(make_master, FakeLLM(reply=lambda prompt, call_site: reply))
+
+    asyncio.run(monitor.run_canary())
+
+    assert monitor.canary["ok"] is False
+    assert monitor.canary["error"] == error
+    assert not monitor.readiness()[0]
+
+
+def test_canary_fails_when_the_llm_raises(make_master, breakers):
+    class DownLLM(FakeLLM):
+        async def generate(self, *args, **kwargs):
+            raise RuntimeError("503 from Gemini")
+
+    monitor = _monitor(make_master, DownLLM())
+    asyncio.run(monitor.run_canary())
+
+    assert monitor.canary == {**monitor.canary, "ok": False, "error": "503 from Gemini"}
+
+
+def test_agent_health_comes_from_breakers_without_running_agents(make_master, breakers):
+    monitor = _monitor(make_master, FakeLLM())
+    weather = breakers.get("OpenWeatherMap", min_calls=1, open_seconds=60)
+    weather.record_failure()
+    breakers.get("GNews", min_calls=1, open_seconds=60).record_failure()
+    breakers.get("rss:feeds.bbci.co.uk").record_success(0.1)
+
+    agents = monitor.agents()
+
+    assert agents["weather_agent"]["status"] == "circuit open"
+    assert agents["news_agent"]["status"] == "healthy"  # RSS still answers
+    assert set(agents["news_agent"]["upstreams"]) == {"GNews", "rss:feeds.bbci.co.uk"}
+    assert agents["llm"]["status"] == "healthy" and agents["llm"]["canary"]["ok"] is None
+    assert monitor.container.llm.calls == []
+
+
+def test_detailed_health_reports_the_same_agent_status(make_master, breakers, monkeypatch):
+    monitor = _monitor(make_master, FakeLLM())
+    monitor.container.news_ingestion = None
+    monkeypatch.setattr(health, "health_monitor", monitor)
+    breakers.get("GNews", min_calls=1, open_seconds=60).record_failure()
+    breakers.get("rss:feeds.bbci.co.uk", min_calls=1, open_seconds=60).record_failure()
+
+    detailed = asyncio.run(health.detailed_health_check(monitor.container))
+
+    assert detailed.agents["news_agent"] == monitor.agents()["news_agent"]["status"] == "circuit open"
+    assert detailed.agents["weather_agent"] == "healthy"
@@ -0,0 +1,55 @@
+# tests/test_intent_parser.py - Fast-path intent parser: what it resolves and when it defers to the LLM
+import pytest
+
+from tools.intent_parser import FAST_PATH_MIN_CONFIDENCE, parse_intent
+
+CONFIDENT = [
+    # request, needs_weather, needs_news, city, country, categories
+    ("What's the weather in London?", True, False, "London", "gb", ()),
+    ("Morning briefing for Mumbai with tech news", True, True, "Mumbai", "in", ("technology",)),
+    ("Business news updates", False, True, None, None, ("business",)),
+    ("How hot is it in Mumbai today?", True, False, "Mumbai", "in", ()),
+    ("How cold is it in Toronto", True, False, "Toronto", "ca", ()),
+    ("Complete daily briefing for default location", True, True, None, None, ()),
+    ("Weather for Tokyo for business travel", True, False, "Tokyo", "jp", ("business",)),
+    ("Any important health news from India?", False, True, None, "in", ("health",)),
+]
+
+# Parses that used to come back confidently wrong; they must defer to the analysis LLM
+DEFERRED = [
+    "climate change news",
+    "Give me a brief on cold war history",
+    "weather in the capital of Kenya",
+    "What's the weather in India?",
+    "Weather in Smallville",
+    "hot stocks news for London",
+]
+
+
+@pytest.mark.parametrize("request_text,needs_weather,needs_news,city,country,categories", CONFIDENT)
+def test_confident_parses(request_text, needs_weather, needs_news, city, country, categories):
+    intent = parse_intent(request_text)
+
+    assert intent.confidence >= FAST_PATH_MIN_CONFIDENCE
+    assert (intent.needs_weather, intent.needs_news) == (needs_weather, needs_news)
+    assert (intent.city, intent.country) == (city, country)
+    assert intent.news_categories == categories
+
+
+@pytest.mark.parametrize("request_text", DEFERRED)
+def test_ambiguous_or_unresolved_requests_defer_to_llm(request_text):
+    assert parse_intent(request_text).confidence < FAST_PATH_MIN_CONFIDENCE
+
+
+def test_ambiguous_weather_words_alone_do_not_ask_for_weather():
+    assert not parse_intent("climate change news").needs_weather
+    assert not parse_intent("Give me a brief on cold war history").city
+
+
+def test_article_count_is_capped():
+    assert parse_intent("Show me 3 sports headlines").article_count == 3
+    assert parse_intent("Show me 25 tech headlines").article_count == 10
+
+
+def test_unrecognised_request_has_no_confidence():
+    assert parse_intent("hello there").confidence == 0.0
@@ -0,0 +1,88 @@
+# tests/test_llm_cache.py - LLM response cache backends and the client's use of them
+import asyncio
+import time
+
+from tools.llm_cache import MemoryLLMCache, SQLiteLLMCache, make_cache_key
+from tools.llm_client import LLMClient
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+        self.usage_metadata = None
+
+
+class FakeModel:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate_content_async(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        return FakeResponse(f"answer to {prompt}")
+
+
+def test_memory_cache_expires_and_evicts_least_recently_used():
+    cache = MemoryLLMCache(max_entries=2)
+    cache.set("a", "A", ttl=60)
+    cache.set("b", "B", ttl=60)
+    assert cache.get("a") == "A"  # a is now more recent than b
+    cache.set("c", "C", ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+
+    cache._entries["a"] = ("A", time.time() - 1)
+    assert cache.get("a") is None
+
+
+def test_sqlite_hits_do_not_write(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite3"), max_entries=10)
+    cache.set("key", "value", ttl=60)
+    writes = cache._conn.total_changes
+
+    for _ in range(5):
+        assert cache.get("key") == "value"
+
+    assert cache._conn.total_changes == writes
+    assert cache.hits == 5
+
+
+def test_sqlite_lru_uses_batched_touches(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite3"), max_entries=2)
+    cache.set("a", "A", ttl=60)
+    time.sleep(0.01)
+    cache.set("b", "B", ttl=60)
+    time.sleep(0.01)
+    assert cache.get("a") == "A"  # Touch is pending, flushed by the next set before evicting
+    cache.set("c", "C", ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert SQLiteLLMCache(cache.path).get("c") == "C"  # Shared through the file
+
+
+def test_client_serves_repeated_prompt_from_cache(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite3"))
+    client = LLMClient("test-model", cache=cache)
+    client._model = FakeModel()
+
+    async def ask_twice():
+        return [await client.generate("hello", call_site="master_analysis") for _ in range(2)]
+
+    assert asyncio.run(ask_twice()) == ["answer to hello", "answer to hello"]
+    assert client._model.prompts == ["hello"]
+    assert cache.get(make_cache_key("test-model", "hello")) == "answer to hello"
+
+
+def test_client_bypasses_cache_when_asked(tmp_path):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite3"))
+    client = LLMClient("test-model", cache=cache)
+    client._model = FakeModel()
+    cache.set(make_cache_key("test-model", "ping"), "stale answer", ttl=60)
+
+    async def probe_twice():
+        return [await client.generate("ping", call_site="health_canary", use_cache=False) for _ in range(2)]
+
+    assert asyncio.run(probe_twice()) == ["answer to ping", "answer to ping"]
+    assert client._model.prompts == ["ping", "ping"]
+    assert cache.get(make_cache_key("test-model", "ping")) == "stale answer"
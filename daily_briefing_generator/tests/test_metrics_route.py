@@ -0,0 +1,27 @@
+# tests/test_metrics_route.py - /metrics reads the serving app's container, not a module-level app
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes.metrics import metrics_router
+
+
+def test_scrape_reports_the_container_on_app_state(make_master):
+    app = FastAPI()
+    app.include_router(metrics_router)
+    app.state.container = SimpleNamespace(master_agent=make_master())
+
+    body = TestClient(app).get("/metrics").text
+
+    assert "briefing_pipeline_runs_in_flight 0" in body
+    assert "briefing_cache_entries" in body
+
+
+def test_scrape_without_a_container():
+    app = FastAPI()
+    app.include_router(metrics_router)
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
@@ -0,0 +1,58 @@
+# tests/test_news_agent.py - NewsAgent over aggregator-shaped articles
+import asyncio
+
+from agents.news_agent import NewsAgent
+from models.intent import BriefingIntent
+from tools.enhanced_news_tool import _parse_feed
+from tests.conftest import FakeLLM
+
+AGGREGATOR_ARTICLES = [
+    {"title": "Chip exports rise", "description": "Shipments grew 12%.", "url": "https://example.com/1",
+     "published_at": "2026-10-18T06:00:00Z", "source": {"name": "Reuters"}},
+    {"title": "Rate decision due", "description": "Markets await the central bank.", "url": "https://example.com/2",
+     "published_at": "2026-10-18T05:00:00Z", "source": "MediaStack"},
+    {"title": "Legacy NewsAPI shape", "description": "Still accepted.", "url": "https://example.com/3",
+     "publishedAt": "2026-10-17T22:00:00Z", "source": {"name": "NewsAPI"}},
+    {"title": "No source at all", "description": "Falls back to Unknown.", "url": "https://example.com/4"},
+]
+
+
+def test_formats_aggregator_and_store_articles():
+    formatted = NewsAgent(FakeLLM())._format_articles_for_ai(AGGREGATOR_ARTICLES)
+
+    assert "Source: Reuters" in formatted
+    assert "Published: 2026-10-18T06:00:00Z" in formatted
+    assert "Source: MediaStack" in formatted
+    assert "Published: 2026-10-17T22:00:00Z" in formatted
+    assert "Source: Unknown" in formatted and "Published: Unknown" in formatted
+
+
+def test_briefing_from_aggregator_articles(monkeypatch):
+    async def fake_news(intent, deadline=None, aggregator=None):
+        return {"status": "ok", "articles": AGGREGATOR_ARTICLES}
+
+    monkeypatch.setattr("agents.news_agent.get_news_for_intent", fake_news)
+    llm = FakeLLM()
+    intent = BriefingIntent(needs_news=True, news_categories=("technology",), user_request="Tech news")
+
+    result = asyncio.run(NewsAgent(llm).get_news_briefing(intent=intent))
+
+    assert result == "news_briefing response"
+    assert llm.calls == ["news_briefing"]
+
+
+RSS_FEED = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Example Wire</title>
+<item><title>Feed story</title><link>https://example.com/feed</link>
+<description>Parsed from RSS.</description><pubDate>Sun, 18 Oct 2026 07:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+
+def test_formats_articles_exactly_as_the_rss_parser_emits_them():
+    articles = _parse_feed(RSS_FEED, max_articles=5)
+
+    formatted = NewsAgent(FakeLLM())._format_articles_for_ai(articles)
+
+    assert "Feed story" in formatted
+    assert "Source: Example Wire" in formatted
+    assert "Published: Sun, 18 Oct 2026 07:00:00 GMT" in formatted
@@ -0,0 +1,63 @@
+# tests/test_news_fanout.py - News API fan-out: deadlines, hedging and breaker trial slots
+import asyncio
+import time
+
+from models.deadline import Deadline
+from tools import enhanced_news_tool
+from tools.circuit_breaker import HALF_OPEN, CircuitBreaker
+from tools.enhanced_news_tool import MultiSourceNewsAggregator
+
+
+def _half_open_breaker(name: str) -> CircuitBreaker:
+    breaker = CircuitBreaker(name, window=1, min_calls=1, open_seconds=0)
+    breaker.record_failure()
+    assert breaker.state == HALF_OPEN
+    return breaker
+
+
+def _aggregator(monkeypatch, fetchers, breakers):
+    aggregator = MultiSourceNewsAggregator()
+    monkeypatch.setattr(aggregator, "_api_fetchers", lambda: fetchers)
+    monkeypatch.setattr(enhanced_news_tool, "get_breaker", lambda name: breakers.setdefault(name, CircuitBreaker(name)))
+    return aggregator
+
+
+def test_providers_cancelled_before_they_start_release_their_trial_slot(monkeypatch):
+    calls = []
+
+    async def fetch(category, region, max_articles):
+        calls.append(1)
+        return []
+
+    breakers = {"Trial": _half_open_breaker("Trial")}
+    aggregator = _aggregator(monkeypatch, {"Trial": fetch}, breakers)
+
+    articles, used = asyncio.run(aggregator._fetch_from_apis("technology", "global", 5, Deadline.after(0), "all"))
+
+    assert (articles, used, calls) == ([], [], [])
+    assert breakers["Trial"].allow()  # Not stuck half-open with a trial that never ran
+
+
+def test_no_hedge_is_launched_once_the_stage_deadline_expired(monkeypatch):
+    hedged = []
+
+    async def slow(category, region, max_articles):
+        await asyncio.sleep(1)
+        return []
+
+    async def hedge(category, region, max_articles):
+        hedged.append(1)
+        return []
+
+    breakers = {"Hedge": _half_open_breaker("Hedge")}
+    fetchers = {"SlowA": slow, "SlowB": slow, "Hedge": hedge}
+    aggregator = _aggregator(monkeypatch, fetchers, breakers)
+    monkeypatch.setattr(enhanced_news_tool, "NEWS_HEDGE_INITIAL", 2)
+    monkeypatch.setattr(enhanced_news_tool.get_provider_stats(), "rank", lambda providers: list(providers))
+
+    started = time.monotonic()
+    articles, _ = asyncio.run(aggregator._fetch_from_apis("technology", "global", 5, Deadline.after(0.1), "first_n"))
+
+    assert articles == [] and hedged == []
+    assert time.monotonic() - started < 0.5
+    assert breakers["Hedge"].allow()
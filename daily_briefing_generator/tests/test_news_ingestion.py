@@ -0,0 +1,39 @@
+# tests/test_news_ingestion.py - Background sweeps stay off the news APIs' daily quotas
+import asyncio
+
+from tools.enhanced_news_tool import MultiSourceNewsAggregator
+from tools.news_ingestion import NewsIngestionService
+
+
+class FakeStore:
+    def __init__(self):
+        self.upserts = []
+
+    def upsert_articles(self, category, region, articles):
+        self.upserts.append((category, region, articles))
+        return len(articles)
+
+    def prune(self):
+        pass
+
+
+def test_sweep_reads_rss_only_by_default(monkeypatch):
+    aggregator = MultiSourceNewsAggregator()
+    aggregator.gnews_api_key = "configured"
+
+    async def no_api_calls(*args, **kwargs):
+        raise AssertionError("ingestion must not call the news APIs")
+
+    async def rss(category, region, *args, **kwargs):
+        return [{"title": f"{category} {region} story", "url": f"https://example.com/{category}/{region}"}]
+
+    monkeypatch.setattr(aggregator, "_fetch_from_apis", no_api_calls)
+    monkeypatch.setattr(aggregator, "_fetch_from_rss", rss)
+    store = FakeStore()
+    service = NewsIngestionService(aggregator=aggregator, store=store, articles_per_pair=1)
+
+    added = asyncio.run(service.ingest_pair("technology", "global"))
+
+    assert service.fanout_mode == "rss"
+    assert added == 1
+    assert store.upserts[0][2][0]["title"] == "technology global story"
@@ -0,0 +1,135 @@
+# tests/test_orchestrator.py - MasterAgent pipeline behaviour over fake agents and LLM
+import asyncio
+import time
+
+import pytest
+
+from agents.weather_agent import WeatherAgent, WeatherDataError
+from models.deadline import Deadline
+from tests.conftest import FakeAgent, FakeLLM
+from tools.circuit_breaker import CircuitOpenError
+from tools.intent_parser import parse_intent
+
+
+def _intent(request):
+    intent = parse_intent(request)
+    assert intent.needs_weather and intent.needs_news
+    return intent
+
+
+def test_sub_agents_run_concurrently(make_master):
+    weather, news = FakeAgent("weather", delay=0.2), FakeAgent("news", delay=0.2)
+    master = make_master(weather=weather, news=news)
+
+    started = time.monotonic()
+    result = asyncio.run(master.process_request("Weather and technology news for London"))
+    elapsed = time.monotonic() - started
+
+    assert result == "master_synthesis response"
+    assert weather.calls == news.calls == 1
+    assert elapsed < 0.35  # Sequential calls would take at least 0.4s
+
+
+def test_failed_sub_agent_degrades_to_fallback_section(make_master):
+    master = make_master(news=FakeAgent("news", failures=1))
+
+    results = asyncio.run(master._dispatch_agents(
+        master._build_agent_calls(_intent("Weather and technology news for London"))
+    ))
+    responses, failed = master._collect_agent_responses(results)
+
+    assert failed == ["news"]
+    assert master.fallback_responses["news"] in responses[1]
+    assert "weather briefing" in responses[0]
+
+
+def test_failing_sub_agent_stage_is_retried(make_master):
+    weather = FakeAgent("weather", failures=1)
+    llm = FakeLLM(reply=lambda prompt, call_site: prompt if call_site == "master_synthesis" else "")
+    master = make_master(llm=llm, weather=weather)
+
+    result = asyncio.run(master.run_with_recovery("Weather and technology news for London"))
+
+    assert weather.calls == 2
+    assert "weather briefing" in result
+    assert master.fallback_responses["weather"] not in result
+
+
+def test_persistently_failing_sub_agent_is_reported_failed(make_master):
+    weather = FakeAgent("weather", failures=10)
+    llm = FakeLLM(reply=lambda prompt, call_site: prompt if call_site == "master_synthesis" else "")
+    master = make_master(llm=llm, weather=weather)
+
+    result = asyncio.run(master.run_with_recovery("Weather and technology news for London"))
+
+    assert weather.calls == master.max_retries
+    assert master.fallback_responses["weather"] in result
+    assert "news briefing" in result
+
+
+def test_agent_errors_become_an_apology_outside_the_orchestrator(monkeypatch):
+    async def no_weather(intent, deadline=None):
+        return {"error": "City not found"}
+
+    monkeypatch.setattr("agents.weather_agent.get_weather_for_intent", no_weather)
+    agent = WeatherAgent(FakeLLM())
+
+    assert asyncio.run(agent.get_weather_briefing("Weather in London")) == \
+        "Sorry, I couldn't get weather data: City not found"
+    with pytest.raises(WeatherDataError):
+        asyncio.run(agent.write_weather_briefing("Weather in London"))
+
+
+def test_agent_recovery_honours_the_deadline(make_master):
+    master = make_master(llm=FakeLLM(delay=5), weather=FakeAgent("weather", delay=5))
+
+    started = time.monotonic()
+    result = asyncio.run(master.process_request_with_agent_recovery(
+        "Weather and technology news for London", Deadline.after(0.3)
+    ))
+
+    assert time.monotonic() - started < 1
+    assert master.fallback_responses["weather"] in result
+    assert "news briefing" in result
+
+
+def test_stage_retries_with_backoff_until_it_succeeds(make_master):
+    master = make_master()
+    attempts = []
+
+    async def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise RuntimeError("transient")
+        return "ok"
+
+    assert asyncio.run(master._run_stage("test", Deadline.after(5), flaky)) == ("ok", None)
+    assert len(attempts) == 3
+
+
+def test_stage_does_not_retry_an_open_circuit(make_master):
+    master = make_master()
+    attempts = []
+
+    async def circuit_open():
+        attempts.append(1)
+        raise CircuitOpenError("Gemini")
+
+    result, error = asyncio.run(master._run_stage("test", Deadline.after(5), circuit_open))
+
+    assert result is None and "circuit open" in error
+    assert attempts == [1]
+
+
+def test_stage_timeout_uses_up_the_stage_without_retrying(make_master):
+    master = make_master()
+    attempts = []
+
+    async def slow():
+        attempts.append(1)
+        await asyncio.sleep(1)
+
+    started = time.monotonic()
+    assert asyncio.run(master._run_stage("test", Deadline.after(0.05), slow)) == (None, "timeout")
+    assert attempts == [1]
+    assert time.monotonic() - started < 0.5
@@ -0,0 +1,83 @@
+# tests/test_rate_limiter.py - Token buckets, opt-in daily quotas and the shared quota ledger
+import asyncio
+
+from tools import rate_limiter
+from tools.rate_limiter import QuotaLedger, RateLimiter, TokenBucket
+
+
+def test_token_bucket_refuses_past_its_burst():
+    bucket = TokenBucket(rate=0.001, capacity=2)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [True, True, False]
+
+
+def test_daily_quotas_are_off_by_default(tmp_path):
+    limiter = RateLimiter(QuotaLedger(str(tmp_path / "quota.sqlite3")))
+
+    assert limiter.limits["GNews"][2] == 0
+    assert limiter.remaining("GNews") is None
+    assert limiter.ledger.try_consume("GNews", 0)
+
+
+def test_free_tier_quotas_are_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "PROVIDER_FREE_TIER_QUOTAS", True)
+    limiter = RateLimiter(QuotaLedger(str(tmp_path / "quota.sqlite3")))
+
+    assert limiter.limits["GNews"][2] == 100
+    assert limiter.remaining("GNews") == 100
+
+
+def test_quota_is_enforced_and_denials_counted(tmp_path):
+    limiter = RateLimiter(QuotaLedger(str(tmp_path / "quota.sqlite3")), limits={"Test": (1000.0, 100, 3)})
+
+    assert [limiter.try_acquire("Test") for _ in range(4)] == [True, True, True, False]
+    assert limiter.remaining("Test") == 0
+    assert limiter.denied == {"Test": 1}
+    assert limiter.try_acquire("Unknown")
+
+
+def test_counts_stay_in_memory_until_flushed_and_are_shared(tmp_path):
+    path = str(tmp_path / "quota.sqlite3")
+    ledger = QuotaLedger(path, flush_interval=3600)
+    writes = ledger._conn.total_changes
+
+    async def consume():
+        return [ledger.try_consume("Test", 5) for _ in range(3)]
+
+    assert asyncio.run(consume()) == [True, True, True]
+    assert ledger._conn.total_changes == writes  # No SQLite write on the request path
+    assert ledger.used("Test") == 3
+
+    ledger.flush()
+    other_worker = QuotaLedger(path, flush_interval=3600)
+    assert other_worker.used("Test") == 3
+    assert [other_worker.try_consume("Test", 5) for _ in range(3)] == [True, True, False]
+
+
+def test_prune_drops_previous_days(tmp_path):
+    ledger = QuotaLedger(str(tmp_path / "quota.sqlite3"))
+    ledger._conn.execute("INSERT INTO quota_usage (provider, day, used) VALUES ('Test', '2000-01-01', 7)")
+    ledger.try_consume("Test", 0)
+    ledger.flush()
+
+    ledger.prune()
+
+    days = [row[0] for row in ledger._conn.execute("SELECT day FROM quota_usage")]
+    assert days == [ledger.today()]
+
+
+def test_closing_the_container_flushes_calls_counted_by_the_tools(tmp_path, monkeypatch):
+    from orchestrator.container import AppContainer
+
+    path = str(tmp_path / "quota.sqlite3")
+    limiter = RateLimiter(QuotaLedger(path, flush_interval=3600), limits={"Test": (1000.0, 100, 10)})
+    monkeypatch.setattr(rate_limiter, "_default_limiter", limiter)
+
+    async def cli_run():
+        for _ in range(3):
+            assert rate_limiter.get_rate_limiter().try_acquire("Test")
+        await AppContainer().close()  # The CLI never called start_rate_limiter()
+
+    asyncio.run(cli_run())
+
+    assert QuotaLedger(path).used("Test") == 3
@@ -0,0 +1,72 @@
+# tests/test_singleflight.py - Coalesced calls share one computation; each caller keeps its own deadline
+import asyncio
+
+import pytest
+
+from models.deadline import Deadline
+from tools import weather_tool
+from tools.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    flights = SingleFlight("test")
+    started = []
+
+    async def compute():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*(flights.do_shared("key", compute) for _ in range(3)))
+
+    results = asyncio.run(run())
+
+    assert started == [1]
+    assert [result for result, _, _ in results] == ["result"] * 3
+    assert [shared for _, _, shared in results] == [False, True, True]
+    assert flights.stats()["joined"] == 2 and flights.stats()["in_flight"] == 0
+
+
+def test_computation_survives_its_leader_being_cancelled():
+    flights = SingleFlight("test")
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        leader = asyncio.ensure_future(flights.do("key", compute))
+        await asyncio.sleep(0)
+        joiner = asyncio.ensure_future(flights.do("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await joiner
+
+    assert asyncio.run(run()) == "result"
+
+
+def test_weather_fetch_uses_the_upstream_timeout_not_the_leaders_budget(monkeypatch):
+    monkeypatch.setenv("OPENWEATHERMAP_API_KEY", "test-key")
+    timeouts = []
+
+    async def fake_fetch(city, country_code, api_key, timeout):
+        timeouts.append(timeout)
+        await asyncio.sleep(0.2)
+        return {"name": city, "main": {"temp": 21}}
+
+    monkeypatch.setattr(weather_tool, "_fetch_weather", fake_fetch)
+
+    async def run():
+        leader = asyncio.ensure_future(weather_tool.get_weather_data("Singleflightville", "GB", Deadline.after(0.05)))
+        await asyncio.sleep(0)
+        joiner = asyncio.ensure_future(weather_tool.get_weather_data("Singleflightville", "GB", Deadline.after(2)))
+        return await leader, await joiner
+
+    leader, joiner = asyncio.run(run())
+
+    assert leader == {"error": "Request timeout"}  # The leader's own short budget ran out
+    assert joiner == {"name": "Singleflightville", "main": {"temp": 21}}  # The shared fetch kept going
+    assert timeouts == [weather_tool.WEATHER_REQUEST_TIMEOUT]
@@ -0,0 +1,60 @@
+# tests/test_tracing.py - Spans nest across tasks and the JSONL exporter writes off the event loop
+import asyncio
+import json
+
+from tools import tracing
+from tools.tracing import JsonlExporter, set_exporter, span
+
+
+def test_jsonl_exporter_writes_every_span_through_one_handle(tmp_path, monkeypatch):
+    opened = []
+    real_open = open
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr(tracing, "open", counting_open, raising=False)
+    path = str(tmp_path / "traces.jsonl")
+    exporter = JsonlExporter(path)
+    set_exporter(exporter)
+    try:
+        async def briefing():
+            with span("briefing"):
+                await asyncio.gather(*(_child(index) for index in range(20)))
+
+        asyncio.run(briefing())
+    finally:
+        set_exporter(None)
+    exporter.close()
+
+    with real_open(path, encoding="utf-8") as f:
+        spans = [json.loads(line) for line in f]
+    assert opened == [path]
+    assert len(spans) == 21
+    root = spans[-1]
+    assert root["name"] == "briefing"
+    assert {record["parent_id"] for record in spans[:-1]} == {root["span_id"]}
+
+
+async def _child(index: int) -> None:
+    with span("child", index=index):
+        await asyncio.sleep(0)
+
+
+def test_spans_exported_after_close_start_a_new_writer(tmp_path):
+    path = str(tmp_path / "traces.jsonl")
+    exporter = JsonlExporter(path)
+    set_exporter(exporter)
+    try:
+        with span("first"):
+            pass
+        exporter.close()
+        with span("second"):
+            pass
+    finally:
+        set_exporter(None)
+    exporter.close()
+
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line)["name"] for line in f] == ["first", "second"]
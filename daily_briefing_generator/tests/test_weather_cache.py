@@ -0,0 +1,37 @@
+# tests/test_weather_cache.py - Weather cache freshness, staleness and the shared SQLite backend
+import asyncio
+import time
+
+from tools.weather_tool import SQLiteWeatherCache, WeatherCache
+
+KEY = WeatherCache.make_key(" New  York ", "US")
+
+
+def test_keys_are_normalized():
+    assert KEY == WeatherCache.make_key("new york", "us")
+
+
+def test_fresh_then_stale_then_expired():
+    cache = WeatherCache(ttl=10, stale_ttl=10)
+    cache.set(KEY, {"temp": 20})
+    assert cache.get(KEY) == ({"temp": 20}, True)
+
+    cache._entries[KEY] = ({"temp": 20}, time.time() - 15)
+    assert cache.get(KEY) == ({"temp": 20}, False)
+
+    cache._entries[KEY] = ({"temp": 20}, time.time() - 25)
+    assert cache.get(KEY) == (None, False)
+    assert (cache.hits, cache.stale_hits, cache.misses) == (1, 1, 1)
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "weather.sqlite3")
+    first, second = SQLiteWeatherCache(path, max_entries=2), SQLiteWeatherCache(path, max_entries=2)
+
+    asyncio.run(first.aset(KEY, {"temp": 20}))
+
+    assert asyncio.run(second.aget(KEY)) == ({"temp": 20}, True)
+    first.set(("a", "b"), {})
+    first.set(("c", "d"), {})
+    assert second.size() == 2
+    assert second.get(KEY) == (None, False)  # Oldest reading evicted
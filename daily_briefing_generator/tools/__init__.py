@@ -2,3 +2,8 @@
 Tools module for the daily briefing generator.
 Contains utility tools for data fetching and processing.
 """
+
+from config.settings import load_environment
+
+# Tool modules read their settings from the environment at import time, so .env is loaded first (once)
+load_environment()
@@ -0,0 +1,189 @@
+# tools/article_store.py - Local indexed article store (SQLite + FTS5)
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from tools.dedup_index import canonicalize_url
+
+# Store configuration (override via environment variables)
+NEWS_STORE_ENABLED = os.getenv("NEWS_STORE_ENABLED", "false").lower() == "true"
+NEWS_STORE_MAX_AGE = int(os.getenv("NEWS_STORE_MAX_AGE", "900"))  # Seconds before a category/region is stale
+NEWS_STORE_RETENTION = int(os.getenv("NEWS_STORE_RETENTION", str(3 * 24 * 3600)))  # Seconds articles are kept
+ARTICLE_STORE_PATH = os.getenv(
+    "ARTICLE_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "articles.sqlite3")
+)
+
+
+class ArticleStore:
+    def __init__(self, path: str = ARTICLE_STORE_PATH):
+        """
+        Normalized articles keyed by (category, region), with full-text search
+        when the SQLite build ships FTS5. Safe to share between the ingestion
+        task and request handlers.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                category TEXT NOT NULL,
+                region TEXT NOT NULL,
+                dedup_key TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                url TEXT,
+                published_at TEXT,
+                source TEXT,
+                content TEXT,
+                fetched_at REAL NOT NULL,
+                UNIQUE (category, region, dedup_key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_pair ON articles (category, region, fetched_at);
+            CREATE TABLE IF NOT EXISTS refreshes (
+                category TEXT NOT NULL,
+                region TEXT NOT NULL,
+                refreshed_at REAL NOT NULL,
+                PRIMARY KEY (category, region)
+            );
+            """
+        )
+        self.fts_enabled = self._create_fts_index()
+        self._conn.commit()
+
+    def _create_fts_index(self) -> bool:
+        """Create the FTS5 index and its sync triggers; returns False if FTS5 is unavailable"""
+        try:
+            self._conn.executescript(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, description, content='articles', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, title, description)
+                    VALUES ('delete', old.id, old.title, old.description);
+                END;
+                """
+            )
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"Article store: FTS5 unavailable, search disabled ({e})")
+            return False
+
+    def upsert_articles(self, category: str, region: str, articles: List[Dict]) -> int:
+        """Store articles for a category/region, skipping ones already stored; returns rows added"""
+        now = time.time()
+        rows = []
+        for article in articles:
+            title = (article.get("title") or "").strip()
+            if not title:
+                continue
+            dedup_key = canonicalize_url(article.get("url", "")) or title.lower()
+            rows.append((
+                category, region, dedup_key, title,
+                article.get("description", ""),
+                article.get("url", ""),
+                article.get("published_at", ""),
+                json.dumps(article.get("source", {})),
+                article.get("content", ""),
+                now
+            ))
+        added = 0
+        with self._lock:
+            for row in rows:
+                cursor = self._conn.execute(
+                    """INSERT OR IGNORE INTO articles
+                       (category, region, dedup_key, title, description, url, published_at, source, content, fetched_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    row
+                )
+                added += cursor.rowcount
+            self._conn.execute(
+                "INSERT OR REPLACE INTO refreshes (category, region, refreshed_at) VALUES (?, ?, ?)",
+                (category, region, now)
+            )
+            self._conn.commit()
+        return added
+
+    def last_refreshed(self, category: str, region: str) -> Optional[float]:
+        """Unix time the category/region was last refreshed, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT refreshed_at FROM refreshes WHERE category = ? AND region = ?", (category, region)
+            ).fetchone()
+        return row["refreshed_at"] if row else None
+
+    def is_fresh(self, category: str, region: str, max_age: int = NEWS_STORE_MAX_AGE) -> bool:
+        """True when the category/region was refreshed within max_age seconds"""
+        refreshed_at = self.last_refreshed(category, region)
+        return refreshed_at is not None and time.time() - refreshed_at <= max_age
+
+    def get_articles(self, category: str, region: str, limit: int, query: Optional[str] = None) -> List[Dict]:
+        """Best full-text matches for query first (BM25), topped up with the most recent articles"""
+        matched: List[sqlite3.Row] = []
+        with self._lock:
+            if query and self.fts_enabled:
+                matched = self._conn.execute(
+                    """SELECT a.* FROM articles_fts f JOIN articles a ON a.id = f.rowid
+                       WHERE articles_fts MATCH ? AND a.category = ? AND a.region = ?
+                       ORDER BY f.rank, a.published_at DESC LIMIT ?""",
+                    (self._fts_query(query), category, region, limit)
+                ).fetchall()
+            rows = list(matched)
+            if len(rows) < limit:
+                seen_ids = {row["id"] for row in rows}
+                recent = self._conn.execute(
+                    """SELECT * FROM articles WHERE category = ? AND region = ?
+                       ORDER BY published_at DESC, fetched_at DESC LIMIT ?""",
+                    (category, region, limit + len(rows))
+                ).fetchall()
+                rows.extend(row for row in recent if row["id"] not in seen_ids)
+        return [self._row_to_article(row) for row in rows[:limit]]
+
+    def prune(self, retention: int = NEWS_STORE_RETENTION) -> int:
+        """Delete articles older than retention seconds; returns rows removed"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM articles WHERE fetched_at < ?", (time.time() - retention,))
+            self._conn.commit()
+            return cursor.rowcount
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Quote each term so user text can't inject FTS5 syntax"""
+        terms = [term.replace('"', '') for term in query.split() if term.strip('"')]
+        return " OR ".join(f'"{term}"' for term in terms)
+
+    @staticmethod
+    def _row_to_article(row: sqlite3.Row) -> Dict:
+        return {
+            "title": row["title"],
+            "description": row["description"],
+            "url": row["url"],
+            "published_at": row["published_at"],
+            "source": json.loads(row["source"] or "{}"),
+            "content": row["content"]
+        }
+
+
+_default_store: Optional[ArticleStore] = None
+
+
+def get_article_store() -> ArticleStore:
+    """Return the process-wide article store"""
+    global _default_store
+    if _default_store is None:
+        _default_store = ArticleStore()
+    return _default_store
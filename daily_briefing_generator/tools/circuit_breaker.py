@@ -0,0 +1,198 @@
+# tools/circuit_breaker.py - Per-upstream circuit breakers that fail fast while a dependency is down
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+from tools.metrics import record_upstream_error
+
+# Breaker configuration (override via environment variables)
+CIRCUIT_WINDOW = int(os.getenv("CIRCUIT_WINDOW", "20"))  # Recent calls judged per upstream
+CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))  # Calls needed before the breaker may open
+CIRCUIT_FAILURE_RATIO = float(os.getenv("CIRCUIT_FAILURE_RATIO", "0.5"))  # Share of failed or slow calls that opens it
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "5"))  # Slower calls count as failures
+CIRCUIT_LLM_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_LLM_SLOW_CALL_SECONDS", "20"))  # Same, for Gemini
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))  # Time before a trial call is let through
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open"""
+
+    def __init__(self, name: str):
+        super().__init__(f"{name} is unavailable (circuit open)")
+        self.name = name
+
+
+class UpstreamError(Exception):
+    """An upstream answered, but with a status that counts against its breaker (429 or 5xx)"""
+
+
+def is_upstream_failure(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+class CircuitBreaker:
+    def __init__(self, name: str,
+                 window: int = CIRCUIT_WINDOW,
+                 min_calls: int = CIRCUIT_MIN_CALLS,
+                 failure_ratio: float = CIRCUIT_FAILURE_RATIO,
+                 slow_call_seconds: float = CIRCUIT_SLOW_CALL_SECONDS,
+                 open_seconds: float = CIRCUIT_OPEN_SECONDS):
+        """
+        Closed: calls flow and their outcomes are judged over a sliding window.
+        Open: once too many recent calls failed or were slow, calls are refused
+        for open_seconds. Half-open: a single trial call decides whether the
+        circuit closes again or stays open for another period.
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self._outcomes: Deque[bool] = deque(maxlen=window)  # True for a failed or slow call
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+        self.times_opened = 0
+        self.rejected = 0
+        self.last_success: Optional[float] = None  # Wall-clock time of the last good answer
+        self.last_failure: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state only one trial call at a time"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._trial_running:
+            self._state = HALF_OPEN
+            self._trial_running = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, seconds: float) -> None:
+        """A call that got an answer; it still counts against the upstream if it was slow"""
+        self._record(seconds >= self.slow_call_seconds)
+
+    def record_failure(self) -> None:
+        self._record(True)
+
+    def release(self) -> None:
+        """An allowed call was abandoned without an outcome (cancelled or never made)"""
+        if self._state == HALF_OPEN:
+            self._trial_running = False
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Record the outcome of an allowed call made inside the block"""
+        started = time.monotonic()
+        try:
+            yield
+        except (asyncio.CancelledError, GeneratorExit):
+            self.release()
+            raise
+        except asyncio.TimeoutError:
+            # The upstream didn't answer in time: as bad as an error, whatever the slow-call threshold
+            self.record_failure()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - started)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Refuse with CircuitOpenError while open, otherwise track the call made inside the block"""
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        with self.track():
+            yield
+
+    def _record(self, failed: bool) -> None:
+        if failed:
+            self.last_failure = time.time()
+            record_upstream_error(self.name)
+        else:
+            self.last_success = time.time()
+        if self._state == HALF_OPEN:
+            self._trial_running = False
+            if failed:
+                self._open()
+            else:
+                self._state = CLOSED
+                self._outcomes.clear()
+            return
+        if self._state == OPEN:
+            return  # Late outcome of a call made before the circuit opened
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls and sum(self._outcomes) / len(self._outcomes) >= self.failure_ratio:
+            self._open()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.times_opened += 1
+        print(f"Circuit opened for {self.name}: failing fast for {self.open_seconds:.0f}s")
+
+    def snapshot(self) -> Dict[str, object]:
+        state = self.state
+        return {
+            "state": state,
+            "recent_calls": len(self._outcomes),
+            "recent_failure_ratio": round(sum(self._outcomes) / len(self._outcomes), 3) if self._outcomes else 0.0,
+            "retry_in_seconds": round(max(0.0, self._opened_at + self.open_seconds - time.monotonic()), 1)
+            if state == OPEN else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "last_success": self.last_success,
+            "last_failure": self.last_failure
+        }
+
+
+class CircuitBreakerRegistry:
+    def __init__(self):
+        """One breaker per upstream name, created on first use"""
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str, **settings) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(name, **settings)
+        return breaker
+
+    def find(self, name: str) -> Optional[CircuitBreaker]:
+        """The breaker for name if it has been used, without creating one"""
+        return self._breakers.get(name)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Expose breaker states for health checks and metrics"""
+        return {name: breaker.snapshot() for name, breaker in sorted(self._breakers.items())}
+
+
+_default_registry: Optional[CircuitBreakerRegistry] = None
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Return the process-wide breaker registry"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = CircuitBreakerRegistry()
+    return _default_registry
+
+
+def get_breaker(name: str, **settings) -> CircuitBreaker:
+    """Return the breaker for one upstream (settings only apply when it is first created)"""
+    return get_circuit_breakers().get(name, **settings)
@@ -0,0 +1,153 @@
+# tools/dedup_index.py - Incremental near-duplicate index for news articles
+import re
+from collections import OrderedDict, defaultdict
+from typing import Dict, FrozenSet, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the click and never change the story
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "cmpid", "ocid", "smid", "src"}
+_DESCRIPTION_TOKEN_RE = re.compile(r"[a-z0-9]{4,}")  # Skip short words that every summary shares
+
+
+def canonicalize_url(url: str) -> str:
+    """Reduce a URL to the form different feeds use for the same story"""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host.startswith("m."):
+        host = host[2:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("", host, path, query, ""))
+
+
+def title_tokens(title: str) -> FrozenSet[str]:
+    """Token set used for title overlap (matches the original whitespace split)"""
+    return frozenset(title.lower().strip().split())
+
+
+def description_tokens(description: str) -> FrozenSet[str]:
+    """Token set used for description overlap"""
+    return frozenset(_DESCRIPTION_TOKEN_RE.findall((description or "").lower()))
+
+
+class NearDuplicateIndex:
+    def __init__(self,
+                 title_threshold: float = 0.7,
+                 description_threshold: float = 0.8,
+                 min_description_tokens: int = 8,
+                 max_entries: Optional[int] = None):
+        """
+        Inverted token index for near-duplicate detection.
+
+        Two articles are duplicates when their titles share more than
+        title_threshold of the larger title's words, their canonical URLs
+        match, or their descriptions overlap by more than
+        description_threshold. Exact titles and URLs are recognised in O(1);
+        near matches only compare against entries sharing at least one token.
+        With max_entries set the index evicts the oldest stories, so a single
+        instance can be kept across requests.
+        """
+        self.title_threshold = title_threshold
+        self.description_threshold = description_threshold
+        self.min_description_tokens = min_description_tokens
+        self.max_entries = max_entries
+
+        self._next_id = 0
+        self._entries: "OrderedDict[int, Dict]" = OrderedDict()  # id -> precomputed keys
+        self._exact_titles: Dict[str, int] = {}
+        self._urls: Dict[str, int] = {}
+        self._title_postings: Dict[str, Set[int]] = defaultdict(set)
+        self._description_postings: Dict[str, Set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find_duplicate(self, article: Dict) -> Optional[int]:
+        """Return the id of an indexed story this article duplicates, if any"""
+        title = article.get("title", "").lower().strip()
+        url = canonicalize_url(article.get("url", ""))
+
+        # O(1) checks first: identical title or same canonical URL
+        if title in self._exact_titles:
+            return self._exact_titles[title]
+        if url and url in self._urls:
+            return self._urls[url]
+
+        match = self._best_overlap(title_tokens(title), self._title_postings, "title_tokens", self.title_threshold)
+        if match is not None:
+            return match
+
+        desc_tokens = description_tokens(article.get("description", ""))
+        if len(desc_tokens) >= self.min_description_tokens:
+            return self._best_overlap(desc_tokens, self._description_postings, "description_tokens", self.description_threshold)
+        return None
+
+    def add(self, article: Dict) -> bool:
+        """Index the article unless it duplicates a known story; returns True when it was new"""
+        title = article.get("title", "").lower().strip()
+        if not title or self.find_duplicate(article) is not None:
+            return False
+
+        entry_id = self._next_id
+        self._next_id += 1
+        entry = {
+            "title": title,
+            "url": canonicalize_url(article.get("url", "")),
+            "title_tokens": title_tokens(title),
+            "description_tokens": description_tokens(article.get("description", ""))
+        }
+        self._entries[entry_id] = entry
+        self._exact_titles[title] = entry_id
+        if entry["url"]:
+            self._urls[entry["url"]] = entry_id
+        for token in entry["title_tokens"]:
+            self._title_postings[token].add(entry_id)
+        if len(entry["description_tokens"]) >= self.min_description_tokens:
+            for token in entry["description_tokens"]:
+                self._description_postings[token].add(entry_id)
+
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+        return True
+
+    def _best_overlap(self, tokens: FrozenSet[str], postings: Dict[str, Set[int]],
+                      field: str, threshold: float) -> Optional[int]:
+        """Count shared tokens via the postings lists and test the overlap ratio"""
+        if not tokens:
+            return None
+        shared: Dict[int, int] = defaultdict(int)
+        for token in tokens:
+            for entry_id in postings.get(token, ()):
+                shared[entry_id] += 1
+        for entry_id, count in shared.items():
+            other = self._entries[entry_id][field]
+            if count / max(len(tokens), len(other)) > threshold:
+                return entry_id
+        return None
+
+    def _evict_oldest(self) -> None:
+        entry_id, entry = self._entries.popitem(last=False)
+        if self._exact_titles.get(entry["title"]) == entry_id:
+            del self._exact_titles[entry["title"]]
+        if entry["url"] and self._urls.get(entry["url"]) == entry_id:
+            del self._urls[entry["url"]]
+        for token in entry["title_tokens"]:
+            self._discard_posting(self._title_postings, token, entry_id)
+        for token in entry["description_tokens"]:
+            self._discard_posting(self._description_postings, token, entry_id)
+
+    @staticmethod
+    def _discard_posting(postings: Dict[str, Set[int]], token: str, entry_id: int) -> None:
+        ids = postings.get(token)
+        if ids is not None:
+            ids.discard(entry_id)
+            if not ids:
+                del postings[token]
@@ -1,15 +1,149 @@
 # tools/enhanced_news_tool.py - Comprehensive Multi-API News System
 import asyncio
-import aiohttp
-import feedparser
+import inspect
 import os
 import json
-from typing import Dict, List, Any
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
+from urllib.parse import urlparse
 
-# Load environment variables
-load_dotenv()
+from tools.http_client import get_session, close_http_client
+from tools.dedup_index import NearDuplicateIndex
+from tools.provider_stats import get_provider_stats
+from tools.rate_limiter import get_rate_limiter
+from tools.circuit_breaker import CircuitOpenError, UpstreamError, get_breaker, is_upstream_failure
+from tools.metrics import time_stage
+from tools.tracing import span
+
+from models.deadline import Deadline, timeout_for
+from models.intent import news_region
+
+# RSS ingestion tuning (override via environment variables)
+RSS_MAX_FEEDS = int(os.getenv("RSS_MAX_FEEDS", "3"))  # Feeds tried per category/region
+RSS_CONCURRENCY = int(os.getenv("RSS_CONCURRENCY", "6"))  # Feeds downloaded at once
+RSS_FEED_TIMEOUT = float(os.getenv("RSS_FEED_TIMEOUT", "10"))
+RSS_PARSE_EXECUTOR = os.getenv("RSS_PARSE_EXECUTOR", "thread").lower()  # thread or process
+NEWS_API_TIMEOUT = float(os.getenv("NEWS_API_TIMEOUT", "15"))  # Upper bound per news API call
+NEWS_FANOUT_MODE = os.getenv("NEWS_FANOUT_MODE", "first_n").lower()  # first_n, all or rss (no API calls)
+NEWS_HEDGE_INITIAL = int(os.getenv("NEWS_HEDGE_INITIAL", "2"))  # Providers started at once in first_n mode
+NEWS_HEDGE_DELAY = float(os.getenv("NEWS_HEDGE_DELAY", "1.5"))  # Seconds before hedging a provider with no history
+
+_parse_executor: Optional[Executor] = None
+
+# Enhanced RSS feeds for different categories and regions
+RSS_FEEDS = {
+    "general": {
+        "global": [
+            "https://feeds.bbci.co.uk/news/rss.xml",
+            "https://rss.cnn.com/rss/edition.rss", 
+            "https://feeds.reuters.com/reuters/topNews",
+            "https://feeds.nbcnews.com/nbcnews/public/news",
+            "https://feeds.skynews.com/feeds/rss/world.xml",
+            "https://feeds.feedburner.com/time/world",
+            "https://feeds.washingtonpost.com/rss/world"
+        ],
+        "india": [
+            "https://feeds.feedburner.com/ndtvnews-top-stories",
+            "https://timesofindia.indiatimes.com/rssfeedstopstories.cms",
+            "https://www.thehindu.com/news/national/?service=rss",
+            "https://indianexpress.com/feed/",
+            "https://www.hindustantimes.com/feeds/rss/india-news/index.xml",
+            "https://www.business-standard.com/rss/latest.rss"
+        ],
+        "us": [
+            "https://feeds.washingtonpost.com/rss/national",
+            "https://rss.nytimes.com/services/xml/rss/nyt/US.xml",
+            "https://feeds.usatoday.com/usatoday-NewsTopStories",
+            "https://feeds.foxnews.com/foxnews/politics"
+        ],
+        "uk": [
+            "https://feeds.bbci.co.uk/news/uk/rss.xml",
+            "https://www.theguardian.com/uk/rss",
+            "https://feeds.skynews.com/feeds/rss/uk.xml"
+        ]
+    },
+    "technology": {
+        "global": [
+            "https://feeds.feedburner.com/TechCrunch",
+            "https://feeds.arstechnica.com/arstechnica/index",
+            "https://www.wired.com/feed/rss",
+            "https://feeds.reuters.com/reuters/technologyNews",
+            "https://feeds.feedburner.com/venturebeat/SZYF",
+            "https://www.theverge.com/rss/index.xml",
+            "https://feeds.mashable.com/Mashable",
+            "https://techcrunch.com/feed/"
+        ],
+        "india": [
+            "https://economictimes.indiatimes.com/tech/rssfeeds/13357270.cms",
+            "https://www.financialexpress.com/industry/technology/feed/"
+        ]
+    },
+    "business": {
+        "global": [
+            "https://feeds.reuters.com/reuters/businessNews",
+            "https://feeds.bloomberg.com/markets/news.rss",
+            "https://feeds.cnbc.com/cnbc/news",
+            "https://feeds.fortune.com/fortune/feed",
+            "https://feeds.feedburner.com/entrepreneur/latest",
+            "https://feeds.forbes.com/forbesbusiness/feed2.xml"
+        ],
+        "india": [
+            "https://economictimes.indiatimes.com/rssfeedstopstories.cms",
+            "https://www.business-standard.com/rss/home_page_top_stories.rss",
+            "https://www.financialexpress.com/market/feed/"
+        ]
+    },
+    "health": {
+        "global": [
+            "https://feeds.reuters.com/reuters/health",
+            "https://www.who.int/rss-feeds/news-english.xml",
+            "https://feeds.webmd.com/rss/rss.aspx?RSSSource=RSS_PUBLIC"
+        ]
+    },
+    "sports": {
+        "global": [
+            "https://feeds.bbci.co.uk/sport/rss.xml",
+            "https://feeds.reuters.com/reuters/sportsNews",
+            "http://rss.espn.com/rss/news"
+        ]
+    }
+}
+
+# Country codes and names each API expects per region
+REGION_COUNTRY_CODES = {"india": "in", "us": "us", "uk": "gb", "global": "us"}  # Default to US for global
+REGION_COUNTRY_NAMES = {"india": "India", "us": "United States", "uk": "United Kingdom", "global": None}
+REGION_MEDIASTACK_COUNTRIES = {"india": "in", "us": "us", "uk": "gb", "global": "us,gb,in,au,ca"}  # Multiple countries for global
+
+
+def _get_parse_executor() -> Executor:
+    """Lazily create the pool that runs feedparser off the event loop"""
+    global _parse_executor
+    if _parse_executor is None:
+        if RSS_PARSE_EXECUTOR == "process":
+            _parse_executor = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+        else:
+            _parse_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rss-parse")
+    return _parse_executor
+
+
+def _parse_feed(content: str, max_articles: int) -> List[Dict]:
+    """Parse RSS/Atom XML into normalized articles (runs in the parse executor)"""
+    import feedparser  # Imported on first use: only feed parsing needs it
+    feed = feedparser.parse(content)
+    source_name = feed.feed.get("title", "RSS Source")
+    articles = []
+    for entry in feed.entries[:max_articles]:
+        articles.append({
+            "title": entry.get("title", ""),
+            "description": entry.get("summary", entry.get("description", "")),
+            "url": entry.get("link", ""),
+            "published_at": entry.get("published", ""),
+            "source": {"name": source_name},
+            "content": entry.get("content", [{}])[0].get("value", "") if entry.get("content") else ""
+        })
+    return articles
 
 class MultiSourceNewsAggregator:
     def __init__(self):
@@ -23,162 +157,50 @@ class MultiSourceNewsAggregator:
         self.worldnews_api_key = os.getenv("WORLDNEWS_API_KEY") or os.getenv("WORLD_NEWS_API_KEY")  # worldnewsapi.com
         self.newscatcher_api_key = os.getenv("NEWSCATCHER_API_KEY")  # newscatcherapi.com
         
-        # Enhanced RSS feeds for different categories and regions
-        self.rss_feeds = {
-            "general": {
-                "global": [
-                    "https://feeds.bbci.co.uk/news/rss.xml",
-                    "https://rss.cnn.com/rss/edition.rss", 
-                    "https://feeds.reuters.com/reuters/topNews",
-                    "https://feeds.nbcnews.com/nbcnews/public/news",
-                    "https://feeds.skynews.com/feeds/rss/world.xml",
-                    "https://feeds.feedburner.com/time/world",
-                    "https://feeds.washingtonpost.com/rss/world"
-                ],
-                "india": [
-                    "https://feeds.feedburner.com/ndtvnews-top-stories",
-                    "https://timesofindia.indiatimes.com/rssfeedstopstories.cms",
-                    "https://www.thehindu.com/news/national/?service=rss",
-                    "https://indianexpress.com/feed/",
-                    "https://www.hindustantimes.com/feeds/rss/india-news/index.xml",
-                    "https://www.business-standard.com/rss/latest.rss"
-                ],
-                "us": [
-                    "https://feeds.washingtonpost.com/rss/national",
-                    "https://rss.nytimes.com/services/xml/rss/nyt/US.xml",
-                    "https://feeds.usatoday.com/usatoday-NewsTopStories",
-                    "https://feeds.foxnews.com/foxnews/politics"
-                ],
-                "uk": [
-                    "https://feeds.bbci.co.uk/news/uk/rss.xml",
-                    "https://www.theguardian.com/uk/rss",
-                    "https://feeds.skynews.com/feeds/rss/uk.xml"
-                ]
-            },
-            "technology": {
-                "global": [
-                    "https://feeds.feedburner.com/TechCrunch",
-                    "https://feeds.arstechnica.com/arstechnica/index",
-                    "https://www.wired.com/feed/rss",
-                    "https://feeds.reuters.com/reuters/technologyNews",
-                    "https://feeds.feedburner.com/venturebeat/SZYF",
-                    "https://www.theverge.com/rss/index.xml",
-                    "https://feeds.mashable.com/Mashable",
-                    "https://techcrunch.com/feed/"
-                ],
-                "india": [
-                    "https://economictimes.indiatimes.com/tech/rssfeeds/13357270.cms",
-                    "https://www.financialexpress.com/industry/technology/feed/"
-                ]
-            },
-            "business": {
-                "global": [
-                    "https://feeds.reuters.com/reuters/businessNews",
-                    "https://feeds.bloomberg.com/markets/news.rss",
-                    "https://feeds.cnbc.com/cnbc/news",
-                    "https://feeds.fortune.com/fortune/feed",
-                    "https://feeds.feedburner.com/entrepreneur/latest",
-                    "https://feeds.forbes.com/forbesbusiness/feed2.xml"
-                ],
-                "india": [
-                    "https://economictimes.indiatimes.com/rssfeedstopstories.cms",
-                    "https://www.business-standard.com/rss/home_page_top_stories.rss",
-                    "https://www.financialexpress.com/market/feed/"
-                ]
-            },
-            "health": {
-                "global": [
-                    "https://feeds.reuters.com/reuters/health",
-                    "https://www.who.int/rss-feeds/news-english.xml",
-                    "https://feeds.webmd.com/rss/rss.aspx?RSSSource=RSS_PUBLIC"
-                ]
-            },
-            "sports": {
-                "global": [
-                    "https://feeds.bbci.co.uk/sport/rss.xml",
-                    "https://feeds.reuters.com/reuters/sportsNews",
-                    "http://rss.espn.com/rss/news"
-                ]
-            }
-        }
+        # Built once: the aggregator is shared process-wide (see get_news_aggregator)
+        self.rss_feeds = RSS_FEEDS
+        self._feed_table = self._build_feed_table()
     
     async def get_comprehensive_news(self, 
                                    category: str = "general",
                                    region: str = "global",
-                                   max_articles: int = 10) -> Dict[str, Any]:
+                                   max_articles: int = 10,
+                                   deadline: Optional[Deadline] = None,
+                                   fanout_mode: str = NEWS_FANOUT_MODE) -> Dict[str, Any]:
         """
         Get news from multiple sources with comprehensive coverage
         Uses multiple APIs and RSS feeds for maximum reliability
+        
+        With a deadline, sources still running when it passes are cancelled and
+        whatever articles already arrived are returned. fanout_mode "first_n"
+        stops at the first max_articles unique API articles; "all" waits for
+        every configured API; "rss" skips the APIs and spends no quota.
         """
         all_articles = []
         sources_tried = []
         apis_used = []
         
         # Strategy 1: Try multiple news APIs in parallel
-        api_tasks = []
-        
-        # GNews API (usually most reliable)
-        if self.gnews_api_key:
-            api_tasks.append(self._fetch_from_gnews(category, region, max_articles // 2))
-        
-        # NewsAPI.org
-        if self.news_api_key:
-            api_tasks.append(self._fetch_from_newsapi(category, region, max_articles // 2))
-        
-        # NewsData.io
-        if self.newsdata_api_key:
-            api_tasks.append(self._fetch_from_newsdata(category, region, max_articles // 2))
-        
-        # MediaStack
-        if self.mediastack_api_key:
-            api_tasks.append(self._fetch_from_mediastack(category, region, max_articles // 2))
-        
-        # Currents API
-        if self.currents_api_key:
-            api_tasks.append(self._fetch_from_currents(category, region, max_articles // 2))
-        
-        # WorldNews API
-        if self.worldnews_api_key:
-            api_tasks.append(self._fetch_from_worldnews(category, region, max_articles // 2))
-        
-        # NewsCatcher API
-        if self.newscatcher_api_key:
-            api_tasks.append(self._fetch_from_newscatcher(category, region, max_articles // 2))
-        
-        # Execute API calls in parallel
-        if api_tasks:
-            try:
-                api_results = await asyncio.gather(*api_tasks, return_exceptions=True)
-                for i, result in enumerate(api_results):
-                    if isinstance(result, dict) and result.get('articles'):
-                        all_articles.extend(result['articles'])
-                        if i == 0 and self.gnews_api_key: apis_used.append("GNews")
-                        elif i == 1 and self.news_api_key: apis_used.append("NewsAPI") 
-                        elif i == 2 and self.newsdata_api_key: apis_used.append("NewsData")
-                        elif i == 3 and self.mediastack_api_key: apis_used.append("MediaStack")
-                        elif i == 4 and self.currents_api_key: apis_used.append("Currents")
-                        elif i == 5 and self.worldnews_api_key: apis_used.append("WorldNews")
-                        elif i == 6 and self.newscatcher_api_key: apis_used.append("NewsCatcher")
-            except Exception as e:
-                print(f"Error in parallel API calls: {e}")
+        if fanout_mode != "rss":
+            api_articles, apis_used = await self._fetch_from_apis(category, region, max_articles, deadline, fanout_mode)
+            all_articles.extend(api_articles)
         
         # Strategy 2: RSS feeds (very reliable fallback)
-        if len(all_articles) < max_articles:
-            rss_articles = await self._fetch_from_rss(category, region, max_articles - len(all_articles))
+        if len(all_articles) < max_articles and not (deadline and deadline.expired):
+            rss_articles = await self._fetch_from_rss(category, region, max_articles - len(all_articles),
+                                                      deadline=deadline)
             if rss_articles:
                 all_articles.extend(rss_articles)
                 sources_tried.append("RSS")
         
-        # Strategy 3: Try alternative regions if needed
-        if len(all_articles) < max_articles // 2:
-            fallback_regions = ["global", "us", "india", "uk"]
-            for fallback_region in fallback_regions:
-                if fallback_region != region:
-                    fallback_articles = await self._fetch_from_rss(category, fallback_region, max_articles - len(all_articles))
-                    if fallback_articles:
-                        all_articles.extend(fallback_articles)
-                        sources_tried.append(f"RSS-{fallback_region}")
-                        break
+        # Strategy 3: Try alternative regions if needed (all at once, first to deliver wins)
+        if len(all_articles) < max_articles // 2 and not (deadline and deadline.expired):
+            fallback_region, fallback_articles = await self._fetch_from_fallback_regions(
+                category, region, max_articles - len(all_articles), deadline=deadline
+            )
+            if fallback_articles:
+                all_articles.extend(fallback_articles)
+                sources_tried.append(f"RSS-{fallback_region}")
         
         # Remove duplicates and sort by publish date
         unique_articles = self._remove_duplicates(all_articles)
@@ -190,14 +212,143 @@ class MultiSourceNewsAggregator:
             "articles": sorted_articles[:max_articles],
             "apis_used": apis_used,
             "sources_used": sources_tried,
+            "quota_remaining": self.quota_status(),
             "timestamp": datetime.now().isoformat()
         }
     
-    async def _fetch_from_rss(self, category: str, region: str, max_articles: int) -> List[Dict]:
-        """Fetch news from RSS feeds"""
-        articles = []
-        
-        # Get appropriate RSS feeds
+    def quota_status(self) -> Dict[str, Optional[int]]:
+        """Calls left today for each configured news API"""
+        limiter = get_rate_limiter()
+        return {name: limiter.remaining(name) for name in self._api_fetchers()}
+    
+    def _api_fetchers(self) -> Dict[str, Callable[[str, str, int], Awaitable[Any]]]:
+        """Fetchers for every news API with a configured key, in default preference order"""
+        fetchers = [
+            ("GNews", self.gnews_api_key, self._fetch_from_gnews),  # Usually most reliable
+            ("NewsAPI", self.news_api_key, self._fetch_from_newsapi),
+            ("NewsData", self.newsdata_api_key, self._fetch_from_newsdata),
+            ("MediaStack", self.mediastack_api_key, self._fetch_from_mediastack),
+            ("Currents", self.currents_api_key, self._fetch_from_currents),
+            ("WorldNews", self.worldnews_api_key, self._fetch_from_worldnews),
+            ("NewsCatcher", self.newscatcher_api_key, self._fetch_from_newscatcher)
+        ]
+        return {name: fetch for name, api_key, fetch in fetchers if api_key}
+    
+    async def _fetch_from_apis(self, category: str, region: str, max_articles: int,
+                               deadline: Optional[Deadline] = None,
+                               fanout_mode: str = NEWS_FANOUT_MODE) -> Tuple[List[Dict], List[str]]:
+        """
+        Fan out to the configured news APIs, fastest (by measured latency) first.
+        Providers with an open circuit or out of rate budget or daily quota are
+        skipped, not called.
+        
+        In first_n mode only NEWS_HEDGE_INITIAL providers start at once; another
+        is launched whenever one finishes short of enough articles, or as a
+        hedge when the running ones exceed their usual p95 latency. The fan-out
+        returns as soon as max_articles unique articles arrived and cancels the
+        stragglers, so a slow provider no longer sets the stage latency.
+        """
+        fetchers = self._api_fetchers()
+        if not fetchers:
+            return [], []
+        stats = get_provider_stats()
+        queue = stats.rank(list(fetchers))
+        initial = len(queue) if fanout_mode == "all" else NEWS_HEDGE_INITIAL
+        
+        running: Dict[asyncio.Task, str] = {}
+        
+        limiter = get_rate_limiter()
+        
+        def launch(count: int) -> None:
+            while count > 0 and queue:
+                name = queue.pop(0)
+                breaker = get_breaker(name)
+                if not breaker.allow():
+                    stats.record(name, 0.0, "skipped")  # Circuit open: the provider is failing, fail fast
+                    continue
+                if not limiter.try_acquire(name):
+                    breaker.release()
+                    stats.record(name, 0.0, "skipped")  # Out of rate or daily quota: don't spend a call on it
+                    continue
+                task = asyncio.ensure_future(self._timed_fetch(name, fetchers[name], category, region, max_articles // 2))
+                running[task] = name
+                count -= 1
+        
+        index = NearDuplicateIndex()
+        articles: List[Dict] = []
+        apis_used: List[str] = []
+        stage_deadline = deadline.child(seconds=NEWS_API_TIMEOUT) if deadline else Deadline.after(NEWS_API_TIMEOUT)
+        launch(initial)
+        try:
+            while running and not stage_deadline.expired:
+                # Wait for the next provider, but no longer than the running ones usually take
+                hedge_after = max(stats.expected_latency(name, 0.95) or NEWS_HEDGE_DELAY for name in running.values())
+                timeout = stage_deadline.timeout(hedge_after if queue else None)
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if not stage_deadline.expired:
+                        launch(1)  # Running providers are slower than usual: hedge with the next one
+                    continue
+                for task in done:
+                    name = running.pop(task)
+                    provider_articles = task.result()
+                    fresh = [article for article in provider_articles if index.add(article)]
+                    if fresh:
+                        articles.extend(fresh)
+                        apis_used.append(name)
+                if fanout_mode != "all":
+                    if len(articles) >= max_articles:
+                        break  # Enough unique articles - stop waiting for slower providers
+                    if not stage_deadline.expired:
+                        launch(len(done))  # Replace each provider that came back short
+        finally:
+            for task, name in running.items():
+                if inspect.getcoroutinestate(task.get_coro()) == inspect.CORO_CREATED:
+                    # Never started, so it never enters track(): hand back the half-open trial slot here
+                    get_breaker(name).release()
+                task.cancel()
+        return articles, apis_used
+    
+    async def _timed_fetch(self, name: str, fetch: Callable[[str, str, int], Awaitable[Any]],
+                           category: str, region: str, max_articles: int) -> List[Dict]:
+        """Run one provider fetch (already allowed by its breaker), recording its latency and outcome"""
+        stats = get_provider_stats()
+        started = time.monotonic()
+        try:
+            with span("news.provider", provider=name), get_breaker(name).track(), time_stage("news_fetch", name):
+                result = await fetch(category, region, max_articles)
+        except asyncio.CancelledError:
+            stats.record(name, time.monotonic() - started, "cancelled")
+            raise
+        except Exception:
+            stats.record(name, time.monotonic() - started, "error")  # The fetcher already logged it
+            return []
+        articles = result.get('articles', []) if isinstance(result, dict) else (result or [])
+        stats.record(name, time.monotonic() - started, "success" if articles else "empty")
+        return articles
+    
+    def _check_status(self, name: str, response) -> None:
+        """Throttle on 429 and raise for statuses that count against the provider's breaker"""
+        if response.status == 429:
+            get_rate_limiter().throttle(name)
+        if is_upstream_failure(response.status):
+            raise UpstreamError(f"{name} returned status {response.status}")
+    
+    def _select_feeds(self, category: str, region: str) -> List[str]:
+        """Pick the RSS feeds for a category/region, falling back to general news"""
+        feeds = self._feed_table.get((category, region))
+        if feeds is None:
+            feeds = self._resolve_feeds(category, region)
+        return feeds
+    
+    def _build_feed_table(self) -> Dict[Tuple[str, str], List[str]]:
+        """Resolve feeds for every configured category/region pair once, instead of per request"""
+        regions = {region for feeds_by_region in self.rss_feeds.values() for region in feeds_by_region}
+        regions.add("global")
+        return {(category, region): self._resolve_feeds(category, region)
+                for category in self.rss_feeds for region in regions}
+    
+    def _resolve_feeds(self, category: str, region: str) -> List[str]:
         feeds = []
         if category in self.rss_feeds:
             if region in self.rss_feeds[category]:
@@ -212,30 +363,84 @@ class MultiSourceNewsAggregator:
             else:
                 feeds.extend(self.rss_feeds["general"]["global"])
         
-        # Fetch from each RSS feed
-        for feed_url in feeds[:3]:  # Limit to 3 feeds to avoid too many requests
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(feed_url, timeout=10) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            feed = feedparser.parse(content)
-                            
-                            for entry in feed.entries[:max_articles]:
-                                articles.append({
-                                    "title": entry.get("title", ""),
-                                    "description": entry.get("summary", entry.get("description", "")),
-                                    "url": entry.get("link", ""),
-                                    "published_at": entry.get("published", ""),
-                                    "source": {"name": feed.feed.get("title", "RSS Source")},
-                                    "content": entry.get("content", [{}])[0].get("value", "") if entry.get("content") else ""
-                                })
-            except Exception as e:
-                print(f"RSS feed error for {feed_url}: {e}")
-                continue
+        return feeds[:RSS_MAX_FEEDS]  # Limit feeds to avoid too many requests
+    
+    async def _fetch_from_rss(self, category: str, region: str, max_articles: int,
+                              semaphore: Optional[asyncio.Semaphore] = None,
+                              deadline: Optional[Deadline] = None) -> List[Dict]:
+        """Fetch news from RSS feeds concurrently, stopping once enough articles arrived"""
+        semaphore = semaphore or asyncio.Semaphore(RSS_CONCURRENCY)
+        tasks = [
+            asyncio.ensure_future(self._fetch_feed(feed_url, max_articles, semaphore, deadline))
+            for feed_url in self._select_feeds(category, region)
+        ]
+        articles = []
+        try:
+            for next_feed in asyncio.as_completed(tasks, timeout=deadline.remaining() if deadline else None):
+                articles.extend(await next_feed)
+                if len(articles) >= max_articles:
+                    break  # Enough articles - don't wait for slower feeds
+        except asyncio.TimeoutError:
+            pass  # Deadline reached - keep the feeds that already arrived
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
         
         return articles
     
+    async def _fetch_feed(self, feed_url: str, max_articles: int, semaphore: asyncio.Semaphore,
+                          deadline: Optional[Deadline] = None) -> List[Dict]:
+        """Download one RSS feed and parse it off the event loop; hosts with an open circuit are skipped"""
+        try:
+            # Queue for a slot first, so time spent waiting isn't judged as a slow call to the host
+            async with semaphore:
+                with get_breaker(f"rss:{urlparse(feed_url).netloc}").guard():
+                    session = get_session()
+                    with time_stage("rss_feed", feed_url):
+                        async with session.get(feed_url, timeout=timeout_for(deadline, RSS_FEED_TIMEOUT)) as response:
+                            if is_upstream_failure(response.status):
+                                raise UpstreamError(f"status {response.status}")
+                            if response.status != 200:
+                                return []
+                            content = await response.text()
+            
+            # feedparser is CPU-bound; parsing on the loop would stall every other request
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_get_parse_executor(), _parse_feed, content, max_articles)
+        except asyncio.CancelledError:
+            raise
+        except CircuitOpenError:
+            return []
+        except Exception as e:
+            print(f"RSS feed error for {feed_url}: {e}")
+            return []
+    
+    async def _fetch_from_fallback_regions(self, category: str, region: str, max_articles: int,
+                                           deadline: Optional[Deadline] = None) -> Tuple[Optional[str], List[Dict]]:
+        """Try every alternative region at once and keep the first one that returns articles"""
+        semaphore = asyncio.Semaphore(RSS_CONCURRENCY)
+        fallback_regions = [r for r in ["global", "us", "india", "uk"] if r != region]
+        tasks = {
+            asyncio.ensure_future(self._fetch_from_rss(category, fallback_region, max_articles, semaphore, deadline)): fallback_region
+            for fallback_region in fallback_regions
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED,
+                                                   timeout=deadline.remaining() if deadline else None)
+                if not done:
+                    break  # Deadline reached
+                for task in done:
+                    if not task.cancelled() and task.exception() is None and task.result():
+                        return tasks[task], task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        return None, []
+    
     async def _fetch_from_gnews(self, category: str, region: str, max_articles: int) -> Dict[str, Any]:
         """Fetch from GNews API - usually most reliable"""
         if not self.gnews_api_key:
@@ -244,32 +449,34 @@ class MultiSourceNewsAggregator:
         try:
             country_code = self._get_country_code(region)
             
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    "token": self.gnews_api_key,
-                    "lang": "en",
-                    "country": country_code,
-                    "max": min(max_articles, 10),
-                    "q": category if category != "general" else "",
-                }
-                params = {k: v for k, v in params.items() if v}  # Remove empty values
-                
-                async with session.get("https://gnews.io/api/v4/top-headlines", params=params, timeout=15) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles = []
-                        for article in data.get("articles", []):
-                            articles.append({
-                                "title": article.get("title", ""),
-                                "description": article.get("description", ""),
-                                "url": article.get("url", ""),
-                                "published_at": article.get("publishedAt", ""),
-                                "source": {"name": article.get("source", {}).get("name", "GNews")},
-                                "content": article.get("content", "")
-                            })
-                        return {"articles": articles}
+            session = get_session()
+            params = {
+                "token": self.gnews_api_key,
+                "lang": "en",
+                "country": country_code,
+                "max": min(max_articles, 10),
+                "q": category if category != "general" else "",
+            }
+            params = {k: v for k, v in params.items() if v}  # Remove empty values
+            
+            async with session.get("https://gnews.io/api/v4/top-headlines", params=params, timeout=NEWS_API_TIMEOUT) as response:
+                self._check_status("GNews", response)
+                if response.status == 200:
+                    data = await response.json()
+                    articles = []
+                    for article in data.get("articles", []):
+                        articles.append({
+                            "title": article.get("title", ""),
+                            "description": article.get("description", ""),
+                            "url": article.get("url", ""),
+                            "published_at": article.get("publishedAt", ""),
+                            "source": {"name": article.get("source", {}).get("name", "GNews")},
+                            "content": article.get("content", "")
+                        })
+                    return {"articles": articles}
         except Exception as e:
             print(f"GNews API error: {e}")
+            raise
         
         return {"articles": []}
     
@@ -281,33 +488,35 @@ class MultiSourceNewsAggregator:
         try:
             countries = self._get_mediastack_countries(region)
             
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    "access_key": self.mediastack_api_key,
-                    "countries": countries,
-                    "limit": min(max_articles, 25),
-                    "languages": "en",
-                    "sort": "published_desc"
-                }
-                if category != "general":
-                    params["categories"] = category
-                
-                async with session.get("http://api.mediastack.com/v1/news", params=params, timeout=15) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles = []
-                        for article in data.get("data", []):
-                            articles.append({
-                                "title": article.get("title", ""),
-                                "description": article.get("description", ""),
-                                "url": article.get("url", ""),
-                                "published_at": article.get("published_at", ""),
-                                "source": {"name": article.get("source", "MediaStack")},
-                                "content": article.get("description", "")  # MediaStack doesn't provide full content
-                            })
-                        return {"articles": articles}
+            session = get_session()
+            params = {
+                "access_key": self.mediastack_api_key,
+                "countries": countries,
+                "limit": min(max_articles, 25),
+                "languages": "en",
+                "sort": "published_desc"
+            }
+            if category != "general":
+                params["categories"] = category
+            
+            async with session.get("http://api.mediastack.com/v1/news", params=params, timeout=NEWS_API_TIMEOUT) as response:
+                self._check_status("MediaStack", response)
+                if response.status == 200:
+                    data = await response.json()
+                    articles = []
+                    for article in data.get("data", []):
+                        articles.append({
+                            "title": article.get("title", ""),
+                            "description": article.get("description", ""),
+                            "url": article.get("url", ""),
+                            "published_at": article.get("published_at", ""),
+                            "source": {"name": article.get("source", "MediaStack")},
+                            "content": article.get("description", "")  # MediaStack doesn't provide full content
+                        })
+                    return {"articles": articles}
         except Exception as e:
             print(f"MediaStack API error: {e}")
+            raise
         
         return {"articles": []}
     
@@ -317,35 +526,37 @@ class MultiSourceNewsAggregator:
             return {"articles": []}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    "apiKey": self.currents_api_key,
-                    "language": "en",
-                    "page_size": min(max_articles, 200),
-                }
-                if region != "global":
-                    country_name = self._get_country_name(region)
-                    if country_name:
-                        params["keywords"] = f"{country_name} OR {category}"
-                else:
-                    params["keywords"] = category
-                
-                async with session.get("https://api.currentsapi.services/v1/search", params=params, timeout=15) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles = []
-                        for article in data.get("news", []):
-                            articles.append({
-                                "title": article.get("title", ""),
-                                "description": article.get("description", ""),
-                                "url": article.get("url", ""),
-                                "published_at": article.get("published", ""),
-                                "source": {"name": article.get("author", "Currents")},
-                                "content": article.get("description", "")
-                            })
-                        return {"articles": articles}
+            session = get_session()
+            params = {
+                "apiKey": self.currents_api_key,
+                "language": "en",
+                "page_size": min(max_articles, 200),
+            }
+            if region != "global":
+                country_name = self._get_country_name(region)
+                if country_name:
+                    params["keywords"] = f"{country_name} OR {category}"
+            else:
+                params["keywords"] = category
+            
+            async with session.get("https://api.currentsapi.services/v1/search", params=params, timeout=NEWS_API_TIMEOUT) as response:
+                self._check_status("Currents", response)
+                if response.status == 200:
+                    data = await response.json()
+                    articles = []
+                    for article in data.get("news", []):
+                        articles.append({
+                            "title": article.get("title", ""),
+                            "description": article.get("description", ""),
+                            "url": article.get("url", ""),
+                            "published_at": article.get("published", ""),
+                            "source": {"name": article.get("author", "Currents")},
+                            "content": article.get("description", "")
+                        })
+                    return {"articles": articles}
         except Exception as e:
             print(f"Currents API error: {e}")
+            raise
         
         return {"articles": []}
     
@@ -355,43 +566,45 @@ class MultiSourceNewsAggregator:
             return {"articles": []}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    "api-key": self.worldnews_api_key,
-                    "number": min(max_articles, 100),
-                    "language": "en",
-                    "sort": "publish-time",
-                    "sort-direction": "DESC"
-                }
-                
-                # Add location-based filtering
-                if region == "india":
-                    params["location-filter"] = "IN"
-                elif region == "us":
-                    params["location-filter"] = "US"
-                elif region == "uk":
-                    params["location-filter"] = "GB"
-                
-                # Add category-based text filtering
-                if category != "general":
-                    params["text"] = category
-                
-                async with session.get("https://api.worldnewsapi.com/search-news", params=params, timeout=15) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles = []
-                        for article in data.get("news", []):
-                            articles.append({
-                                "title": article.get("title", ""),
-                                "description": article.get("summary", ""),
-                                "url": article.get("url", ""),
-                                "published_at": article.get("publish_date", ""),
-                                "source": {"name": article.get("source_country", "WorldNews")},
-                                "content": article.get("text", "")
-                            })
-                        return {"articles": articles}
+            session = get_session()
+            params = {
+                "api-key": self.worldnews_api_key,
+                "number": min(max_articles, 100),
+                "language": "en",
+                "sort": "publish-time",
+                "sort-direction": "DESC"
+            }
+            
+            # Add location-based filtering
+            if region == "india":
+                params["location-filter"] = "IN"
+            elif region == "us":
+                params["location-filter"] = "US"
+            elif region == "uk":
+                params["location-filter"] = "GB"
+            
+            # Add category-based text filtering
+            if category != "general":
+                params["text"] = category
+            
+            async with session.get("https://api.worldnewsapi.com/search-news", params=params, timeout=NEWS_API_TIMEOUT) as response:
+                self._check_status("WorldNews", response)
+                if response.status == 200:
+                    data = await response.json()
+                    articles = []
+                    for article in data.get("news", []):
+                        articles.append({
+                            "title": article.get("title", ""),
+                            "description": article.get("summary", ""),
+                            "url": article.get("url", ""),
+                            "published_at": article.get("publish_date", ""),
+                            "source": {"name": article.get("source_country", "WorldNews")},
+                            "content": article.get("text", "")
+                        })
+                    return {"articles": articles}
         except Exception as e:
             print(f"WorldNews API error: {e}")
+            raise
         
         return {"articles": []}
     
@@ -401,43 +614,45 @@ class MultiSourceNewsAggregator:
             return {"articles": []}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"x-api-key": self.newscatcher_api_key}
-                params = {
-                    "lang": "en",
-                    "page_size": min(max_articles, 100),
-                    "sort_by": "date"
-                }
-                
-                # Add country filtering
-                if region == "india":
-                    params["countries"] = "IN"
-                elif region == "us":
-                    params["countries"] = "US" 
-                elif region == "uk":
-                    params["countries"] = "GB"
-                
-                # Add category/topic filtering
-                if category != "general":
-                    params["q"] = category
-                
-                async with session.get("https://api.newscatcherapi.com/v2/search", 
-                                     params=params, headers=headers, timeout=15) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles = []
-                        for article in data.get("articles", []):
-                            articles.append({
-                                "title": article.get("title", ""),
-                                "description": article.get("excerpt", ""),
-                                "url": article.get("link", ""),
-                                "published_at": article.get("published_date", ""),
-                                "source": {"name": article.get("clean_url", "NewsCatcher")},
-                                "content": article.get("summary", "")
-                            })
-                        return {"articles": articles}
+            session = get_session()
+            headers = {"x-api-key": self.newscatcher_api_key}
+            params = {
+                "lang": "en",
+                "page_size": min(max_articles, 100),
+                "sort_by": "date"
+            }
+            
+            # Add country filtering
+            if region == "india":
+                params["countries"] = "IN"
+            elif region == "us":
+                params["countries"] = "US" 
+            elif region == "uk":
+                params["countries"] = "GB"
+            
+            # Add category/topic filtering
+            if category != "general":
+                params["q"] = category
+            
+            async with session.get("https://api.newscatcherapi.com/v2/search", 
+                                 params=params, headers=headers, timeout=NEWS_API_TIMEOUT) as response:
+                self._check_status("NewsCatcher", response)
+                if response.status == 200:
+                    data = await response.json()
+                    articles = []
+                    for article in data.get("articles", []):
+                        articles.append({
+                            "title": article.get("title", ""),
+                            "description": article.get("excerpt", ""),
+                            "url": article.get("link", ""),
+                            "published_at": article.get("published_date", ""),
+                            "source": {"name": article.get("clean_url", "NewsCatcher")},
+                            "content": article.get("summary", "")
+                        })
+                    return {"articles": articles}
         except Exception as e:
             print(f"NewsCatcher API error: {e}")
+            raise
         
         return {"articles": []}
     
@@ -446,33 +661,35 @@ class MultiSourceNewsAggregator:
         try:
             country_code = self._get_country_code(region)
             
-            async with aiohttp.ClientSession() as session:
-                # Try top headlines first
-                params = {
-                    "apiKey": self.news_api_key,
-                    "country": country_code,
-                    "category": category if category != "general" else None,
-                    "pageSize": max_articles
-                }
-                params = {k: v for k, v in params.items() if v is not None}
-                
-                async with session.get("https://newsapi.org/v2/top-headlines", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles = []
-                        for article in data.get("articles", []):
-                            if article.get("title") and "[Removed]" not in article.get("title", ""):
-                                articles.append({
-                                    "title": article["title"],
-                                    "description": article.get("description", ""),
-                                    "url": article.get("url", ""),
-                                    "published_at": article.get("publishedAt", ""),
-                                    "source": article.get("source", {}),
-                                    "content": article.get("content", "")
-                                })
-                        return articles
+            session = get_session()
+            # Try top headlines first
+            params = {
+                "apiKey": self.news_api_key,
+                "country": country_code,
+                "category": category if category != "general" else None,
+                "pageSize": max_articles
+            }
+            params = {k: v for k, v in params.items() if v is not None}
+            
+            async with session.get("https://newsapi.org/v2/top-headlines", params=params, timeout=NEWS_API_TIMEOUT) as response:
+                self._check_status("NewsAPI", response)
+                if response.status == 200:
+                    data = await response.json()
+                    articles = []
+                    for article in data.get("articles", []):
+                        if article.get("title") and "[Removed]" not in article.get("title", ""):
+                            articles.append({
+                                "title": article["title"],
+                                "description": article.get("description", ""),
+                                "url": article.get("url", ""),
+                                "published_at": article.get("publishedAt", ""),
+                                "source": article.get("source", {}),
+                                "content": article.get("content", "")
+                            })
+                    return articles
         except Exception as e:
             print(f"NewsAPI error: {e}")
+            raise
         
         return []
     
@@ -484,87 +701,63 @@ class MultiSourceNewsAggregator:
         try:
             country_code = self._get_country_code(region)
             
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    "apikey": self.newsdata_api_key,
-                    "country": country_code,
-                    "category": category,
-                    "language": "en",
-                    "size": max_articles
-                }
-                
-                async with session.get("https://newsdata.io/api/1/news", params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        articles = []
-                        for article in data.get("results", []):
-                            articles.append({
-                                "title": article.get("title", ""),
-                                "description": article.get("description", ""),
-                                "url": article.get("link", ""),
-                                "published_at": article.get("pubDate", ""),
-                                "source": {"name": article.get("source_id", "NewsData")},
-                                "content": article.get("content", "")
-                            })
-                        return articles
+            session = get_session()
+            params = {
+                "apikey": self.newsdata_api_key,
+                "country": country_code,
+                "category": category,
+                "language": "en",
+                "size": max_articles
+            }
+            
+            async with session.get("https://newsdata.io/api/1/news", params=params, timeout=NEWS_API_TIMEOUT) as response:
+                self._check_status("NewsData", response)
+                if response.status == 200:
+                    data = await response.json()
+                    articles = []
+                    for article in data.get("results", []):
+                        articles.append({
+                            "title": article.get("title", ""),
+                            "description": article.get("description", ""),
+                            "url": article.get("link", ""),
+                            "published_at": article.get("pubDate", ""),
+                            "source": {"name": article.get("source_id", "NewsData")},
+                            "content": article.get("content", "")
+                        })
+                    return articles
         except Exception as e:
             print(f"NewsData error: {e}")
+            raise
         
         return []
     
     def _get_country_code(self, region: str) -> str:
         """Convert region to appropriate country code"""
-        region_map = {
-            "india": "in",
-            "us": "us",
-            "uk": "gb",
-            "global": "us"  # Default to US for global
-        }
-        return region_map.get(region.lower(), "us")
+        return REGION_COUNTRY_CODES.get(region.lower(), "us")
     
     def _get_country_name(self, region: str) -> str:
         """Convert region to country name for APIs that need full names"""
-        region_map = {
-            "india": "India",
-            "us": "United States", 
-            "uk": "United Kingdom",
-            "global": None
-        }
-        return region_map.get(region.lower())
+        return REGION_COUNTRY_NAMES.get(region.lower())
     
     def _get_mediastack_countries(self, region: str) -> str:
         """Get MediaStack-specific country codes"""
-        region_map = {
-            "india": "in",
-            "us": "us",
-            "uk": "gb",
-            "global": "us,gb,in,au,ca"  # Multiple countries for global
-        }
-        return region_map.get(region.lower(), "us")
+        return REGION_MEDIASTACK_COUNTRIES.get(region.lower(), "us")
     
     def _remove_duplicates(self, articles: List[Dict]) -> List[Dict]:
-        """Remove duplicate articles based on title similarity"""
-        seen_titles = set()
-        unique_articles = []
-        
-        for article in articles:
-            title = article.get("title", "").lower().strip()
-            # Simple duplicate detection
-            title_words = set(title.split())
-            is_duplicate = False
-            
-            for seen_title in seen_titles:
-                seen_words = set(seen_title.split())
-                # If 70% of words match, consider it a duplicate
-                if len(title_words & seen_words) / max(len(title_words), len(seen_words)) > 0.7:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate and title:
-                seen_titles.add(title)
-                unique_articles.append(article)
-        
-        return unique_articles
+        """Remove duplicate articles based on title, URL and description similarity"""
+        index = NearDuplicateIndex()
+        return [article for article in articles if index.add(article)]
+
+
+_default_aggregator: Optional[MultiSourceNewsAggregator] = None
+
+
+def get_news_aggregator() -> MultiSourceNewsAggregator:
+    """Return the process-wide aggregator (API keys and feed tables are read once)"""
+    global _default_aggregator
+    if _default_aggregator is None:
+        _default_aggregator = MultiSourceNewsAggregator()
+    return _default_aggregator
 
 
 # Enhanced wrapper function to maintain compatibility
@@ -572,23 +765,17 @@ async def get_news_data(
     query: str = "technology", 
     country: str = "us", 
     category: str = "general",
-    max_articles: int = 5
+    max_articles: int = 5,
+    deadline: Optional[Deadline] = None,
+    aggregator: Optional[MultiSourceNewsAggregator] = None
 ) -> Dict[str, Any]:
     """
     Enhanced news fetching using multiple sources for better coverage
     """
-    aggregator = MultiSourceNewsAggregator()
+    aggregator = aggregator or get_news_aggregator()
+    region = news_region(country)
     
-    # Map country codes to regions
-    region_map = {
-        "in": "india",
-        "us": "us", 
-        "gb": "uk",
-        "uk": "uk"
-    }
-    region = region_map.get(country, "global")
-    
-    result = await aggregator.get_comprehensive_news(category, region, max_articles)
+    result = await aggregator.get_comprehensive_news(category, region, max_articles, deadline=deadline)
     
     # Convert to expected format
     return {
@@ -606,7 +793,7 @@ async def test_enhanced_news():
     print("🧪 Testing Enhanced Multi-API News System")
     print("=" * 60)
     
-    aggregator = MultiSourceNewsAggregator()
+    aggregator = get_news_aggregator()
     
     # Show available APIs
     apis_available = []
@@ -645,6 +832,9 @@ async def test_enhanced_news():
         
         print("-" * 40)
 
+    await close_http_client()
+
 
+# Run from daily_briefing_generator/: python -m tools.enhanced_news_tool
 if __name__ == "__main__":
     asyncio.run(test_enhanced_news())
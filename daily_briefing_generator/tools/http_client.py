@@ -0,0 +1,92 @@
+# tools/http_client.py - Shared, long-lived HTTP connection pool
+import asyncio
+import os
+import weakref
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import aiohttp  # Imported on first use below: it is a large import and the CLI may never need it
+
+from tools.tracing import start_span
+
+# Pool configuration (override via environment variables)
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))  # Total open connections
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))  # Per upstream host
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))  # Seconds to cache DNS lookups
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))  # Idle keep-alive seconds
+
+# One pooled session per event loop (sessions cannot be shared across loops)
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+
+async def _on_request_start(session, trace_ctx, params) -> None:
+    # Host and path only: query strings carry API keys
+    trace_ctx.span = start_span("http.client", method=params.method, host=params.url.host, path=params.url.path)
+
+
+async def _on_request_end(session, trace_ctx, params) -> None:
+    trace_ctx.span.set_attribute("status_code", params.response.status)
+    trace_ctx.span.end("error" if params.response.status >= 500 else None)
+
+
+async def _on_request_exception(session, trace_ctx, params) -> None:
+    trace_ctx.span.set_attribute("error", f"{type(params.exception).__name__}: {params.exception}")
+    trace_ctx.span.end("error")
+
+
+def _trace_config() -> "aiohttp.TraceConfig":
+    """A span per upstream request, parented to whatever span the calling task is in"""
+    import aiohttp
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_request_exception.append(_on_request_exception)
+    return trace_config
+
+
+def _create_session() -> "aiohttp.ClientSession":
+    """Build a session with connection pooling, DNS caching and HTTP/1.1 keep-alive"""
+    import aiohttp
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        use_dns_cache=True,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": "DailyBriefingAgent/1.0"},
+        trace_configs=[_trace_config()]
+    )
+
+
+def get_session() -> "aiohttp.ClientSession":
+    """
+    Return the pooled session for the running event loop, creating it on first use.
+
+    Callers must NOT close the returned session - it is owned by this module
+    and closed by close_http_client() at shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = _create_session()
+        _sessions[loop] = session
+    return session
+
+
+async def start_http_client() -> "aiohttp.ClientSession":
+    """Eagerly create the pooled session (called from application startup)"""
+    return get_session()
+
+
+async def close_http_client() -> None:
+    """Close the pooled session for the running event loop"""
+    loop = asyncio.get_running_loop()
+    session: Optional["aiohttp.ClientSession"] = _sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+        # Give the connector a moment to finish closing SSL transports
+        await asyncio.sleep(0.25)
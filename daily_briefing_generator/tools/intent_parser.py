@@ -0,0 +1,156 @@
+# tools/intent_parser.py - Deterministic fast-path intent parser
+import os
+import re
+from typing import List
+
+from models.intent import BriefingIntent
+
+# Requests parsed with at least this confidence skip the analysis LLM call
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.8"))
+
+# Compact city -> (display name, ISO country code) gazetteer for the cities we see most
+CITY_COUNTRY = {
+    # India
+    "mumbai": ("Mumbai", "in"), "bombay": ("Mumbai", "in"),
+    "delhi": ("Delhi", "in"), "new delhi": ("New Delhi", "in"),
+    "bangalore": ("Bangalore", "in"), "bengaluru": ("Bangalore", "in"),
+    "chennai": ("Chennai", "in"), "kolkata": ("Kolkata", "in"),
+    "hyderabad": ("Hyderabad", "in"), "pune": ("Pune", "in"),
+    "ahmedabad": ("Ahmedabad", "in"), "jaipur": ("Jaipur", "in"),
+    # United States
+    "new york": ("New York", "us"), "nyc": ("New York", "us"),
+    "los angeles": ("Los Angeles", "us"), "san francisco": ("San Francisco", "us"),
+    "chicago": ("Chicago", "us"), "boston": ("Boston", "us"),
+    "seattle": ("Seattle", "us"), "washington": ("Washington", "us"),
+    "miami": ("Miami", "us"), "austin": ("Austin", "us"),
+    # United Kingdom
+    "london": ("London", "gb"), "manchester": ("Manchester", "gb"),
+    "edinburgh": ("Edinburgh", "gb"), "birmingham": ("Birmingham", "gb"),
+    # Rest of the world
+    "tokyo": ("Tokyo", "jp"), "paris": ("Paris", "fr"),
+    "singapore": ("Singapore", "sg"), "sydney": ("Sydney", "au"),
+    "melbourne": ("Melbourne", "au"), "toronto": ("Toronto", "ca"),
+    "vancouver": ("Vancouver", "ca"), "berlin": ("Berlin", "de"),
+    "dubai": ("Dubai", "ae"), "hong kong": ("Hong Kong", "hk"),
+}
+
+# Country names that narrow news to a region when no city is mentioned
+COUNTRY_NAMES = {
+    "india": "in", "indian": "in",
+    "usa": "us", "america": "us", "american": "us",
+    "uk": "gb", "britain": "gb", "british": "gb", "england": "gb",
+    "japan": "jp", "france": "fr", "australia": "au", "canada": "ca", "germany": "de",
+}
+
+# Keyword -> news category lookup table
+CATEGORY_KEYWORDS = {
+    "technology": ["tech", "technology", "ai", "software", "startup", "startups", "gadgets", "digital", "innovation"],
+    "business": ["business", "market", "markets", "finance", "financial", "economy", "economic", "stocks", "corporate"],
+    "health": ["health", "medical", "healthcare", "medicine", "wellness"],
+    "sports": ["sport", "sports", "cricket", "football", "soccer", "tennis", "nba", "ipl"],
+    "entertainment": ["entertainment", "movies", "movie", "celebrity", "music", "bollywood", "hollywood"],
+    "science": ["science", "scientific", "space", "research"],
+}
+KEYWORD_CATEGORY = {keyword: category for category, keywords in CATEGORY_KEYWORDS.items() for keyword in keywords}
+
+WEATHER_KEYWORDS = {"weather", "temperature", "forecast", "rain", "raining", "sunny",
+                    "humid", "humidity", "windy", "snow", "umbrella"}
+# Weather talk in "how cold is it in London", not in "cold war history" or "climate change news":
+# they only ask for weather next to a known city and otherwise leave the decision to the LLM
+AMBIGUOUS_WEATHER_KEYWORDS = {"hot", "cold", "warm", "wind", "climate"}
+NEWS_KEYWORDS = {"news", "headlines", "headline", "updates", "stories", "digest", "happening"}
+# Template words that ask for a full weather + news briefing
+BRIEFING_KEYWORDS = {"complete", "full", "daily", "morning", "evening", "executive"}
+# Generic words that only mean "full briefing" when no narrower topic is given
+GENERIC_BRIEFING_KEYWORDS = {"briefing", "brief", "summary"}
+
+# Words that may follow "in/for/at" without naming a place
+NON_LOCATION_WORDS = {"the", "a", "an", "my", "our", "today", "tonight", "tomorrow", "this", "default",
+                      "general", "news", "weather", "morning", "evening", "business", "travel", "planning",
+                      "executive", "all", "top", "latest", "me", "us", "your"} | set(KEYWORD_CATEGORY)
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_CITY_RE = re.compile(r"\b(" + "|".join(sorted(map(re.escape, CITY_COUNTRY), key=len, reverse=True)) + r")\b")
+_PLACE_RE = re.compile(r"\b(?:in|for|at|from)\s+([a-z][a-z'-]*)")
+_COUNT_RE = re.compile(r"\b(\d{1,2})\s+(?:[a-z]+\s+)?(?:headlines|articles|stories|news)\b")
+
+
+def parse_intent(user_request: str) -> BriefingIntent:
+    """
+    Resolve common request shapes locally, without an LLM round-trip.
+
+    Returns the same slots the master agent's analysis prompt produces, plus
+    a confidence score. Callers should fall back to the LLM below
+    FAST_PATH_MIN_CONFIDENCE.
+    """
+    text = user_request.lower()
+    tokens = _TOKEN_RE.findall(text)
+    token_set = set(tokens)
+
+    # Location lookup: first gazetteer city wins
+    city_match = _CITY_RE.search(text)
+    city, country = CITY_COUNTRY[city_match.group(1)] if city_match else (None, None)
+    if country is None:
+        country = next((COUNTRY_NAMES[token] for token in tokens if token in COUNTRY_NAMES), None)
+
+    # Category lookup preserving the order the user mentioned them
+    categories: List[str] = []
+    for token in tokens:
+        category = KEYWORD_CATEGORY.get(token)
+        if category and category not in categories:
+            categories.append(category)
+
+    ambiguous = bool(token_set & AMBIGUOUS_WEATHER_KEYWORDS)
+    asks_weather = bool(token_set & WEATHER_KEYWORDS) or (
+        ambiguous and city_match is not None and not token_set & NEWS_KEYWORDS
+    )
+    # A bare topic word only means news when the request isn't about weather
+    # ("weather for Tokyo for business travel" is a weather request)
+    asks_news = bool(token_set & NEWS_KEYWORDS) or (bool(categories) and not asks_weather)
+    wants_briefing = bool(token_set & BRIEFING_KEYWORDS) or (
+        bool(token_set & GENERIC_BRIEFING_KEYWORDS) and not asks_weather and not asks_news
+    )
+    needs_weather = asks_weather or wants_briefing
+    needs_news = asks_news or wants_briefing
+
+    count_match = _COUNT_RE.search(text)
+
+    return BriefingIntent(
+        needs_weather=needs_weather,
+        needs_news=needs_news,
+        city=city,
+        country=country,
+        news_categories=tuple(categories),
+        news_location=city,
+        article_count=min(int(count_match.group(1)), 10) if count_match else 5,
+        confidence=_score_confidence(text, city_match, needs_weather, needs_news,
+                                     unresolved_weather_word=ambiguous and not asks_weather),
+        source="fast_path",
+        user_request=user_request
+    )
+
+
+def _score_confidence(text: str, city_match, needs_weather: bool, needs_news: bool,
+                      unresolved_weather_word: bool = False) -> float:
+    """Estimate how safely the fast path can replace the LLM analysis"""
+    if not needs_weather and not needs_news:
+        return 0.0  # No recognisable intent at all
+
+    # A place we don't know ("weather in Smallville") needs the LLM to resolve it
+    for match in _PLACE_RE.finditer(text):
+        if match.group(1) in NON_LOCATION_WORDS or match.group(1) in COUNTRY_NAMES:
+            continue
+        if city_match and city_match.start() <= match.start(1) < city_match.end():
+            continue
+        return 0.3
+
+    # "cold war history", "climate change news": may or may not be about the weather
+    if unresolved_weather_word:
+        return 0.5
+
+    # Weather for a place the gazetteer can't name ("the capital of Kenya", "India")
+    if needs_weather and not city_match and "default location" not in text:
+        return 0.5
+
+    return 0.9 if city_match or "default location" in text else 0.85
+
@@ -0,0 +1,244 @@
+# tools/llm_cache.py - Content-addressed cache for LLM responses
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Time-to-live per call site, in seconds. Prompts that only depend on the user's
+# wording (intent analysis) can live for a long time; prompts built over live
+# weather/news data are only reused briefly.
+CALL_SITE_TTLS = {
+    "master_analysis": 24 * 3600,
+    "master_synthesis": 5 * 60,
+    "weather_analysis": 24 * 3600,
+    "weather_briefing": 10 * 60,
+    "news_analysis": 24 * 3600,
+    "news_briefing": 15 * 60,
+    "news_fallback": 15 * 60,
+}
+DEFAULT_TTL = 5 * 60
+
+# Cache configuration (override via environment variables)
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory").lower()  # memory, sqlite or none
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+LLM_CACHE_TOUCH_BATCH = 64  # SQLite: hits whose LRU timestamps are written back in one transaction
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "llm_cache.sqlite3")
+)
+
+
+def make_cache_key(model_name: str, prompt: str) -> str:
+    """Hash model name plus prompt into a stable cache key"""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_ttl(call_site: str) -> int:
+    """Look up the TTL configured for a call site"""
+    return CALL_SITE_TTLS.get(call_site, DEFAULT_TTL)
+
+
+class LLMCache:
+    """Base class holding hit/miss accounting shared by all backends"""
+
+    backend = "none"
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.call_site_stats: Dict[str, Dict[str, int]] = {}
+
+    def get(self, key: str, call_site: str = "default") -> Optional[str]:
+        """Return a cached response, or None on a miss"""
+        value = self._get(key)
+        site_stats = self.call_site_stats.setdefault(call_site, {"hits": 0, "misses": 0})
+        if value is None:
+            self.misses += 1
+            site_stats["misses"] += 1
+        else:
+            self.hits += 1
+            site_stats["hits"] += 1
+        return value
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        """Store a response for ttl seconds"""
+        if ttl > 0 and value:
+            self._set(key, value, time.time() + ttl)
+
+    async def aget(self, key: str, call_site: str = "default") -> Optional[str]:
+        """get() for the event loop; backends doing disk I/O run it on a worker thread"""
+        return self.get(key, call_site)
+
+    async def aset(self, key: str, value: str, ttl: int) -> None:
+        self.set(key, value, ttl)
+
+    def stats(self) -> Dict[str, object]:
+        """Expose hit/miss counters for health checks and metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "entries": self.size(),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "call_sites": {site: dict(counts) for site, counts in self.call_site_stats.items()}
+        }
+
+    def size(self) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+    def _get(self, key: str) -> Optional[str]:
+        return None
+
+    def _set(self, key: str, value: str, expires_at: float) -> None:
+        pass
+
+
+class MemoryLLMCache(LLMCache):
+    """In-process LRU cache"""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: str, expires_at: float) -> None:
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)  # Evict least recently used
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteLLMCache(LLMCache):
+    """On-disk LRU cache that survives restarts"""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Hits only note their access time here; written back in batches and before evicting
+        self._touches: Dict[str, float] = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+        self._conn.commit()
+
+    async def aget(self, key: str, call_site: str = "default") -> Optional[str]:
+        return await asyncio.to_thread(self.get, key, call_site)
+
+    async def aset(self, key: str, value: str, ttl: int) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            # Expired rows are left for the next _set to delete: a hit never writes
+            if row is None or row[1] <= now:
+                return None
+            self._touches[key] = now
+            if len(self._touches) >= LLM_CACHE_TOUCH_BATCH:
+                self._flush_touches()
+            return row[0]
+
+    def _set(self, key: str, value: str, expires_at: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._flush_touches(commit=False)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now)
+            )
+            # Drop expired rows, then evict least recently used rows over the limit
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                """DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def _flush_touches(self, commit: bool = True) -> None:
+        """Write pending access times back (caller holds the lock)"""
+        if not self._touches:
+            return
+        self._conn.executemany(
+            "UPDATE llm_cache SET last_access = MAX(last_access, ?) WHERE key = ?",
+            [(accessed, key) for key, accessed in self._touches.items()]
+        )
+        self._touches.clear()
+        if commit:
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touches.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+
+_default_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM cache selected by LLM_CACHE_BACKEND"""
+    global _default_cache
+    if _default_cache is None:
+        if LLM_CACHE_BACKEND == "sqlite":
+            _default_cache = SQLiteLLMCache()
+        elif LLM_CACHE_BACKEND == "none":
+            _default_cache = LLMCache(max_entries=0)
+        else:
+            _default_cache = MemoryLLMCache()
+    return _default_cache
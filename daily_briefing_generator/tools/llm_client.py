@@ -0,0 +1,140 @@
+# tools/llm_client.py - Gemini client wrapper with response caching
+import os
+from typing import Any, AsyncIterator, Dict, Optional
+
+from tools.llm_cache import LLMCache, get_llm_cache, get_ttl, make_cache_key
+from tools.circuit_breaker import CIRCUIT_LLM_SLOW_CALL_SECONDS, CircuitBreaker, get_breaker
+from tools.metrics import time_stage
+from tools.tracing import span
+from tools.token_budget import check_budget, record_tokens
+from models.deadline import Deadline
+
+DEFAULT_MODEL = 'gemini-flash-lite-latest'
+
+_configured_api_key: Optional[str] = None
+
+
+def gemini_api_key() -> str:
+    """The Gemini API key from the environment; raises ValueError when none is set"""
+    api_key = os.getenv("GOOGLE_AI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        raise ValueError("Google AI API key not found. Please set GOOGLE_AI_API_KEY in your .env file")
+    return api_key
+
+
+def configure_gemini() -> Any:
+    """Import the Gemini SDK and configure it with the API key from the environment (once per process)"""
+    global _configured_api_key
+    import google.generativeai as genai  # Imported on first use: the SDK takes about a second to load
+    api_key = gemini_api_key()
+    if api_key != _configured_api_key:
+        genai.configure(api_key=api_key)
+        _configured_api_key = api_key
+    return genai
+
+
+class LLMClient:
+    def __init__(self, model_name: str = DEFAULT_MODEL, cache: Optional[LLMCache] = None):
+        """
+        Thin wrapper around a Gemini model that serves repeated prompts from cache.
+        One client can be shared by every agent. Raises ValueError without an
+        API key; the SDK itself is only loaded when the model is first used.
+        """
+        gemini_api_key()
+        self.model_name = model_name
+        self._model = None
+        self.cache = cache if cache is not None else get_llm_cache()
+        # Shared by every client: an outage fails fast (CircuitOpenError) in all agents at once
+        self.breaker: CircuitBreaker = get_breaker("Gemini", slow_call_seconds=CIRCUIT_LLM_SLOW_CALL_SECONDS)
+
+    @property
+    def model(self) -> Any:
+        """The Gemini model, created on first use"""
+        if self._model is None:
+            self._model = configure_gemini().GenerativeModel(self.model_name)
+        return self._model
+
+    async def generate(self, prompt: str, call_site: str = "default", deadline: Optional[Deadline] = None,
+                       use_cache: bool = True) -> str:
+        """
+        Return the response text for a prompt, using the cache when possible; tokens count against the request.
+        use_cache=False always asks Gemini and stores nothing (health probes).
+        """
+        with span("llm.generate", call_site=call_site, model=self.model_name) as llm_span:
+            key = make_cache_key(self.model_name, prompt)
+            cached = await self.cache.aget(key, call_site) if use_cache else None
+            if cached is not None:
+                llm_span.set_attributes(cached=True, **token_usage(prompt, cached))
+                record_tokens(call_site, 0, 0, cached=True)
+                return cached
+
+            check_budget(call_site, estimate_tokens(prompt))
+            with self.breaker.guard(), time_stage(call_site, "gemini"):
+                if deadline is not None:
+                    response = await deadline.wait_for(self.model.generate_content_async(prompt))
+                else:
+                    response = await self.model.generate_content_async(prompt)
+                text = response.text
+            self._account(llm_span, call_site, token_usage(prompt, text, response))
+            if use_cache:
+                await self.cache.aset(key, text, get_ttl(call_site))
+            return text
+
+    async def stream(self, prompt: str, call_site: str = "default",
+                     deadline: Optional[Deadline] = None) -> AsyncIterator[str]:
+        """
+        Yield response text chunks as Gemini produces them (a cache hit yields once).
+        With a deadline, raises asyncio.TimeoutError once the budget is spent;
+        raises CircuitOpenError while Gemini's circuit is open and
+        TokenBudgetExceeded when the request can't afford the prompt.
+        """
+        with span("llm.stream", call_site=call_site, model=self.model_name) as llm_span:
+            key = make_cache_key(self.model_name, prompt)
+            cached = await self.cache.aget(key, call_site)
+            if cached is not None:
+                llm_span.set_attributes(cached=True, **token_usage(prompt, cached))
+                record_tokens(call_site, 0, 0, cached=True)
+                yield cached
+                return
+
+            check_budget(call_site, estimate_tokens(prompt))
+            chunks = []
+            with self.breaker.guard(), time_stage(call_site, "gemini"):
+                request = self.model.generate_content_async(prompt, stream=True)
+                response = await (deadline.wait_for(request) if deadline is not None else request)
+                iterator = response.__aiter__()
+                while True:
+                    try:
+                        next_chunk = iterator.__anext__()
+                        chunk = await (deadline.wait_for(next_chunk) if deadline is not None else next_chunk)
+                    except StopAsyncIteration:
+                        break
+                    text = chunk.text
+                    if text:
+                        chunks.append(text)
+                        yield text
+            text = "".join(chunks)
+            self._account(llm_span, call_site, token_usage(prompt, text, response))
+            await self.cache.aset(key, text, get_ttl(call_site))
+
+    @staticmethod
+    def _account(llm_span: Any, call_site: str, usage: Dict[str, Any]) -> None:
+        """Attach token counts to the trace and charge them to the request and call site"""
+        llm_span.set_attributes(cached=False, **usage)
+        record_tokens(call_site, usage["prompt_tokens"], usage["response_tokens"], usage["tokens_estimated"])
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly four characters per token for English text"""
+    return len(text) // 4
+
+
+def token_usage(prompt: str, text: str, response: Any = None) -> Dict[str, Any]:
+    """Prompt and response token counts from Gemini's usage metadata, estimated when it is missing"""
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", None)
+    response_tokens = getattr(usage, "candidates_token_count", None)
+    if prompt_tokens is None or response_tokens is None:
+        return {"prompt_tokens": estimate_tokens(prompt), "response_tokens": estimate_tokens(text),
+                "tokens_estimated": True}
+    return {"prompt_tokens": prompt_tokens, "response_tokens": response_tokens, "tokens_estimated": False}
@@ -0,0 +1,181 @@
+# tools/metrics.py - Minimal metrics registry rendered in the Prometheus text format
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tools.provider_stats import LatencyHistogram
+
+# Pipeline stages run from tens of milliseconds (cached fetches) to tens of seconds (LLM synthesis)
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, object]) -> LabelKey:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self.values.items())]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        self.values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = STAGE_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        self.children: Dict[LabelKey, LatencyHistogram] = {}
+
+    def observe(self, seconds: float, **labels) -> None:
+        key = self._key(labels)
+        child = self.children.get(key)
+        if child is None:
+            child = self.children[key] = LatencyHistogram(self.buckets)
+        child.observe(seconds)
+
+    def get(self, **labels) -> Optional[LatencyHistogram]:
+        return self.children.get(self._key(labels))
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, child in sorted(self.children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), child.counts):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Named metrics plus collectors that refresh gauges from other components at scrape time"""
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+
+    def _get_or_create(self, cls, name: str, help_text: str, labelnames: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help_text, labelnames, **kwargs)
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = STAGE_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def on_collect(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """Run collector before every render (e.g. to copy cache hit ratios into gauges)"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """The whole registry in the Prometheus text exposition format (version 0.0.4)"""
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+        lines = []
+        for _, metric in sorted(self._metrics.items()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_default_registry: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+    return _default_registry
+
+
+def observe_stage(stage: str, seconds: float, target: str = "") -> None:
+    """Record the latency of one pipeline stage (an LLM call site, a provider fetch, an RSS feed)"""
+    get_metrics().histogram(
+        "briefing_stage_duration_seconds", "Latency of each briefing pipeline stage", ("stage", "target")
+    ).observe(seconds, stage=stage, target=target)
+
+
+@contextmanager
+def time_stage(stage: str, target: str = "") -> Iterator[None]:
+    """Time the block as one stage; cancelled work (a hedge that lost) is not observed"""
+    started = time.monotonic()
+    try:
+        yield
+    except (asyncio.CancelledError, GeneratorExit):
+        raise
+    except BaseException:
+        observe_stage(stage, time.monotonic() - started, target)
+        raise
+    observe_stage(stage, time.monotonic() - started, target)
+
+
+def record_upstream_error(upstream: str) -> None:
+    get_metrics().counter(
+        "briefing_upstream_errors_total", "Failed or too-slow calls per upstream dependency", ("upstream",)
+    ).inc(upstream=upstream)
@@ -0,0 +1,180 @@
+# tools/news_ingestion.py - Background news ingestion into the local article store
+import asyncio
+import os
+import time
+from typing import IO, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: no advisory locks, every process ingests
+
+from tools.article_store import ArticleStore, NEWS_STORE_ENABLED, get_article_store
+from tools.dedup_index import NearDuplicateIndex
+from tools.enhanced_news_tool import MultiSourceNewsAggregator, get_news_aggregator
+from tools.http_client import close_http_client
+from tools.rate_limiter import get_rate_limiter
+
+# Ingestion configuration (override via environment variables)
+NEWS_INGESTION_ENABLED = os.getenv("NEWS_INGESTION_ENABLED", "false").lower() == "true"
+NEWS_INGESTION_INTERVAL = int(os.getenv("NEWS_INGESTION_INTERVAL", "600"))  # Seconds between sweeps
+NEWS_INGESTION_ARTICLES = int(os.getenv("NEWS_INGESTION_ARTICLES", "20"))  # Articles pulled per category/region
+NEWS_INGESTION_CONCURRENCY = int(os.getenv("NEWS_INGESTION_CONCURRENCY", "2"))  # Pairs refreshed at once
+# rss keeps sweeps off the news APIs' daily quotas, which live requests share; first_n or all also call them
+NEWS_INGESTION_FANOUT = os.getenv("NEWS_INGESTION_FANOUT", "rss").lower()
+NEWS_INGESTION_DEDUP_ENTRIES = 1000  # Stories remembered per category/region between sweeps
+NEWS_INGESTION_LOCK_PATH = os.getenv(
+    "NEWS_INGESTION_LOCK_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "news_ingestion.lock")
+)
+
+
+def store_enabled() -> bool:
+    """The store is consulted whenever it is enabled or fed by the ingestion daemon"""
+    return NEWS_STORE_ENABLED or NEWS_INGESTION_ENABLED
+
+
+class IngestionLock:
+    def __init__(self, path: str = NEWS_INGESTION_LOCK_PATH):
+        """
+        Host-wide advisory lock electing the one process that sweeps: every
+        web worker starts the service, only the lock holder ingests, and a
+        standby takes over at its next interval if the holder exits.
+        """
+        self.path = path
+        self._file: Optional[IO] = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """Take the lock without blocking; True when this process holds it"""
+        if self._file is not None or fcntl is None:
+            return True
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            self._file.close()  # Closing drops the flock
+            self._file = None
+
+
+class NewsIngestionService:
+    def __init__(self,
+                 aggregator: Optional[MultiSourceNewsAggregator] = None,
+                 store: Optional[ArticleStore] = None,
+                 interval: int = NEWS_INGESTION_INTERVAL,
+                 articles_per_pair: int = NEWS_INGESTION_ARTICLES,
+                 fanout_mode: str = NEWS_INGESTION_FANOUT,
+                 lock: Optional[IngestionLock] = None):
+        """
+        Periodically pulls every (category, region) pair configured in the
+        aggregator's RSS feeds and writes the normalized, deduplicated articles
+        to the article store. A sweep touches every pair, so by default it only
+        reads RSS: calling the news APIs too (fanout_mode first_n or all) would
+        spend their daily quotas before live requests get to them. With a
+        lock, sweeps only run while this process holds it.
+        """
+        self.aggregator = aggregator or get_news_aggregator()
+        self.store = store or get_article_store()
+        self.interval = interval
+        self.articles_per_pair = articles_per_pair
+        self.fanout_mode = fanout_mode
+        self.lock = lock
+        self.last_sweep: Optional[float] = None
+        self.last_results: Dict[str, int] = {}
+        self._indexes: Dict[Tuple[str, str], NearDuplicateIndex] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        """Every (category, region) pair with configured feeds"""
+        return [(category, region)
+                for category, regions in self.aggregator.rss_feeds.items()
+                for region in regions]
+
+    async def ingest_pair(self, category: str, region: str) -> int:
+        """Fetch one category/region and store the stories not seen before; returns articles added"""
+        result = await self.aggregator.get_comprehensive_news(category, region, self.articles_per_pair,
+                                                              fanout_mode=self.fanout_mode)
+        index = self._indexes.setdefault(
+            (category, region), NearDuplicateIndex(max_entries=NEWS_INGESTION_DEDUP_ENTRIES)
+        )
+        fresh = [article for article in result.get("articles", []) if index.add(article)]
+        return await asyncio.to_thread(self.store.upsert_articles, category, region, fresh)
+
+    async def run_once(self) -> Dict[str, int]:
+        """Refresh every pair once, a few at a time"""
+        semaphore = asyncio.Semaphore(NEWS_INGESTION_CONCURRENCY)
+
+        async def ingest(category: str, region: str) -> Tuple[str, int]:
+            async with semaphore:
+                try:
+                    return f"{category}/{region}", await self.ingest_pair(category, region)
+                except Exception as e:
+                    print(f"News ingestion failed for {category}/{region}: {e}")
+                    return f"{category}/{region}", -1
+
+        results = await asyncio.gather(*(ingest(category, region) for category, region in self.pairs()))
+        await asyncio.to_thread(self.store.prune)
+        await asyncio.to_thread(get_rate_limiter().ledger.prune)  # Previous days' quota counts
+        self.last_sweep = time.time()
+        self.last_results = dict(results)
+        return self.last_results
+
+    async def _run_forever(self) -> None:
+        while True:
+            if self.lock is None or self.lock.acquire():
+                await self.run_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the periodic sweep on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Cancel the periodic sweep"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.lock is not None:
+            self.lock.release()
+
+    def status(self) -> Dict[str, object]:
+        """Expose the last sweep for health checks"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "leader": self.lock is None or self.lock.held,
+            "interval_seconds": self.interval,
+            "fanout_mode": self.fanout_mode,
+            "pairs": len(self.pairs()),
+            "last_sweep": self.last_sweep,
+            "last_results": dict(self.last_results)
+        }
+
+
+# Run one sweep from the command line to seed the store (from daily_briefing_generator/: python -m tools.news_ingestion)
+if __name__ == "__main__":
+    async def _main():
+        service = NewsIngestionService()
+        results = await service.run_once()
+        for pair, added in results.items():
+            print(f"{pair}: {'failed' if added < 0 else f'{added} new articles'}")
+        await close_http_client()
+
+    asyncio.run(_main())
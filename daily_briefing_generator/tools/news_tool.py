@@ -1,28 +1,27 @@
 # tools/news_tool.py - Multi-API News Aggregator Integration
 import asyncio
-import aiohttp
 import os
-import sys
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
 
-# Try to import the enhanced multi-API system
-try:
-    from enhanced_news_tool import MultiSourceNewsAggregator
-    ENHANCED_AVAILABLE = True
-except ImportError:
-    ENHANCED_AVAILABLE = False
+from tools.http_client import get_session, close_http_client
+from tools.rate_limiter import get_rate_limiter
+from tools.circuit_breaker import UpstreamError, get_breaker, is_upstream_failure
+from tools.enhanced_news_tool import MultiSourceNewsAggregator, get_news_aggregator
+from tools.article_store import NEWS_STORE_MAX_AGE, get_article_store
+from tools.news_ingestion import store_enabled
 
-# Load environment variables
-load_dotenv()
+from models.intent import BriefingIntent, news_region
+from models.deadline import Deadline, timeout_for
 
 
 async def get_news_data(
     query: str = "technology", 
     country: str = "us", 
     category: str = "general",
-    max_articles: int = 5
+    max_articles: int = 5,
+    deadline: Optional[Deadline] = None,
+    aggregator: Optional["MultiSourceNewsAggregator"] = None
 ) -> Dict[str, Any]:
     """
     Enhanced news fetching with multiple APIs and RSS feeds for maximum coverage.
@@ -38,52 +37,98 @@ async def get_news_data(
     - RSS feeds (fallback)
     
     The more API keys you configure, the better the coverage!
+    When the local article store holds fresh articles for the category and
+    region, those are returned without any network call. With a deadline,
+    sources still running when it passes are dropped and partial results returned.
+    Pass the application's aggregator to reuse it; otherwise the shared one is used.
     """
-    
+    region = news_region(country)
+
+    # Serve from the local article store while it is fresh
+    if store_enabled():
+        stored = await _get_stored_news(query, category, region, max_articles)
+        if stored:
+            return stored
+
     # Try enhanced multi-API system first
-    if ENHANCED_AVAILABLE:
-        try:
-            aggregator = MultiSourceNewsAggregator()
-            
-            # Map country codes to regions
-            region_map = {
-                "in": "india",
-                "us": "us", 
-                "gb": "uk",
-                "uk": "uk"
-            }
-            region = region_map.get(country, "global")
-            
-            result = await aggregator.get_comprehensive_news(category, region, max_articles)
-            
-            # Convert to expected format
-            return {
-                "status": result["status"],
-                "total_results": result["total_results"],
-                "articles": result["articles"],
-                "apis_used": result.get("apis_used", []),
-                "sources_used": result.get("sources_used", [])
-            }
-        except Exception as e:
-            print(f"Enhanced system error, falling back to basic: {e}")
+    try:
+        aggregator = aggregator or get_news_aggregator()
+        result = await aggregator.get_comprehensive_news(category, region, max_articles, deadline=deadline)
+
+        # Write through so the next request for this category/region is local
+        if store_enabled() and result.get("articles"):
+            await asyncio.to_thread(get_article_store().upsert_articles, category, region, result["articles"])
+        
+        # Convert to expected format
+        return {
+            "status": result["status"],
+            "total_results": result["total_results"],
+            "articles": result["articles"],
+            "apis_used": result.get("apis_used", []),
+            "sources_used": result.get("sources_used", [])
+        }
+    except Exception as e:
+        print(f"Enhanced system error, falling back to basic: {e}")
     
     # Fallback to original enhanced NewsAPI system
-    return await _get_news_data_fallback(query, country, category, max_articles)
+    return await _get_news_data_fallback(query, country, category, max_articles, deadline)
 
 
-async def _get_news_data_fallback(query: str, country: str, category: str, max_articles: int) -> Dict[str, Any]:
+async def _get_stored_news(query: str, category: str, region: str, max_articles: int) -> Optional[Dict[str, Any]]:
+    """Answer from the article store, or None when it has nothing fresh"""
+    try:
+        store = get_article_store()
+        if not await asyncio.to_thread(store.is_fresh, category, region, NEWS_STORE_MAX_AGE):
+            return None
+        articles = await asyncio.to_thread(store.get_articles, category, region, max_articles, query)
+    except Exception as e:
+        print(f"Article store unavailable, fetching live: {e}")
+        return None
+    if not articles:
+        return None
+    return {
+        "status": "success",
+        "total_results": len(articles),
+        "articles": articles,
+        "apis_used": [],
+        "sources_used": ["ArticleStore"]
+    }
+
+
+async def get_news_for_intent(intent: BriefingIntent, deadline: Optional[Deadline] = None,
+                              aggregator: Optional["MultiSourceNewsAggregator"] = None) -> Dict[str, Any]:
+    """Fetch news for a parsed briefing intent, focused on its location when one is set"""
+    category = intent.primary_category
+    location = intent.news_location or intent.city
+
+    # Location-specific query: "Mumbai technology" or "London business"
+    search_query = f"{location} {category}" if location else category
+
+    return await get_news_data(
+        query=search_query,
+        category=category,
+        country=intent.country or "us",
+        max_articles=min(intent.article_count, 10),  # Respect rate limits
+        deadline=deadline,
+        aggregator=aggregator
+    )
+
+
+async def _get_news_data_fallback(query: str, country: str, category: str, max_articles: int,
+                                  deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Fallback news system using enhanced NewsAPI strategies
     """
     # Strategy 1: Try enhanced NewsAPI search
-    result = await _fetch_with_enhanced_newsapi(query, country, category, max_articles)
+    result = await _fetch_with_enhanced_newsapi(query, country, category, max_articles, deadline)
     if result.get("status") == "success" and result.get("articles"):
         return result
     
     # Strategy 2: Try different search terms and parameters
-    result = await _fetch_with_broader_search(query, country, category, max_articles)
-    if result.get("status") == "success" and result.get("articles"):
-        return result
+    if not (deadline and deadline.expired):
+        result = await _fetch_with_broader_search(query, country, category, max_articles, deadline)
+        if result.get("status") == "success" and result.get("articles"):
+            return result
     
     # Strategy 3: Try fallback countries
     fallback_countries = ["us", "in", "gb", "au", "ca"]
@@ -93,13 +138,15 @@ async def _get_news_data_fallback(query: str, country: str, category: str, max_a
     for fallback_country in fallback_countries:
         if fallback_country == country:
             continue
-        result = await _fetch_with_enhanced_newsapi(query, fallback_country, category, max_articles)
+        if deadline and deadline.expired:
+            break
+        result = await _fetch_with_enhanced_newsapi(query, fallback_country, category, max_articles, deadline)
         if result.get("status") == "success" and result.get("articles"):
             return result
     
     # Strategy 4: Try general category if specific category fails
-    if category != "general":
-        result = await _fetch_with_enhanced_newsapi(query, country, "general", max_articles)
+    if category != "general" and not (deadline and deadline.expired):
+        result = await _fetch_with_enhanced_newsapi(query, country, "general", max_articles, deadline)
         if result.get("status") == "success" and result.get("articles"):
             return result
     
@@ -114,24 +161,26 @@ async def _get_news_data_fallback(query: str, country: str, category: str, max_a
     }
 
 
-async def _fetch_with_enhanced_newsapi(query: str, country: str, category: str, max_articles: int) -> Dict[str, Any]:
+async def _fetch_with_enhanced_newsapi(query: str, country: str, category: str, max_articles: int,
+                                       deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """Enhanced NewsAPI fetching with better parameters"""
     api_key = os.getenv("NEWS_API_KEY")
     if not api_key:
         return {"status": "error", "error": "NewsAPI key not found", "articles": []}
     
     # Try top headlines first
-    result = await _try_top_headlines(api_key, country, category, max_articles)
-    if result.get("articles"):
+    result = await _try_top_headlines(api_key, country, category, max_articles, deadline)
+    if result.get("articles") or (deadline and deadline.expired):
         return result
     
     # Try everything endpoint with enhanced search
     search_terms = _create_enhanced_search_terms(query, country, category)
-    result = await _try_everything_search(api_key, search_terms, max_articles)
+    result = await _try_everything_search(api_key, search_terms, max_articles, deadline)
     return result
 
 
-async def _try_top_headlines(api_key: str, country: str, category: str, max_articles: int) -> Dict[str, Any]:
+async def _try_top_headlines(api_key: str, country: str, category: str, max_articles: int,
+                             deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """Try top headlines endpoint"""
     base_url = "https://newsapi.org/v2/top-headlines"
     params = {
@@ -145,10 +194,11 @@ async def _try_top_headlines(api_key: str, country: str, category: str, max_arti
     if category in ["business", "entertainment", "general", "health", "science", "sports", "technology"]:
         params["category"] = category
     
-    return await _make_api_request(base_url, params)
+    return await _make_api_request(base_url, params, deadline)
 
 
-async def _try_everything_search(api_key: str, search_terms: str, max_articles: int) -> Dict[str, Any]:
+async def _try_everything_search(api_key: str, search_terms: str, max_articles: int,
+                                 deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """Try everything endpoint with enhanced search"""
     base_url = "https://newsapi.org/v2/everything"
     params = {
@@ -160,7 +210,7 @@ async def _try_everything_search(api_key: str, search_terms: str, max_articles:
         "from": (datetime.now() - timedelta(days=2)).strftime("%Y-%m-%d")  # Last 2 days
     }
     
-    return await _make_api_request(base_url, params)
+    return await _make_api_request(base_url, params, deadline)
 
 
 def _create_enhanced_search_terms(query: str, country: str, category: str) -> str:
@@ -190,7 +240,8 @@ def _create_enhanced_search_terms(query: str, country: str, category: str) -> st
     return " OR ".join(base_terms)
 
 
-async def _fetch_with_broader_search(query: str, country: str, category: str, max_articles: int) -> Dict[str, Any]:
+async def _fetch_with_broader_search(query: str, country: str, category: str, max_articles: int,
+                                     deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """Try with broader, more flexible search parameters"""
     api_key = os.getenv("NEWS_API_KEY")
     if not api_key:
@@ -216,14 +267,31 @@ async def _fetch_with_broader_search(query: str, country: str, category: str, ma
         "from": (datetime.now() - timedelta(days=3)).strftime("%Y-%m-%d")  # Last 3 days
     }
     
-    return await _make_api_request(base_url, params)
+    return await _make_api_request(base_url, params, deadline)
 
 
-async def _make_api_request(url: str, params: Dict) -> Dict[str, Any]:
+async def _make_api_request(url: str, params: Dict, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """Make API request with enhanced error handling and article filtering"""
+    timeout = timeout_for(deadline, 15)
+    if timeout <= 0:
+        return {"status": "error", "error": "Request deadline exceeded", "articles": []}
+    breaker = get_breaker("NewsAPI")
+    if not breaker.allow():
+        return {"status": "error", "error": "NewsAPI is unavailable (circuit open)", "articles": []}
+    limiter = get_rate_limiter()
+    if not limiter.try_acquire("NewsAPI"):
+        breaker.release()
+        return {"status": "error", "error": "API rate limit exceeded", "articles": []}
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=15) as response:
+        with breaker.track():
+            session = get_session()
+            async with session.get(url, params=params, timeout=timeout) as response:
+                if response.status in (426, 429):
+                    limiter.throttle("NewsAPI")
+                if is_upstream_failure(response.status):
+                    # 429 and 5xx count against the breaker
+                    raise UpstreamError("API rate limit exceeded" if response.status == 429
+                                        else f"API request failed with status {response.status}")
                 if response.status == 200:
                     data = await response.json()
                     articles = data.get("articles", [])
@@ -246,6 +314,8 @@ async def _make_api_request(url: str, params: Dict) -> Dict[str, Any]:
                 else:
                     return {"status": "error", "error": f"API request failed with status {response.status}", "articles": []}
     
+    except UpstreamError as e:
+        return {"status": "error", "error": str(e), "articles": []}
     except asyncio.TimeoutError:
         return {"status": "error", "error": "Request timeout", "articles": []}
     except Exception as e:
@@ -318,6 +388,9 @@ async def test_enhanced_news_tool():
         
         print("-" * 30)
 
+    await close_http_client()
+
 
+# Run from daily_briefing_generator/: python -m tools.news_tool
 if __name__ == "__main__":
     asyncio.run(test_enhanced_news_tool())
@@ -0,0 +1,87 @@
+# tools/provider_stats.py - Per-provider latency histograms for upstream APIs
+import bisect
+from typing import Dict, List, Optional, Sequence
+
+# Bucket upper bounds in seconds (the last bucket catches everything slower)
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Per-bucket counts plus a running sum, enough for quantile estimates and metrics"""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation (None until observed)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.buckets[-1] * 2
+        return self.buckets[-1] * 2
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "mean_seconds": round(self.sum / self.count, 3) if self.count else None,
+            "p50_seconds": self.quantile(0.5),
+            "p95_seconds": self.quantile(0.95),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(self.buckets, self.counts)},
+                "le_inf": self.counts[-1]
+            }
+        }
+
+
+class ProviderStats:
+    def __init__(self):
+        """Latency and outcome counters per upstream provider"""
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.outcomes: Dict[str, Dict[str, int]] = {}
+
+    def record(self, provider: str, seconds: float, outcome: str = "success") -> None:
+        """Record one call; outcome is success, empty, error, cancelled or skipped"""
+        histogram = self.latency.setdefault(provider, LatencyHistogram())
+        # A cancelled call only tells us the provider was slower than the others, not how slow;
+        # a skipped one (rate limited) was never made
+        if outcome not in ("cancelled", "skipped"):
+            histogram.observe(seconds)
+        counts = self.outcomes.setdefault(provider, {})
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+    def expected_latency(self, provider: str, q: float = 0.5) -> Optional[float]:
+        histogram = self.latency.get(provider)
+        return histogram.quantile(q) if histogram else None
+
+    def rank(self, providers: List[str], q: float = 0.5, unknown: float = 1.0) -> List[str]:
+        """Order providers fastest first; providers never measured get the benefit of the doubt"""
+        return sorted(providers, key=lambda provider: self.expected_latency(provider, q) or unknown)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Expose histograms and outcomes for health checks and metrics"""
+        return {
+            provider: {**histogram.snapshot(), "outcomes": dict(self.outcomes.get(provider, {}))}
+            for provider, histogram in self.latency.items()
+        }
+
+
+_default_stats: Optional[ProviderStats] = None
+
+
+def get_provider_stats() -> ProviderStats:
+    """Return the process-wide provider statistics"""
+    global _default_stats
+    if _default_stats is None:
+        _default_stats = ProviderStats()
+    return _default_stats
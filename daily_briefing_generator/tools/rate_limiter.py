@@ -0,0 +1,262 @@
+# tools/rate_limiter.py - Per-provider token buckets and a persisted daily quota ledger
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+# (requests per second, burst size, requests per UTC day; 0 = no daily quota) for each upstream.
+# Plans differ, so daily quotas are opt-in: PROVIDER_DAILY_QUOTAS or PROVIDER_FREE_TIER_QUOTAS=true
+PROVIDER_LIMITS: Dict[str, Tuple[float, int, int]] = {
+    "GNews": (1.0, 2, 0),
+    "NewsAPI": (1.0, 2, 0),
+    "NewsData": (0.5, 2, 0),
+    "MediaStack": (0.5, 1, 0),
+    "Currents": (1.0, 2, 0),
+    "WorldNews": (1.0, 2, 0),
+    "NewsCatcher": (0.5, 1, 0),
+    "OpenWeatherMap": (1.0, 5, 0),
+}
+# Daily quotas of each provider's free tier
+FREE_TIER_DAILY_QUOTAS: Dict[str, int] = {
+    "GNews": 100,
+    "NewsAPI": 100,
+    "NewsData": 200,
+    "MediaStack": 16,  # 500 per month
+    "Currents": 600,
+    "WorldNews": 50,
+    "NewsCatcher": 33,  # 1000 per month
+    "OpenWeatherMap": 1000,
+}
+THROTTLE_SECONDS = 60  # How long a provider is skipped after it answers 429
+
+
+def _parse_overrides(value: str) -> Dict[str, float]:
+    """Parse "GNews=1000,NewsAPI=500" style overrides"""
+    overrides = {}
+    for item in value.split(","):
+        name, _, number = item.partition("=")
+        if name.strip() and number.strip():
+            overrides[name.strip()] = float(number)
+    return overrides
+
+
+# Limits configuration (override via environment variables)
+PROVIDER_DAILY_QUOTAS = _parse_overrides(os.getenv("PROVIDER_DAILY_QUOTAS", ""))
+PROVIDER_RATE_LIMITS = _parse_overrides(os.getenv("PROVIDER_RATE_LIMITS", ""))
+PROVIDER_FREE_TIER_QUOTAS = os.getenv("PROVIDER_FREE_TIER_QUOTAS", "false").lower() == "true"
+QUOTA_FLUSH_INTERVAL = float(os.getenv("QUOTA_FLUSH_INTERVAL", "5"))  # Seconds between ledger writes
+QUOTA_LEDGER_PATH = os.getenv(
+    "QUOTA_LEDGER_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "quota_ledger.sqlite3")
+)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        """Refills rate tokens per second up to capacity; acquiring never waits"""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class QuotaLedger:
+    def __init__(self, path: str = QUOTA_LEDGER_PATH, flush_interval: float = QUOTA_FLUSH_INTERVAL):
+        """
+        Calls made per provider per UTC day, in SQLite so the count survives
+        restarts and is shared by every worker process on the host.
+
+        Calls are counted in memory and written every flush_interval seconds
+        on a worker thread, which also picks up the other workers' counts, so
+        the event loop never waits on SQLite. Between flushes the workers of a
+        host may overshoot a quota by the calls each made since its last flush.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()  # Guards the connection
+        self._state_lock = threading.Lock()  # Guards the in-memory counts; never held during I/O
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS quota_usage (
+                provider TEXT NOT NULL,
+                day TEXT NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (provider, day)
+            )"""
+        )
+        self._conn.commit()
+        self._day = self.today()
+        self._flushed: Dict[str, int] = {}  # Today's counts in the ledger at the last flush
+        self._pending: Dict[Tuple[str, str], int] = {}  # (provider, day) -> calls not yet written
+        self._flushing = False
+        self._flushed_at = 0.0
+        self.flush()
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def try_consume(self, provider: str, daily_limit: int) -> bool:
+        """Count one call against today's quota; False (and nothing counted) when it is used up"""
+        with self._state_lock:
+            self._roll_day()
+            if daily_limit > 0 and self._used(provider) >= daily_limit:
+                return False
+            key = (provider, self._day)
+            self._pending[key] = self._pending.get(key, 0) + 1
+        self._schedule_flush()
+        return True
+
+    def used(self, provider: str) -> int:
+        with self._state_lock:
+            self._roll_day()
+            return self._used(provider)
+
+    def flush(self) -> None:
+        """Write the pending counts and read back today's totals from every worker (blocking: call off the loop)"""
+        with self._state_lock:
+            pending, self._pending = self._pending, {}
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    """INSERT INTO quota_usage (provider, day, used) VALUES (?, ?, ?)
+                       ON CONFLICT (provider, day) DO UPDATE SET used = used + excluded.used""",
+                    [(provider, day, count) for (provider, day), count in pending.items()]
+                )
+                self._conn.commit()
+                day = self.today()
+                rows = self._conn.execute("SELECT provider, used FROM quota_usage WHERE day = ?", (day,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Quota ledger flush failed: {e}")
+            with self._state_lock:
+                for key, count in pending.items():  # Keep the calls counted; the next flush retries
+                    self._pending[key] = self._pending.get(key, 0) + count
+                self._flushing = False
+            return
+        with self._state_lock:
+            self._roll_day()
+            if day == self._day:
+                self._flushed = dict(rows)
+            self._flushed_at = time.monotonic()
+            self._flushing = False
+
+    def prune(self) -> None:
+        """Drop counts from previous days"""
+        with self._lock:
+            self._conn.execute("DELETE FROM quota_usage WHERE day < ?", (self.today(),))
+            self._conn.commit()
+
+    def _used(self, provider: str) -> int:
+        return self._flushed.get(provider, 0) + self._pending.get((provider, self._day), 0)
+
+    def _roll_day(self) -> None:
+        today = self.today()
+        if today != self._day:
+            self._day = today
+            self._flushed = {}
+
+    def _schedule_flush(self) -> None:
+        """Start a flush on a worker thread once the interval passed and none is running"""
+        with self._state_lock:
+            if self._flushing or time.monotonic() - self._flushed_at < self.flush_interval:
+                return
+            self._flushing = True
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self.flush)
+        except RuntimeError:
+            self.flush()  # No event loop (scripts): nothing to block
+
+
+class RateLimiter:
+    def __init__(self, ledger: Optional[QuotaLedger] = None, limits: Optional[Dict[str, Tuple[float, int, int]]] = None):
+        """
+        Decides whether a provider may be called right now. Callers skip the
+        provider instead of waiting when it is rate limited, throttled after a
+        429, or out of daily quota.
+        """
+        self.ledger = ledger or QuotaLedger()
+        self.limits = dict(limits or PROVIDER_LIMITS)
+        if PROVIDER_FREE_TIER_QUOTAS:
+            for name, quota in FREE_TIER_DAILY_QUOTAS.items():
+                rate, burst, _ = self.limits.get(name, (1.0, 1, 0))
+                self.limits[name] = (rate, burst, quota)
+        for name, quota in PROVIDER_DAILY_QUOTAS.items():
+            rate, burst, _ = self.limits.get(name, (1.0, 1, 0))
+            self.limits[name] = (rate, burst, int(quota))
+        for name, rate in PROVIDER_RATE_LIMITS.items():
+            _, burst, quota = self.limits.get(name, (1.0, 1, 0))
+            self.limits[name] = (rate, max(burst, 1), quota)
+        self._buckets = {name: TokenBucket(rate, burst) for name, (rate, burst, _) in self.limits.items()}
+        self._throttled_until: Dict[str, float] = {}
+        self.denied: Dict[str, int] = {}
+
+    def try_acquire(self, provider: str) -> bool:
+        """Take one call's worth of rate and daily quota for provider; unknown providers are unlimited"""
+        if provider not in self.limits:
+            return True
+        if self._throttled_until.get(provider, 0) > time.monotonic() or not self._buckets[provider].try_acquire():
+            return self._deny(provider)
+        if not self.ledger.try_consume(provider, self.limits[provider][2]):
+            return self._deny(provider)
+        return True
+
+    def throttle(self, provider: str, seconds: float = THROTTLE_SECONDS) -> None:
+        """Stop calling a provider for a while after it answered 429 Too Many Requests"""
+        self._throttled_until[provider] = time.monotonic() + seconds
+
+    def remaining(self, provider: str) -> Optional[int]:
+        """Calls left today (None for providers without a quota)"""
+        if self.limits.get(provider, (0, 0, 0))[2] <= 0:
+            return None
+        return max(0, self.limits[provider][2] - self.ledger.used(provider))
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Expose remaining quota and throttling per provider"""
+        now = time.monotonic()
+        return {
+            name: {
+                "daily_quota": quota,
+                "remaining_today": self.remaining(name),
+                "rate_per_second": rate,
+                "throttled_seconds": round(max(0.0, self._throttled_until.get(name, 0) - now), 1),
+                "denied": self.denied.get(name, 0)
+            }
+            for name, (rate, _, quota) in self.limits.items()
+        }
+
+    def _deny(self, provider: str) -> bool:
+        self.denied[provider] = self.denied.get(provider, 0) + 1
+        return False
+
+
+_default_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter"""
+    global _default_limiter
+    if _default_limiter is None:
+        _default_limiter = RateLimiter()
+    return _default_limiter
+
+
+def flush_rate_limiter() -> None:
+    """Write the calls counted since the last flush, if this process made any (blocking: call off the loop)"""
+    if _default_limiter is not None:
+        _default_limiter.ledger.flush()
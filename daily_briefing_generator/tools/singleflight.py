@@ -0,0 +1,82 @@
+# tools/singleflight.py - Coalesce concurrent calls for the same key into one
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0  # Callers that joined after the leader
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        """
+        Concurrent do() calls with the same key share one in-progress
+        computation and all receive its result (or its exception). The
+        computation keeps running if the caller that started it is cancelled,
+        so the other waiters still get an answer.
+        """
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.flights = 0  # Computations actually started
+        self.joined = 0  # Calls served by someone else's computation
+        self.max_waiters = 0
+        self.last_waiters = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return fn()'s result, sharing it with any identical call already in flight"""
+        result, _, _ = await self.do_shared(key, fn)
+        return result
+
+    async def do_shared(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, int, bool]:
+        """Like do(), returning (result, waiters that joined the flight, whether this call joined)"""
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = self.start(key, fn)
+        else:
+            flight.waiters += 1
+            self.joined += 1
+        result = await asyncio.shield(flight.task)
+        return result, flight.waiters, shared
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> _Flight:
+        """Begin a computation for key without waiting on it (no-op if one is running)"""
+        flight = self._flights.get(key)
+        if flight is not None:
+            return flight
+        flight = _Flight(asyncio.ensure_future(fn()))
+        self._flights[key] = flight
+        self.flights += 1
+        flight.task.add_done_callback(lambda task: self._finish(key, flight))
+        return flight
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def waiters(self, key: Hashable) -> Optional[int]:
+        """Joined callers for the flight currently running under key"""
+        flight = self._flights.get(key)
+        return flight.waiters if flight is not None else None
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        self.last_waiters = flight.waiters
+        self.max_waiters = max(self.max_waiters, flight.waiters)
+        if not flight.task.cancelled():
+            flight.task.exception()  # Mark retrieved so abandoned flights don't log warnings
+
+    def stats(self) -> Dict[str, Any]:
+        """Expose coalescing counters for health checks and metrics"""
+        return {
+            "name": self.name,
+            "in_flight": len(self._flights),
+            "flights": self.flights,
+            "joined": self.joined,
+            "max_waiters": self.max_waiters,
+            "last_waiters": self.last_waiters
+        }
@@ -0,0 +1,114 @@
+# tools/token_budget.py - Per-request LLM token accounting and budget
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from tools.metrics import get_metrics
+
+# Token budget configuration (override via environment variables)
+LLM_REQUEST_TOKEN_BUDGET = int(os.getenv("LLM_REQUEST_TOKEN_BUDGET", "0"))  # Prompt + response tokens per request; 0 = unlimited
+
+
+class TokenBudgetExceeded(Exception):
+    """Raised instead of sending a prompt that would take the request over its token budget"""
+
+    def __init__(self, call_site: str, needed: int, remaining: int):
+        super().__init__(f"Token budget exhausted before {call_site} (needs ~{needed}, {remaining} left)")
+        self.call_site = call_site
+
+
+class TokenUsage:
+    def __init__(self, limit: int = LLM_REQUEST_TOKEN_BUDGET):
+        """Tokens spent by one request, in total and per LLM call site"""
+        self.limit = limit
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.calls = 0
+        self.cached_calls = 0
+        self.estimated = False
+        self.by_call_site: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def total(self) -> int:
+        return self.prompt_tokens + self.response_tokens
+
+    def remaining(self) -> Optional[int]:
+        return max(0, self.limit - self.total) if self.limit else None
+
+    def check(self, call_site: str, prompt_tokens: int) -> None:
+        """Refuse a call whose prompt alone no longer fits in the budget"""
+        remaining = self.remaining()
+        if remaining is not None and prompt_tokens > remaining:
+            raise TokenBudgetExceeded(call_site, prompt_tokens, remaining)
+
+    def add(self, call_site: str, prompt_tokens: int, response_tokens: int, estimated: bool = False) -> None:
+        self.prompt_tokens += prompt_tokens
+        self.response_tokens += response_tokens
+        self.calls += 1
+        self.estimated = self.estimated or estimated
+        site = self.by_call_site.setdefault(call_site, {"calls": 0, "prompt_tokens": 0, "response_tokens": 0})
+        site["calls"] += 1
+        site["prompt_tokens"] += prompt_tokens
+        site["response_tokens"] += response_tokens
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "response_tokens": self.response_tokens,
+            "total_tokens": self.total,
+            "budget": self.limit or None,
+            "llm_calls": self.calls,
+            "cached_calls": self.cached_calls,
+            "estimated": self.estimated,
+            "by_call_site": {site: dict(counts) for site, counts in self.by_call_site.items()}
+        }
+
+
+_current_usage: ContextVar[Optional[TokenUsage]] = ContextVar("token_usage", default=None)
+
+
+@contextmanager
+def track_tokens(limit: int = LLM_REQUEST_TOKEN_BUDGET) -> Iterator[TokenUsage]:
+    """
+    Account every LLM call made inside the block (including tasks it starts)
+    to one request, refusing calls once the budget is spent.
+    """
+    usage = TokenUsage(limit)
+    previous = _current_usage.get()
+    _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        # Restore rather than reset(token): a streaming generator may resume in another context
+        _current_usage.set(previous)
+
+
+def current_usage() -> Optional[TokenUsage]:
+    return _current_usage.get()
+
+
+def check_budget(call_site: str, prompt_tokens: int) -> None:
+    """Raise TokenBudgetExceeded when the current request can't afford the prompt"""
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.check(call_site, prompt_tokens)
+
+
+def record_tokens(call_site: str, prompt_tokens: int, response_tokens: int,
+                  estimated: bool = False, cached: bool = False) -> None:
+    """Count one LLM call against the current request and the process-wide per-call-site totals"""
+    registry = get_metrics()
+    registry.counter(
+        "briefing_llm_calls_total", "LLM calls per call site (cached calls cost no tokens)", ("call_site", "cached")
+    ).inc(call_site=call_site, cached=str(cached).lower())
+    usage = _current_usage.get()
+    if cached:
+        if usage is not None:
+            usage.cached_calls += 1
+        return
+    tokens = registry.counter("briefing_llm_tokens_total", "LLM tokens per call site", ("call_site", "direction"))
+    tokens.inc(prompt_tokens, call_site=call_site, direction="prompt")
+    tokens.inc(response_tokens, call_site=call_site, direction="response")
+    if usage is not None:
+        usage.add(call_site, prompt_tokens, response_tokens, estimated)
@@ -0,0 +1,222 @@
+# tools/tracing.py - Lightweight tracing spans propagated through asyncio tasks via contextvars
+import asyncio
+import atexit
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+# Tracing configuration (override via environment variables)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()  # none, console or jsonl
+TRACING_FILE = os.getenv(
+    "TRACING_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "traces.jsonl")
+)
+
+
+class Span:
+    """One timed operation; spans opened while it is current become its children"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_time", "_started", "duration_ms",
+                 "status", "attributes")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.start_time = time.time()
+        self._started = time.monotonic()
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def end(self, status: Optional[str] = None) -> None:
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = round((time.monotonic() - self._started) * 1000, 3)
+        if status:
+            self.status = status
+        _exporter.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+class _NoopSpan:
+    """Stand-in while tracing is off, so instrumented code never has to check"""
+
+    trace_id = span_id = parent_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes) -> None:
+        pass
+
+    def end(self, status: Optional[str] = None) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class ConsoleExporter:
+    def export(self, span: Span) -> None:
+        attributes = " ".join(f"{key}={value}" for key, value in span.attributes.items())
+        print(f"[trace {span.trace_id[:8]}] {span.name} {span.duration_ms:.1f}ms {span.status} {attributes}".rstrip())
+
+
+class JsonlExporter:
+    def __init__(self, path: str = TRACING_FILE):
+        """
+        Append one JSON object per finished span; group by trace_id to rebuild a briefing's tree.
+        A background thread holds the file open and writes the queued spans in batches,
+        so ending a span never touches the disk on the event loop.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()  # Guards the queue and writer pair; never held during I/O
+        atexit.register(self.close)
+
+    def export(self, span: Span) -> None:
+        record = span.to_dict()
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_forever, args=(self._queue,), name="trace-writer", daemon=True
+                )
+                self._writer.start()
+            self._queue.put(record)
+
+    def close(self) -> None:
+        """Write every queued span and stop the writer (blocking: call off the loop)"""
+        with self._lock:
+            writer, spans = self._writer, self._queue
+            self._writer, self._queue = None, queue.SimpleQueue()  # A later span starts a fresh writer
+        if writer is not None:
+            spans.put(None)
+            writer.join()
+
+    def _write_forever(self, spans: "queue.SimpleQueue[Optional[Dict[str, Any]]]") -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = spans.get()
+                while record is not None:
+                    f.write(json.dumps(record, default=str) + "\n")
+                    try:
+                        record = spans.get_nowait()  # Everything already queued goes in the same batch
+                    except queue.Empty:
+                        break
+                f.flush()
+                if record is None:
+                    return  # close(): the queue is drained up to its sentinel
+
+
+class _NoopExporter:
+    def export(self, span: Span) -> None:
+        pass
+
+
+def _make_exporter(name: str):
+    if name == "console":
+        return ConsoleExporter()
+    if name == "jsonl":
+        return JsonlExporter()
+    return None
+
+
+_exporter = _make_exporter(TRACING_EXPORTER) or _NoopExporter()
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def tracing_enabled() -> bool:
+    return not isinstance(_exporter, _NoopExporter)
+
+
+def set_exporter(exporter) -> None:
+    """Install an exporter (anything with export(span)); None turns tracing off"""
+    global _exporter
+    _exporter = exporter or _NoopExporter()
+
+
+def close_tracing() -> None:
+    """Write the spans the exporter still holds (blocking: call off the loop at shutdown)"""
+    close = getattr(_exporter, "close", None)
+    if close is not None:
+        close()
+
+
+def current_span():
+    """The span of the running operation (a no-op span when there is none)"""
+    return _current_span.get() or NOOP_SPAN
+
+
+def start_span(name: str, **attributes):
+    """Start a child of the current span without making it current; the caller must end() it"""
+    if not tracing_enabled():
+        return NOOP_SPAN
+    return Span(name, _current_span.get(), attributes)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Any]:
+    """
+    Trace the block as a child of the current span. Tasks created inside the
+    block copy the context, so their spans nest under this one too.
+    """
+    if not tracing_enabled():
+        yield NOOP_SPAN
+        return
+    parent = _current_span.get()
+    current = Span(name, parent, attributes)
+    _current_span.set(current)
+    status = "ok"
+    try:
+        yield current
+    except (asyncio.CancelledError, GeneratorExit):
+        status = "cancelled"
+        raise
+    except BaseException as e:
+        status = "error"
+        current.set_attribute("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        # Restore rather than reset(token): async generators may resume in another context
+        _current_span.set(parent)
+        current.end(status)
+
+
+async def trace_http_request(request, call_next):
+    """HTTP middleware: a root span per request, with its trace id returned in X-Trace-Id"""
+    if not tracing_enabled():
+        return await call_next(request)
+    with span("http.request", method=request.method, path=request.url.path) as root:
+        response = await call_next(request)
+        root.set_attribute("status_code", response.status_code)
+        response.headers["X-Trace-Id"] = root.trace_id
+        return response
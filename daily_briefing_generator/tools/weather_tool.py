@@ -1,19 +1,254 @@
 # tools/weather_tool.py
 import asyncio
-import aiohttp
+import json
 import os
-from typing import Dict, Any
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Set, Tuple
 
-async def get_weather_data(city: str, country_code: str = "US") -> Dict[str, Any]:
+from tools.http_client import get_session
+from tools.rate_limiter import get_rate_limiter
+from tools.circuit_breaker import UpstreamError, get_breaker, is_upstream_failure
+from tools.metrics import time_stage
+from tools.singleflight import SingleFlight
+from models.intent import BriefingIntent
+from models.deadline import Deadline
+
+# Weather cache configuration (override via environment variables)
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "600"))  # Seconds a reading is fresh
+WEATHER_CACHE_STALE_TTL = int(os.getenv("WEATHER_CACHE_STALE_TTL", "1800"))  # Extra seconds served stale while refreshing
+WEATHER_CACHE_MAX_ENTRIES = int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "500"))
+WEATHER_CACHE_BACKEND = os.getenv("WEATHER_CACHE_BACKEND", "memory").lower()  # memory, or sqlite to share across workers
+WEATHER_CACHE_PATH = os.getenv(
+    "WEATHER_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "weather_cache.sqlite3")
+)
+WEATHER_REQUEST_TIMEOUT = float(os.getenv("WEATHER_REQUEST_TIMEOUT", "10"))  # Upper bound per OpenWeatherMap call
+
+
+class WeatherCache:
+    backend = "memory"
+
+    def __init__(self,
+                 ttl: int = WEATHER_CACHE_TTL,
+                 stale_ttl: int = WEATHER_CACHE_STALE_TTL,
+                 max_entries: int = WEATHER_CACHE_MAX_ENTRIES):
+        """LRU of successful OpenWeatherMap responses keyed on normalized (city, country)"""
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(city: str, country_code: str) -> Tuple[str, str]:
+        """' new  YORK ', 'us' and 'New York', 'US' share one entry"""
+        return " ".join(city.lower().split()), (country_code or "").strip().lower()
+
+    def get(self, key: Tuple[str, str]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Return (data, is_fresh); data is None when missing or too old to serve"""
+        entry = self._load(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+        data, fetched_at = entry
+        age = time.time() - fetched_at
+        if age <= self.ttl:
+            self.hits += 1
+            return data, True
+        if age <= self.ttl + self.stale_ttl:
+            self.stale_hits += 1
+            return data, False
+        self._delete(key)
+        self.misses += 1
+        return None, False
+
+    def set(self, key: Tuple[str, str], data: Dict[str, Any]) -> None:
+        self._store(key, data, time.time())
+
+    async def aget(self, key: Tuple[str, str]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """get() for the event loop; backends doing disk I/O run it on a worker thread"""
+        return self.get(key)
+
+    async def aset(self, key: Tuple[str, str], data: Dict[str, Any]) -> None:
+        self.set(key, data)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Expose hit/miss counters for health checks and metrics"""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": self.backend,
+            "entries": self.size(),
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+            "coalescing": _weather_flights.stats()
+        }
+
+    def _load(self, key: Tuple[str, str]) -> Optional[Tuple[Dict[str, Any], float]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: Tuple[str, str], data: Dict[str, Any], fetched_at: float) -> None:
+        self._entries[key] = (data, fetched_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _delete(self, key: Tuple[str, str]) -> None:
+        self._entries.pop(key, None)
+
+
+class SQLiteWeatherCache(WeatherCache):
+    """Weather cache in a SQLite file, shared by every worker process on the host"""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = WEATHER_CACHE_PATH, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS weather_cache (
+                city TEXT NOT NULL,
+                country TEXT NOT NULL,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (city, country)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_weather_cache_fetched_at ON weather_cache(fetched_at)")
+        self._conn.commit()
+
+    async def aget(self, key: Tuple[str, str]) -> Tuple[Optional[Dict[str, Any]], bool]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: Tuple[str, str], data: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.set, key, data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM weather_cache")
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM weather_cache").fetchone()[0]
+
+    def _load(self, key: Tuple[str, str]) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, fetched_at FROM weather_cache WHERE city = ? AND country = ?", key
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def _store(self, key: Tuple[str, str], data: Dict[str, Any], fetched_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO weather_cache (city, country, data, fetched_at) VALUES (?, ?, ?, ?)",
+                (*key, json.dumps(data), fetched_at)
+            )
+            # Readings are only ever refreshed, so the oldest fetch is the least recently useful
+            self._conn.execute(
+                """DELETE FROM weather_cache WHERE rowid IN (
+                    SELECT rowid FROM weather_cache ORDER BY fetched_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def _delete(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM weather_cache WHERE city = ? AND country = ?", key)
+            self._conn.commit()
+
+
+_weather_cache: Optional[WeatherCache] = None
+_weather_flights = SingleFlight("weather")
+_background_refreshes: Set[asyncio.Future] = set()  # Keep revalidation tasks referenced until done
+
+
+def get_weather_cache() -> WeatherCache:
+    """Return the process-wide weather cache selected by WEATHER_CACHE_BACKEND"""
+    global _weather_cache
+    if _weather_cache is None:
+        _weather_cache = SQLiteWeatherCache() if WEATHER_CACHE_BACKEND == "sqlite" else WeatherCache()
+    return _weather_cache
+
+
+async def get_weather_data(city: str, country_code: str = "US", deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Fetch current weather data for a specified city.
-    
+
     This is your agent's 'hand' to reach into the real world and grab weather data.
+    Readings are cached per city; stale readings are served while a single
+    background refresh runs, and concurrent misses share one upstream call.
+    Each caller waits no longer than its own deadline; the shared call is
+    bounded by WEATHER_REQUEST_TIMEOUT and still caches its reading for
+    whoever asks next.
     """
     api_key = os.getenv("OPENWEATHERMAP_API_KEY")
     if not api_key:
         raise ValueError("OpenWeatherMap API key not found in environment variables")
-    
+
+    key = WeatherCache.make_key(city, country_code)
+    data, is_fresh = await get_weather_cache().aget(key)
+    if data is not None:
+        if not is_fresh and not _weather_flights.in_flight(key):
+            # Stale-while-revalidate: answer now, refresh for the next caller
+            flight = _weather_flights.start(
+                key, lambda: _fetch_and_cache(key, city, country_code, api_key, WEATHER_REQUEST_TIMEOUT)
+            )
+            _background_refreshes.add(flight.task)
+            flight.task.add_done_callback(_background_refreshes.discard)
+        return data
+
+    deadline = deadline or Deadline.after(WEATHER_REQUEST_TIMEOUT)
+    if deadline.expired:
+        return {"error": "Request deadline exceeded"}
+    try:
+        # The shared fetch gets the fixed upstream timeout, not the budget of whichever caller started it;
+        # every caller, leader or joiner, waits only as long as its own deadline allows
+        return await deadline.wait_for(
+            _weather_flights.do(
+                key, lambda: _fetch_and_cache(key, city, country_code, api_key, WEATHER_REQUEST_TIMEOUT)
+            ),
+            cap=WEATHER_REQUEST_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        return {"error": "Request timeout"}
+
+
+async def _fetch_and_cache(key: Tuple[str, str], city: str, country_code: str, api_key: str,
+                           timeout: float) -> Dict[str, Any]:
+    """Call OpenWeatherMap once and cache the reading if it succeeded"""
+    data = await _fetch_weather(city, country_code, api_key, timeout)
+    if "error" not in data:
+        await get_weather_cache().aset(key, data)
+    return data
+
+
+async def _fetch_weather(city: str, country_code: str, api_key: str, timeout: float) -> Dict[str, Any]:
     # Build the API URL
     base_url = "http://api.openweathermap.org/data/2.5/weather"
     params = {
@@ -21,13 +256,37 @@ async def get_weather_data(city: str, country_code: str = "US") -> Dict[str, Any
         "appid": api_key,
         "units": "metric"  # Celsius temperatures
     }
-    
+
+    breaker = get_breaker("OpenWeatherMap")
+    if not breaker.allow():
+        return {"error": "OpenWeatherMap is unavailable (circuit open)"}
+    limiter = get_rate_limiter()
+    if not limiter.try_acquire("OpenWeatherMap"):
+        breaker.release()
+        return {"error": "OpenWeatherMap rate limit or daily quota exhausted"}
+
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(base_url, params=params) as response:
+        with breaker.track(), time_stage("weather_fetch", "OpenWeatherMap"):
+            session = get_session()
+            async with session.get(base_url, params=params, timeout=timeout) as response:
+                if response.status == 429:
+                    limiter.throttle("OpenWeatherMap")
+                if is_upstream_failure(response.status):
+                    raise UpstreamError(f"API request failed with status {response.status}")
                 if response.status == 200:
                     return await response.json()
                 else:
                     return {"error": f"API request failed with status {response.status}"}
+    except UpstreamError as e:
+        return {"error": str(e)}
+    except asyncio.TimeoutError:
+        return {"error": "Request timeout"}
     except Exception as e:
         return {"error": f"Network error: {str(e)}"}
+
+
+async def get_weather_for_intent(intent: BriefingIntent, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """Fetch current weather for the city named in a parsed briefing intent"""
+    if not intent.city:
+        return {"error": "No city specified"}
+    return await get_weather_data(intent.city, intent.weather_country, deadline=deadline)
@@ -4,44 +4,58 @@ Daily Briefing Agent - FastAPI Web Server
 
 Professional web interface for the multi-agent daily briefing system.
 Provides REST API endpoints for weather, news, and comprehensive briefings.
+
+Run from this directory with daily_briefing_generator/ on PYTHONPATH
+(web_interface/start_web_interface.py sets it up).
 """
 
-import sys
-import os
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
 from contextlib import asynccontextmanager
+import os
 
-# Add parent directories to path for agent imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-
-from orchestrator.master_agent import MasterAgent
+from config.settings import configure_logging
+from orchestrator.container import AppContainer
+from tools.news_ingestion import NEWS_INGESTION_ENABLED
+from tools.tracing import trace_http_request
 from routes.briefing import briefing_router
-from routes.health import health_router
+from routes.health import health_router, health_monitor
+from routes.metrics import metrics_router, record_request_metrics
+from static_assets import FRONTEND_DIR, asset_store
 
-# Global master agent instance
-master_agent = None
+configure_logging()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
-    global master_agent
     print("🚀 Initializing Daily Briefing Agent...")
+    asset_store.load()
+    print(f"✅ Frontend assets loaded ({asset_store.stats()['files']} files)")
+    # Shared components, built once; routes receive them through routes.dependencies
+    container = AppContainer()
+    app.state.container = container
+    await container.start_http()
+    print("✅ HTTP connection pool ready")
+    await container.start_rate_limiter()
+    if NEWS_INGESTION_ENABLED:
+        container.start_ingestion()
+        print("✅ News ingestion running")
     try:
-        master_agent = MasterAgent()
+        container.build_agents()
+        container.preload()
         print("✅ Master Agent initialized successfully")
     except Exception as e:
         print(f"⚠️ Failed to initialize Master Agent: {e}")
         print("Server will start but briefing generation will fail until API keys are configured.")
-        master_agent = None
+    health_monitor.start(container)
     
     yield
     
     print("🔄 Shutting down Daily Briefing Agent...")
+    await health_monitor.stop()
+    await container.close()
 
 # Create FastAPI application
 app = FastAPI(
@@ -60,64 +74,51 @@ app.add_middleware(
     allow_credentials=False,  # Must be False when allow_origins=["*"] (CORS spec)
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Coalesced-Waiters", "X-Budget-Remaining-Ms", "X-LLM-Tokens"],  # Quick briefing run details
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="../frontend/static"), name="static")
+# Request counts, latency and concurrency for /metrics
+app.middleware("http")(record_request_metrics)
+# Root tracing span per request (added last, so it wraps the metrics middleware)
+app.middleware("http")(trace_http_request)
 
 # Configure templates (for future use)
-templates = Jinja2Templates(directory="../frontend/templates")
+templates = Jinja2Templates(directory=os.path.join(FRONTEND_DIR, "templates"))
 
 # Include API routes
 app.include_router(briefing_router, prefix="/api/v1")
 app.include_router(health_router, prefix="/api/v1")
+app.include_router(metrics_router)  # Prometheus scrapes /metrics at the root
+
+# Frontend served from memory (see static_assets.py); /static files also under content-hashed names
+@app.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def serve_static(path: str, request: Request):
+    """Serve a frontend static file; hashed names are cacheable forever"""
+    asset = asset_store.get_static(path)
+    if asset is None:
+        return Response(status_code=404)
+    return asset.respond(request)
 
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     """Serve the main briefing interface"""
-    try:
-        with open("../frontend/index.html", "r", encoding="utf-8") as f:
-            html_content = f.read()
-        return HTMLResponse(content=html_content)
-    except FileNotFoundError:
-        return HTMLResponse(content="<h1>Daily Briefing Agent</h1><p>Frontend file not found</p>", status_code=404)
+    return _serve_index(request)
 
 @app.get("/briefing", response_class=HTMLResponse) 
 async def briefing_interface(request: Request):
     """Serve the briefing interface"""
-    try:
-        with open("../frontend/index.html", "r", encoding="utf-8") as f:
-            html_content = f.read()
-        return HTMLResponse(content=html_content)
-    except FileNotFoundError:
-        return HTMLResponse(content="<h1>Daily Briefing Agent</h1><p>Frontend file not found</p>", status_code=404)
+    return _serve_index(request)
 
 @app.get("/config.js")
-async def serve_config_js():
+async def serve_config_js(request: Request):
     """Serve the frontend config.js file (not inside /static/, so needs explicit route)"""
-    from fastapi.responses import FileResponse
-    import os
-    config_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "frontend", "config.js"))
-    if os.path.exists(config_path):
-        return FileResponse(config_path, media_type="application/javascript")
-    # Fallback: serve inline config pointing to the Render URL
-    base_url = "https://multi-agent-orchestrator.onrender.com"
-    inline_config = f"""
-// Auto-generated config fallback
-window.BRIEFING_CONFIG = {{
-    API_BASE_URL: '{base_url}',
-    API_BASE: '/api/v1',
-    BRIEFING_ENDPOINT: '{base_url}/api/v1/briefing',
-    ENABLE_HISTORY: true,
-    ENABLE_DARK_MODE: true,
-    ENABLE_API_DOCS: true,
-    MAX_HISTORY_ITEMS: 50,
-    AUTO_SAVE_HISTORY: true,
-    DEBUG_MODE: false
-}};
-"""
-    from fastapi.responses import Response
-    return Response(content=inline_config, media_type="application/javascript")
+    return asset_store.get_config_js().respond(request)
+
+def _serve_index(request: Request) -> Response:
+    index = asset_store.get_index()
+    if index is None:
+        return HTMLResponse(content="<h1>Daily Briefing Agent</h1><p>Frontend file not found</p>", status_code=404)
+    return index.respond(request)
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -129,22 +130,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
     return {"error": "Internal server error", "details": str(exc)}
 
-def get_master_agent():
-    """Get the global master agent instance"""
-    global master_agent
-    if master_agent is None:
-        raise HTTPException(status_code=503, detail="Master agent not initialized")
-    return master_agent
-
 if __name__ == "__main__":
-    print("🌐 Starting Daily Briefing Agent Web Interface...")
-    print("📍 Access the interface at: http://localhost:8000")
-    print("📚 API Documentation at: http://localhost:8000/docs")
-    
-    uvicorn.run(
-        "app:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    # python app.py [--production] [--workers N]; see server.py
+    from server import main
+    main()
@@ -6,17 +6,47 @@ REST API endpoints for the Daily Briefing Agent system.
 Provides weather, news, and comprehensive briefing services.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Tuple
 import asyncio
+import json
 import logging
+import os
+
+from models.briefing import BriefingOutcome
+from models.deadline import Deadline
+from tools.token_budget import track_tokens
+from orchestrator.master_agent import MasterAgent
+from routes.dependencies import get_master_agent
+from routes.response_cache import response_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 briefing_router = APIRouter(tags=["briefing"])
 
+# Time budget per request; clients may ask for less (or up to the maximum) with X-Request-Budget: <seconds>
+REQUEST_BUDGET_SECONDS = float(os.getenv("REQUEST_BUDGET_SECONDS", "30"))
+MAX_REQUEST_BUDGET_SECONDS = float(os.getenv("MAX_REQUEST_BUDGET_SECONDS", "60"))
+
+# Endpoints where identical concurrent requests share one briefing run
+COALESCE_ENDPOINTS = {
+    "briefing": os.getenv("COALESCE_BRIEFING", "true").lower() == "true",
+    "quick": os.getenv("COALESCE_QUICK_BRIEFING", "true").lower() == "true"
+}
+
+# Seconds GET responses stay fresh in the response cache and downstream caches (0 = not cached)
+QUICK_BRIEFING_MAX_AGE = {
+    "weather": int(os.getenv("QUICK_BRIEFING_MAX_AGE_WEATHER", "600")),
+    "news": int(os.getenv("QUICK_BRIEFING_MAX_AGE_NEWS", "900")),
+    "business": int(os.getenv("QUICK_BRIEFING_MAX_AGE_BUSINESS", "900")),
+    "technology": int(os.getenv("QUICK_BRIEFING_MAX_AGE_TECHNOLOGY", "900")),
+    "complete": int(os.getenv("QUICK_BRIEFING_MAX_AGE_COMPLETE", "600"))
+}
+TEMPLATES_MAX_AGE = int(os.getenv("TEMPLATES_MAX_AGE", "3600"))
+
 # Request/Response models
 class BriefingRequest(BaseModel):
     query: str
@@ -34,7 +64,8 @@ class ErrorResponse(BaseModel):
     details: Optional[str] = None
 
 @briefing_router.post("/briefing", response_model=BriefingResponse)
-async def create_briefing(request: BriefingRequest):
+async def create_briefing(request: BriefingRequest, http_request: Request,
+                          master_agent: MasterAgent = Depends(get_master_agent)):
     """
     Generate a comprehensive daily briefing
     
@@ -42,36 +73,33 @@ async def create_briefing(request: BriefingRequest):
     - **location**: Optional specific location for weather
     - **categories**: Optional news categories filter
     - **use_recovery**: Enable error recovery (default: True)
+    
+    Send `X-Request-Budget: <seconds>` to bound how long the briefing may take.
     """
+    deadline = _request_deadline(http_request)
     try:
-        # Import here to avoid circular imports
-        from app import get_master_agent
-        
-        master_agent = get_master_agent()
-        
         # Build query with optional parameters
-        enhanced_query = request.query
-        if request.location:
-            enhanced_query += f" for {request.location}"
-        if request.categories:
-            enhanced_query += f" with {', '.join(request.categories)} news"
+        enhanced_query = _build_query(request)
         
         logger.info(f"Processing briefing request: {enhanced_query}")
         
         # Generate briefing with or without recovery
-        if request.use_recovery:
-            content = await master_agent.run_with_recovery(enhanced_query)
-        else:
-            content = await master_agent.process_request(enhanced_query)
+        with track_tokens() as token_usage:
+            outcome, waiters = await _generate(master_agent, enhanced_query, bool(request.use_recovery), "briefing", deadline)
         
         return BriefingResponse(
             success=True,
-            content=content,
+            content=outcome.content,
             metadata={
                 "query": enhanced_query,
                 "location": request.location,
                 "categories": request.categories,
-                "recovery_enabled": request.use_recovery
+                "recovery_enabled": request.use_recovery,
+                "degraded": outcome.degraded,
+                "failed_services": list(outcome.failed_services),
+                "coalesced_waiters": waiters,
+                "budget_remaining_ms": round(deadline.remaining() * 1000),
+                "llm_tokens": token_usage.to_dict()
             }
         )
         
@@ -83,18 +111,34 @@ async def create_briefing(request: BriefingRequest):
         )
 
 @briefing_router.get("/briefing/quick/{briefing_type}")
-async def quick_briefing(briefing_type: str, location: Optional[str] = None):
+async def quick_briefing(briefing_type: str, http_request: Request, location: Optional[str] = None,
+                         master_agent: MasterAgent = Depends(get_master_agent)):
     """
     Generate quick briefings for common requests
     
     - **briefing_type**: weather, news, business, technology, or complete
     - **location**: Optional location for weather briefings
+    
+    Responses are cached per type and location for QUICK_BRIEFING_MAX_AGE seconds
+    and carry an ETag; send `If-None-Match` to get `304 Not Modified` back.
+    Only briefings every stage completed are cached; degraded ones are sent
+    with `Cache-Control: no-store`. The body (and so the ETag) holds the
+    briefing alone: details of the run that built it come back in the
+    X-Coalesced-Waiters, X-Budget-Remaining-Ms and X-LLM-Tokens headers.
     """
+    deadline = _request_deadline(http_request)
+    run_headers: Dict[str, str] = {}
+    response = await response_cache.respond(
+        http_request, "quick", QUICK_BRIEFING_MAX_AGE.get(briefing_type, 0),
+        lambda: _quick_briefing(briefing_type, location, master_agent, deadline, run_headers),
+        cacheable=lambda briefing: not briefing.metadata["degraded"]
+    )
+    response.headers.update(run_headers)  # Empty when served from cache
+    return response
+
+async def _quick_briefing(briefing_type: str, location: Optional[str], master_agent: MasterAgent,
+                          deadline: Deadline, run_headers: Dict[str, str]) -> BriefingResponse:
     try:
-        from app import get_master_agent
-        
-        master_agent = get_master_agent()
-        
         # Define quick briefing templates
         templates = {
             "weather": f"Weather for {location or 'default location'}",
@@ -113,15 +157,23 @@ async def quick_briefing(briefing_type: str, location: Optional[str] = None):
         query = templates[briefing_type]
         logger.info(f"Processing quick briefing: {query}")
         
-        content = await master_agent.run_with_recovery(query)
+        with track_tokens() as token_usage:
+            outcome, waiters = await _generate(master_agent, query, True, "quick", deadline)
         
+        run_headers.update({
+            "X-Coalesced-Waiters": str(waiters),
+            "X-Budget-Remaining-Ms": str(round(deadline.remaining() * 1000)),
+            "X-LLM-Tokens": str(token_usage.total)
+        })
         return BriefingResponse(
             success=True,
-            content=content,
+            content=outcome.content,
             metadata={
                 "briefing_type": briefing_type,
                 "location": location,
-                "query": query
+                "query": query,
+                "degraded": outcome.degraded,
+                "failed_services": list(outcome.failed_services)
             }
         )
         
@@ -133,19 +185,82 @@ async def quick_briefing(briefing_type: str, location: Optional[str] = None):
         )
 
 @briefing_router.post("/briefing/stream")
-async def stream_briefing(request: BriefingRequest):
+async def stream_briefing(request: BriefingRequest, http_request: Request,
+                          master_agent: MasterAgent = Depends(get_master_agent)):
     """
-    Generate briefing with streaming response (future implementation)
+    Generate a briefing as a stream of events
+    
+    Emits Server-Sent Events by default, or newline-delimited JSON when the
+    client sends `Accept: application/x-ndjson`. Events arrive in order:
+    
+    - **analysis**: parsed intent, as soon as request analysis finishes
+    - **weather** / **news**: each sub-agent's result as soon as it completes
+    - **synthesis**: final briefing text chunks as the LLM streams them
+    - **done** (or **error**): end of stream
     """
-    # Placeholder for streaming implementation
-    raise HTTPException(
-        status_code=501,
-        detail="Streaming briefings not yet implemented"
+    deadline = _request_deadline(http_request)
+    enhanced_query = _build_query(request)
+    use_ndjson = "application/x-ndjson" in http_request.headers.get("accept", "")
+    
+    logger.info(f"Streaming briefing request: {enhanced_query}")
+    
+    async def event_stream():
+        # Send something immediately so proxies and browsers open the stream
+        yield _format_event({"event": "started", "data": {"query": enhanced_query}}, use_ndjson)
+        with track_tokens() as token_usage:
+            async for event in master_agent.stream_request(enhanced_query, deadline):
+                if event["event"] == "done":
+                    event["data"]["llm_tokens"] = token_usage.to_dict()
+                yield _format_event(event, use_ndjson)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson" if use_ndjson else "text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable nginx response buffering
+        }
     )
 
+async def _generate(master_agent: MasterAgent, query: str, use_recovery: bool, endpoint: str,
+                    deadline: Deadline) -> Tuple[BriefingOutcome, int]:
+    """Run the briefing, joining an identical in-flight run when the endpoint allows it"""
+    if COALESCE_ENDPOINTS.get(endpoint, False):
+        return await master_agent.run_shared(query, use_recovery, deadline)
+    return await master_agent.run_briefing(query, use_recovery, deadline), 0
+
+def _request_deadline(http_request: Request) -> Deadline:
+    """Start the request's deadline from the client's X-Request-Budget header (seconds)"""
+    budget = REQUEST_BUDGET_SECONDS
+    header = http_request.headers.get("x-request-budget")
+    if header:
+        try:
+            budget = min(max(float(header), 0.5), MAX_REQUEST_BUDGET_SECONDS)
+        except ValueError:
+            pass  # Ignore malformed budgets and use the default
+    return Deadline.after(budget)
+
+def _build_query(request: BriefingRequest) -> str:
+    """Fold the optional location and categories into the natural language query"""
+    enhanced_query = request.query
+    if request.location:
+        enhanced_query += f" for {request.location}"
+    if request.categories:
+        enhanced_query += f" with {', '.join(request.categories)} news"
+    return enhanced_query
+
+def _format_event(event: Dict[str, Any], use_ndjson: bool) -> str:
+    """Serialize a pipeline event as an SSE frame or an NDJSON line"""
+    if use_ndjson:
+        return json.dumps(event) + "\n"
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
 @briefing_router.get("/briefing/templates")
-async def get_briefing_templates():
-    """Get available briefing templates"""
+async def get_briefing_templates(http_request: Request):
+    """Get available briefing templates (cacheable for TEMPLATES_MAX_AGE seconds)"""
+    return await response_cache.respond(http_request, "templates", TEMPLATES_MAX_AGE, _briefing_templates)
+
+async def _briefing_templates() -> Dict[str, Any]:
     return {
         "templates": [
             {
@@ -0,0 +1,21 @@
+"""
+Route Dependencies
+==================
+
+FastAPI dependencies handing routes the components the application lifespan built.
+"""
+
+from fastapi import Depends, HTTPException, Request
+
+from orchestrator.container import AppContainer
+from orchestrator.master_agent import MasterAgent
+
+def get_container(request: Request) -> AppContainer:
+    """The application's shared components (see app.lifespan)"""
+    return request.app.state.container
+
+def get_master_agent(container: AppContainer = Depends(get_container)) -> MasterAgent:
+    """The shared master agent; 503 while it could not be built (e.g. no Gemini API key)"""
+    if container.master_agent is None:
+        raise HTTPException(status_code=503, detail="Master agent not initialized")
+    return container.master_agent
@@ -5,16 +5,37 @@ Health Check API Routes
 System health and status monitoring endpoints.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Tuple
 import asyncio
 import time
 from datetime import datetime
 import psutil
 import os
 
+from tools.llm_cache import get_llm_cache
+from tools.weather_tool import get_weather_cache
+from tools.provider_stats import get_provider_stats
+from tools.rate_limiter import get_rate_limiter
+from tools.circuit_breaker import OPEN, get_circuit_breakers
+from routes.metrics import mean_response_ms
+from routes.dependencies import get_container
+from orchestrator.container import AppContainer
+from models.deadline import Deadline
+
 health_router = APIRouter(tags=["health"])
 
+# Health monitor configuration (override via environment variables)
+HEALTH_CANARY_ENABLED = os.getenv("HEALTH_CANARY_ENABLED", "true").lower() == "true"
+HEALTH_CANARY_INTERVAL = float(os.getenv("HEALTH_CANARY_INTERVAL", "300"))  # At most one canary briefing per interval
+HEALTH_CANARY_TIMEOUT = float(os.getenv("HEALTH_CANARY_TIMEOUT", "10"))
+HEALTH_SAMPLE_INTERVAL = float(os.getenv("HEALTH_SAMPLE_INTERVAL", "15"))  # Seconds between system metric samples
+CANARY_PROMPT = "Health check: reply with the single word OK."
+ERROR_PREFIXES = ("I encountered an error", "Sorry, I couldn't")  # Apologies the agents return instead of raising
+NEWS_UPSTREAMS = ("GNews", "NewsAPI", "NewsData", "MediaStack", "Currents", "WorldNews", "NewsCatcher")
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: str
@@ -30,6 +51,134 @@ class SystemStatus(BaseModel):
 # Track service start time
 start_time = time.time()
 
+class HealthMonitor:
+    """
+    Keeps the signals health probes answer from: system metrics sampled in the
+    background, circuit breaker states with the last successful call per
+    dependency, and a canary Gemini call run at most once per interval
+    (skipped while real traffic already shows Gemini answering). The canary
+    bypasses the LLM cache, so a cached answer can't hide an outage. Probes
+    only read this state, so they never call an LLM or block on psutil.
+    """
+
+    def __init__(self, canary_interval: float = HEALTH_CANARY_INTERVAL,
+                 sample_interval: float = HEALTH_SAMPLE_INTERVAL):
+        self.canary_interval = canary_interval
+        self.sample_interval = sample_interval
+        self.system: Dict[str, Any] = {}
+        self.canary: Dict[str, Any] = {"ok": None, "last_run": None, "latency_ms": None, "error": None, "skipped": 0}
+        self.container: Optional[AppContainer] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, container: AppContainer) -> None:
+        """Start sampling (and the canary, once the pipeline is built) on the running event loop"""
+        self.container = container
+        psutil.cpu_percent(interval=None)  # Prime the counter: later calls measure since the previous one
+        self._tasks = [asyncio.create_task(self._sample_forever())]
+        if container.master_agent is not None and HEALTH_CANARY_ENABLED:
+            self._tasks.append(asyncio.create_task(self._canary_forever()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    def sample_system() -> Dict[str, Any]:
+        return {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": psutil.virtual_memory().percent,
+            "disk_percent": psutil.disk_usage('/').percent if os.name != 'nt' else psutil.disk_usage('C:').percent,
+            "process_count": len(psutil.pids()),
+            "sampled_at": time.time()
+        }
+
+    async def _sample_forever(self) -> None:
+        while True:
+            try:
+                self.system = await asyncio.to_thread(self.sample_system)
+            except Exception as e:
+                print(f"Health sampling failed: {e}")
+            await asyncio.sleep(self.sample_interval)
+
+    async def run_canary(self) -> None:
+        """Probe Gemini uncached unless it answered real traffic within the interval"""
+        gemini = get_circuit_breakers().find("Gemini")
+        if gemini is not None and gemini.last_success and time.time() - gemini.last_success < self.canary_interval:
+            self.canary["skipped"] += 1
+            return
+        started = time.monotonic()
+        try:
+            canary = self.container.llm.generate(
+                CANARY_PROMPT, call_site="health_canary", deadline=Deadline.after(HEALTH_CANARY_TIMEOUT), use_cache=False
+            )
+            result = await asyncio.wait_for(canary, timeout=HEALTH_CANARY_TIMEOUT)
+            error = self.output_error(result)
+            self.canary.update(ok=error is None, error=error)
+        except asyncio.TimeoutError:
+            self.canary.update(ok=False, error="timeout")
+        except Exception as e:
+            self.canary.update(ok=False, error=str(e))
+        self.canary.update(last_run=time.time(), latency_ms=round((time.monotonic() - started) * 1000))
+
+    def output_error(self, text: Optional[str]) -> Optional[str]:
+        """Why a probe's output is not a real answer (empty, a canned fallback or an apology), else None"""
+        if not text or not text.strip():
+            return "empty response"
+        master_agent = self.container.master_agent if self.container is not None else None
+        if master_agent is not None and master_agent.is_fallback(text, CANARY_PROMPT):
+            return "fallback response"
+        if text.lstrip().startswith(ERROR_PREFIXES):
+            return "error response"
+        return None
+
+    def agents(self) -> Dict[str, Dict[str, Any]]:
+        """Per-agent status from the breakers of the upstreams each agent depends on, plus the canary"""
+        breakers = get_circuit_breakers().snapshot()
+
+        def status(names: List[str]) -> Dict[str, Any]:
+            upstreams = {name: breakers[name] for name in names if name in breakers}
+            is_open = [snapshot["state"] == OPEN for snapshot in upstreams.values()]
+            # Agents with several sources only go down when every one of them is failing fast
+            state = "circuit open" if is_open and all(is_open) else "healthy"
+            return {"status": state, "upstreams": upstreams}
+
+        canary_ok = self.canary["ok"]
+        llm = status(["Gemini"])
+        if canary_ok is False:
+            llm["status"] = "canary failed"
+        llm["canary"] = dict(self.canary)
+        return {
+            "weather_agent": status(["OpenWeatherMap"]),
+            "news_agent": status([name for name in breakers if name in NEWS_UPSTREAMS or name.startswith("rss:")]),
+            "llm": llm
+        }
+
+    async def _canary_forever(self) -> None:
+        while self.container.preloading():
+            await asyncio.sleep(0.1)  # Let the SDKs finish loading off the event loop first
+        while True:
+            await self.run_canary()
+            await asyncio.sleep(self.canary_interval)
+
+    def readiness(self) -> Tuple[bool, List[str]]:
+        """Ready unless the pipeline is missing or still loading, Gemini's circuit is open or the canary failed"""
+        reasons = []
+        if self.container is None or self.container.master_agent is None:
+            reasons.append("master agent not initialized")
+        elif self.container.preloading():
+            reasons.append("SDKs loading")
+        gemini = get_circuit_breakers().find("Gemini")
+        if gemini is not None and gemini.state == OPEN:
+            reasons.append("Gemini circuit open")
+        if self.canary["ok"] is False:
+            reasons.append(f"canary failed: {self.canary['error']}")
+        return not reasons, reasons
+
+# Process-wide monitor, started by the application lifespan
+health_monitor = HealthMonitor()
+
 @health_router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Basic health check endpoint"""
@@ -41,57 +190,43 @@ async def health_check():
     )
 
 @health_router.get("/health/detailed", response_model=SystemStatus)
-async def detailed_health_check():
-    """Detailed system health check"""
+async def detailed_health_check(container: AppContainer = Depends(get_container)):
+    """Detailed system health check, served from cached health signals"""
     try:
-        # Import here to avoid circular imports
-        from app import get_master_agent
+        ready, reasons = health_monitor.readiness()
+        breakers = get_circuit_breakers().snapshot()
+        agent_health = health_monitor.agents()  # Same verdicts as /health/agents
         
-        # Test master agent
-        try:
-            master_agent = get_master_agent()
-            master_status = "healthy"
-            
-            # Test basic functionality
-            test_response = await asyncio.wait_for(
-                master_agent.process_request("Health check test"),
-                timeout=5.0
-            )
-            agent_test_status = "passed" if test_response else "failed"
-            
-        except Exception as e:
-            master_status = f"error: {str(e)}"
-            agent_test_status = "failed"
-        
-        # Test individual agents
+        canary_ok = health_monitor.canary["ok"]
         agents_status = {
-            "master_agent": master_status,
-            "weather_agent": "healthy",  # Could add specific tests
-            "news_agent": "healthy",     # Could add specific tests
-            "test_status": agent_test_status
-        }
-        
-        # System metrics
-        system_info = {
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "memory_percent": psutil.virtual_memory().percent,
-            "disk_percent": psutil.disk_usage('/').percent if os.name != 'nt' else psutil.disk_usage('C:').percent,
-            "process_count": len(psutil.pids())
+            "master_agent": "healthy" if "master agent not initialized" not in reasons else "not initialized",
+            "weather_agent": agent_health["weather_agent"]["status"],
+            "news_agent": agent_health["news_agent"]["status"],
+            "llm": agent_health["llm"]["status"],
+            "test_status": "not run" if canary_ok is None else ("passed" if canary_ok else "failed"),
+            "canary": dict(health_monitor.canary)
         }
         
         # Performance metrics
         performance_info = {
             "uptime_seconds": time.time() - start_time,
             "uptime_formatted": f"{(time.time() - start_time) / 3600:.2f} hours",
-            "response_time_ms": 0  # Could implement actual response time tracking
+            "response_time_ms": mean_response_ms(),
+            "llm_cache": get_llm_cache().stats(),
+            "weather_cache": get_weather_cache().stats(),
+            "providers": get_provider_stats().snapshot(),
+            "quotas": get_rate_limiter().snapshot(),
+            "circuit_breakers": breakers
         }
-        
-        overall_status = "healthy" if master_status == "healthy" else "degraded"
+        if container.master_agent is not None:
+            performance_info["briefing_coalescing"] = container.master_agent.briefing_flights.stats()
+        if container.news_ingestion is not None:
+            performance_info["news_ingestion"] = container.news_ingestion.status()
         
         return SystemStatus(
-            status=overall_status,
+            status="healthy" if ready else "degraded",
             agents=agents_status,
-            system=system_info,
+            system=dict(health_monitor.system),
             performance=performance_info
         )
         
@@ -104,71 +239,24 @@ async def detailed_health_check():
         )
 
 @health_router.get("/health/agents")
-async def agents_health_check():
-    """Check health of individual agents"""
-    try:
-        from app import get_master_agent
-        
-        master_agent = get_master_agent()
-        
-        # Test each agent individually
-        results = {}
-        
-        # Test weather agent
-        try:
-            weather_response = await asyncio.wait_for(
-                master_agent.weather_agent.get_weather_briefing("Health check test"),
-                timeout=10.0
-            )
-            results["weather_agent"] = {
-                "status": "healthy" if weather_response else "error",
-                "response_length": len(weather_response) if weather_response else 0
-            }
-        except Exception as e:
-            results["weather_agent"] = {"status": "error", "error": str(e)}
-        
-        # Test news agent
-        try:
-            news_response = await asyncio.wait_for(
-                master_agent.news_agent.get_news_briefing("Health check test"),
-                timeout=10.0
-            )
-            results["news_agent"] = {
-                "status": "healthy" if news_response else "error",
-                "response_length": len(news_response) if news_response else 0
-            }
-        except Exception as e:
-            results["news_agent"] = {"status": "error", "error": str(e)}
-        
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "agents": results
-        }
-        
-    except Exception as e:
-        return {
-            "timestamp": datetime.now().isoformat(),
-            "error": str(e),
-            "agents": {}
-        }
+async def agents_health_check(container: AppContainer = Depends(get_container)):
+    """Health of individual agents, served from the monitor's cached state (never runs a briefing)"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "master_agent": "healthy" if container.master_agent is not None else "not initialized",
+        "agents": health_monitor.agents()
+    }
 
 @health_router.get("/health/ready")
 async def readiness_check():
-    """Kubernetes-style readiness check"""
-    try:
-        from app import get_master_agent
-        master_agent = get_master_agent()
-        
-        # Quick test of core functionality
-        test_response = await asyncio.wait_for(
-            master_agent.process_request("Ready check"),
-            timeout=3.0
-        )
-        
+    """Kubernetes-style readiness check (503 while not ready), answered from cached state"""
+    ready, reasons = health_monitor.readiness()
+    if ready:
         return {"status": "ready", "timestamp": datetime.now().isoformat()}
-        
-    except Exception as e:
-        return {"status": "not_ready", "error": str(e), "timestamp": datetime.now().isoformat()}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "not_ready", "error": "; ".join(reasons), "timestamp": datetime.now().isoformat()}
+    )
 
 @health_router.get("/health/live")
 async def liveness_check():
@@ -0,0 +1,100 @@
+"""
+Metrics API Routes
+==================
+
+Prometheus scrape endpoint and the HTTP request metrics middleware.
+"""
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+import time
+
+from tools.metrics import MetricsRegistry, get_metrics
+from tools.llm_cache import get_llm_cache
+from tools.weather_tool import get_weather_cache
+from tools.rate_limiter import get_rate_limiter
+from tools.circuit_breaker import OPEN, get_circuit_breakers
+from orchestrator.container import AppContainer
+
+metrics_router = APIRouter(tags=["metrics"])
+
+def _request_metrics(registry: MetricsRegistry):
+    return (
+        registry.counter("briefing_http_requests_total", "HTTP requests by endpoint and outcome", ("endpoint", "outcome")),
+        registry.histogram("briefing_http_request_duration_seconds", "HTTP request latency by endpoint", ("endpoint",)),
+        registry.gauge("briefing_http_requests_in_flight", "HTTP requests being served")
+    )
+
+def _outcome(status_code: int) -> str:
+    if status_code >= 500:
+        return "server_error"
+    if status_code >= 400:
+        return "client_error"
+    return "success"
+
+def _endpoint_label(request: Request) -> str:
+    """The matched route template with its router prefix, so path parameters don't explode labels"""
+    route = request.scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    try:
+        rendered = template.format(**request.scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = request.url.path
+    return path[:-len(rendered)] + template if rendered and path.endswith(rendered) else template
+
+async def record_request_metrics(request: Request, call_next):
+    """HTTP middleware: count requests by route template and outcome, time them and track concurrency"""
+    requests_total, duration, in_flight = _request_metrics(get_metrics())
+    started = time.monotonic()
+    in_flight.inc()
+    outcome = "exception"
+    try:
+        response = await call_next(request)
+        outcome = _outcome(response.status_code)
+        return response
+    finally:
+        in_flight.dec()
+        endpoint = _endpoint_label(request)
+        requests_total.inc(endpoint=endpoint, outcome=outcome)
+        duration.observe(time.monotonic() - started, endpoint=endpoint)
+
+def mean_response_ms(prefix: str = "/api/v1/briefing") -> float:
+    """Mean latency of the briefing endpoints so far (0 before the first request)"""
+    _, duration, _ = _request_metrics(get_metrics())
+    children = [child for key, child in duration.children.items() if key[0].startswith(prefix)]
+    count = sum(child.count for child in children)
+    return round(sum(child.sum for child in children) / count * 1000, 1) if count else 0
+
+def _collect_component_metrics(registry: MetricsRegistry) -> None:
+    """Copy cache, breaker and quota state into gauges at scrape time"""
+    hit_ratio = registry.gauge("briefing_cache_hit_ratio", "Share of cache lookups served from cache", ("cache",))
+    entries = registry.gauge("briefing_cache_entries", "Entries held per cache", ("cache",))
+    for name, stats in (("llm", get_llm_cache().stats()), ("weather", get_weather_cache().stats())):
+        hit_ratio.set(stats["hit_ratio"], cache=name)
+        entries.set(stats["entries"], cache=name)
+    circuit_open = registry.gauge("briefing_circuit_open", "1 while an upstream's circuit breaker is open", ("upstream",))
+    for name, breaker in get_circuit_breakers().snapshot().items():
+        circuit_open.set(1 if breaker["state"] == OPEN else 0, upstream=name)
+    quota = registry.gauge("briefing_provider_quota_remaining", "Calls left today per provider with a daily quota", ("provider",))
+    for name, limits in get_rate_limiter().snapshot().items():
+        if limits["remaining_today"] is not None:
+            quota.set(limits["remaining_today"], provider=name)
+
+def _collect_pipeline_metrics(registry: MetricsRegistry, container: Optional[AppContainer]) -> None:
+    """Copy the serving app's coalescing state into gauges (the container lives on app.state)"""
+    if container is not None and container.master_agent is not None:
+        registry.gauge("briefing_pipeline_runs_in_flight", "Briefing pipeline runs executing (after coalescing)").set(
+            container.master_agent.briefing_flights.stats()["in_flight"]
+        )
+
+get_metrics().on_collect(_collect_component_metrics)
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    """Prometheus scrape endpoint"""
+    _collect_pipeline_metrics(get_metrics(), getattr(request.app.state, "container", None))
+    return PlainTextResponse(get_metrics().render(), media_type="text/plain; version=0.0.4; charset=utf-8")
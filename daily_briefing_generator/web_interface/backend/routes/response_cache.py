@@ -0,0 +1,134 @@
+"""
+HTTP Response Cache
+===================
+
+Caches the JSON bodies of cacheable GET endpoints keyed on path plus query,
+and makes them cacheable downstream: strong ETags (a hash of the body),
+Cache-Control and Last-Modified headers, and 304 Not Modified answers to
+If-None-Match / If-Modified-Since so browsers, CDNs and the reverse proxy can
+absorb repeat traffic.
+"""
+
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import Any, Awaitable, Callable, Dict, Optional
+import hashlib
+import os
+import time
+
+from tools.metrics import get_metrics
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+class CachedResponse:
+    def __init__(self, body: bytes, max_age: int):
+        """One rendered JSON body with its validators"""
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.last_modified = int(time.time())
+        self.expires_at = time.time() + max_age
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={max(0, int(self.expires_at - time.time()))}"
+        }
+
+    def not_modified(self, request: Request) -> bool:
+        """Evaluate the request's conditional headers (If-None-Match takes precedence, RFC 9110)"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or self.etag in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return self.last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+class ResponseCache:
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        """Process-wide LRU of rendered GET responses"""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    @staticmethod
+    def make_key(request: Request) -> str:
+        """Path plus query with parameters sorted, so ?a=1&b=2 and ?b=2&a=1 share an entry"""
+        query = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    async def respond(self, request: Request, endpoint: str, max_age: int,
+                      build: Callable[[], Awaitable[Any]],
+                      cacheable: Optional[Callable[[Any], bool]] = None) -> Response:
+        """
+        Serve the cached body while fresh, otherwise build and cache it;
+        answers 304 when the client already holds this exact body.
+        max_age 0, or a built result cacheable() rejects (e.g. a degraded
+        briefing), is served with Cache-Control: no-store.
+        """
+        if max_age <= 0:
+            return _no_store(await build())
+
+        key = self.make_key(request)
+        previous = self._entries.get(key)
+        entry = self._get(key)
+        outcome = "hit"
+        if entry is None:
+            result = await build()
+            if cacheable is not None and not cacheable(result):
+                _record(endpoint, "uncacheable")
+                return _no_store(result)
+            body = JSONResponse(jsonable_encoder(result)).body
+            entry = self._set(key, CachedResponse(body, max_age))
+            if previous is not None and previous.etag == entry.etag:
+                entry.last_modified = previous.last_modified  # Same body: If-Modified-Since keeps matching
+            outcome = "miss"
+        # A rebuilt body that hashes the same still revalidates the client's copy
+        if entry.not_modified(request):
+            outcome = "not_modified"
+            response = Response(status_code=304, headers=entry.headers())
+        else:
+            response = Response(entry.body, media_type="application/json", headers=entry.headers())
+        _record(endpoint, outcome)
+        return response
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_fresh():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _set(self, key: str, entry: CachedResponse) -> CachedResponse:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+def _no_store(result: Any) -> Response:
+    return JSONResponse(jsonable_encoder(result), headers={"Cache-Control": "no-store"})
+
+def _record(endpoint: str, outcome: str) -> None:
+    get_metrics().counter(
+        "briefing_http_cache_total", "Cacheable GET responses by outcome (hit, miss, not_modified, uncacheable)",
+        ("endpoint", "outcome")
+    ).inc(endpoint=endpoint, outcome=outcome)
+
+response_cache = ResponseCache()
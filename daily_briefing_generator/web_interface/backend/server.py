@@ -0,0 +1,86 @@
+"""
+Daily Briefing Agent - Server Launcher
+======================================
+
+Two ways to run the web app:
+  - development: one process with auto-reload
+  - production: one worker process per CPU, no reload, graceful shutdown,
+    heavy SDKs imported before a worker accepts connections and caches
+    shared by all workers through SQLite files under .cache/
+
+Run from this directory with daily_briefing_generator/ on PYTHONPATH:
+  python server.py                          # Development
+  python server.py --production             # WEB_WORKERS or one worker per CPU
+  python server.py --production --workers 4
+"""
+
+import argparse
+import os
+
+from config.settings import load_environment
+
+load_environment()
+
+# Production configuration (override via environment variables)
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "0"))  # Worker processes; 0 = one per CPU
+WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))  # Seconds in-flight requests get on shutdown
+
+# Per-process caches would be duplicated and cold in every worker, so production
+# defaults to the cross-process backends: LLM responses and weather readings in
+# SQLite, news results through the article store. Values set in the environment
+# or .env still win.
+PRODUCTION_ENV_DEFAULTS = {
+    "LLM_CACHE_BACKEND": "sqlite",
+    "WEATHER_CACHE_BACKEND": "sqlite",
+    "NEWS_STORE_ENABLED": "true",
+    "SDK_PRELOAD": "startup",
+}
+
+def worker_count() -> int:
+    """WEB_WORKERS, else the CPUs this process may run on (respects container CPU sets)"""
+    if WEB_WORKERS > 0:
+        return WEB_WORKERS
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def serve(production: bool = False, host: str = "0.0.0.0", port: int = 8000, workers: int = 0) -> None:
+    import uvicorn
+
+    print("🌐 Starting Daily Briefing Agent Web Interface...")
+    print(f"📍 Access the interface at: http://localhost:{port}")
+    print(f"📚 API Documentation at: http://localhost:{port}/docs")
+
+    if not production:
+        # --reload only watches Python files; re-read the frontend when it changes too
+        os.environ.setdefault("STATIC_ASSETS_WATCH", "true")
+        uvicorn.run("app:app", host=host, port=port, reload=True, log_level="info")
+        return
+
+    # Workers are fresh interpreters that inherit this environment
+    for name, value in PRODUCTION_ENV_DEFAULTS.items():
+        os.environ.setdefault(name, value)
+    workers = workers or worker_count()
+    print(f"🏭 Production mode: {workers} workers, {WEB_GRACEFUL_TIMEOUT}s graceful shutdown")
+    # SIGINT/SIGTERM stop accepting connections, let in-flight requests finish, then run the lifespan shutdown
+    uvicorn.run(
+        "app:app",
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=WEB_GRACEFUL_TIMEOUT,
+        log_level="info"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Daily Briefing Agent web interface")
+    parser.add_argument("--production", action="store_true", help="Multiple workers, no reload, shared caches")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes in production (default: one per CPU)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    serve(args.production, args.host, args.port, args.workers)
+
+if __name__ == "__main__":
+    main()
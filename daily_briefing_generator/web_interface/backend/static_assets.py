@@ -0,0 +1,228 @@
+"""
+Static Asset Layer
+==================
+
+Loads the frontend (index.html, config.js and everything under static/) into
+memory once at startup and serves it from there:
+  - gzip and, when the optional `brotli` package is installed, brotli
+    variants are compressed once, and picked per request from Accept-Encoding
+  - every variant carries a strong ETag; If-None-Match gets a 304
+  - /static files are also published under content-hashed names
+    (css/styles.3f2a9c1b.css) that index.html is rewritten to reference, so
+    they are served with a year-long immutable Cache-Control; the HTML and
+    config.js are revalidated on every load instead
+
+With STATIC_ASSETS_WATCH=true (the default for the development server) files
+are re-read when their modification time changes.
+"""
+
+from fastapi import Request, Response
+from typing import Dict, List, Optional, Tuple
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import time
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Optional: pip install brotli to also serve br variants
+
+FRONTEND_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend"))
+STATIC_ASSETS_WATCH = os.getenv("STATIC_ASSETS_WATCH", "false").lower() == "true"
+WATCH_INTERVAL = 1.0  # Seconds between modification time checks while watching
+MIN_COMPRESS_BYTES = 512  # Smaller bodies aren't worth a Content-Encoding
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+# Served when frontend/config.js is missing (e.g. a backend-only deploy)
+FALLBACK_BASE_URL = "https://multi-agent-orchestrator.onrender.com"
+FALLBACK_CONFIG_JS = f"""
+// Auto-generated config fallback
+window.BRIEFING_CONFIG = {{
+    API_BASE_URL: '{FALLBACK_BASE_URL}',
+    API_BASE: '/api/v1',
+    BRIEFING_ENDPOINT: '{FALLBACK_BASE_URL}/api/v1/briefing',
+    ENABLE_HISTORY: true,
+    ENABLE_DARK_MODE: true,
+    ENABLE_API_DOCS: true,
+    MAX_HISTORY_ITEMS: 50,
+    AUTO_SAVE_HISTORY: true,
+    DEBUG_MODE: false
+}};
+"""
+
+# src="static/js/briefing.js?v=8" / href="/static/css/styles.css" in index.html
+STATIC_REFERENCE = re.compile(r'(?P<attr>(?:src|href)=")(?P<slash>/?)static/(?P<name>[^"?#]+)(?:\?[^"]*)?"')
+CONFIG_REFERENCE = re.compile(r'(?P<attr>src=")(?P<slash>/?)config\.js(?:\?[^"]*)?"')
+
+class StaticAsset:
+    def __init__(self, body: bytes, media_type: str, cache_control: str):
+        """One file's bytes, its compressed variants and their ETags"""
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.digest = hashlib.sha256(body).hexdigest()
+        # encoding -> (body, etag); identity is always present
+        self.variants: Dict[str, Tuple[bytes, str]] = {"identity": (body, f'"{self.digest[:32]}"')}
+        if len(body) >= MIN_COMPRESS_BYTES and media_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed["br"] = brotli.compress(body)
+            for encoding, data in compressed.items():
+                if len(data) < len(body):
+                    self.variants[encoding] = (data, f'"{self.digest[:32]}-{encoding}"')
+
+    @property
+    def body(self) -> bytes:
+        return self.variants["identity"][0]
+
+    def respond(self, request: Request) -> Response:
+        """The best variant the client accepts, or 304 when it already holds it"""
+        encoding = _negotiate(request.headers.get("accept-encoding", ""), self.variants)
+        body, etag = self.variants[encoding]
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if len(self.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            if "*" in tags or etag in tags:
+                return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type=self.media_type, headers=headers)
+
+class AssetStore:
+    def __init__(self, frontend_dir: str = FRONTEND_DIR, watch: bool = STATIC_ASSETS_WATCH):
+        """The frontend held in memory; call load() at startup"""
+        self.frontend_dir = frontend_dir
+        self.watch = watch
+        self.index: Optional[StaticAsset] = None
+        self.config_js: Optional[StaticAsset] = None
+        self.static: Dict[str, StaticAsset] = {}  # Plain and hashed names under static/
+        self.hashed_names: Dict[str, str] = {}  # css/styles.css -> css/styles.3f2a9c1b.css
+        self._mtimes: Dict[str, float] = {}
+        self._last_check = 0.0
+
+    def load(self) -> None:
+        """Read, hash and compress every asset, replacing the previous set at once"""
+        mtimes: Dict[str, float] = {}
+        static: Dict[str, StaticAsset] = {}
+        hashed_names: Dict[str, str] = {}
+        static_dir = os.path.join(self.frontend_dir, "static")
+        for name in self._static_files(static_dir):
+            path = os.path.join(static_dir, name)
+            with open(path, "rb") as f:
+                body = f.read()
+            mtimes[path] = os.path.getmtime(path)
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            static[name] = StaticAsset(body, media_type, REVALIDATE)  # Unversioned URL: may change under it
+            hashed = _hashed_name(name, static[name].digest)
+            static[hashed] = StaticAsset(body, media_type, IMMUTABLE)
+            hashed_names[name] = hashed
+
+        config_path = os.path.join(self.frontend_dir, "config.js")
+        config_body = self._read(config_path, mtimes)
+        if config_body is None:
+            config_body = FALLBACK_CONFIG_JS.encode("utf-8")
+        config_js = StaticAsset(config_body, "application/javascript", REVALIDATE)
+
+        index = None
+        index_body = self._read(os.path.join(self.frontend_dir, "index.html"), mtimes)
+        if index_body is not None:
+            html = self._rewrite_references(index_body.decode("utf-8"), hashed_names, config_js)
+            index = StaticAsset(html.encode("utf-8"), "text/html; charset=utf-8", REVALIDATE)
+
+        self.static, self.hashed_names = static, hashed_names
+        self.config_js, self.index = config_js, index
+        self._mtimes = mtimes
+        self._last_check = time.monotonic()
+
+    def refresh(self) -> None:
+        """While watching, reload once any loaded file (or a missing one) changed on disk"""
+        if not self.watch or time.monotonic() - self._last_check < WATCH_INTERVAL:
+            return
+        self._last_check = time.monotonic()
+        current = {path: os.path.getmtime(path) if os.path.exists(path) else 0.0 for path in self._mtimes}
+        static_dir = os.path.join(self.frontend_dir, "static")
+        if current != self._mtimes or len(self._static_files(static_dir)) != len(self.hashed_names):
+            print("🔄 Frontend files changed, reloading static assets")
+            self.load()
+
+    def get_static(self, name: str) -> Optional[StaticAsset]:
+        self.refresh()
+        return self.static.get(name)
+
+    def get_index(self) -> Optional[StaticAsset]:
+        self.refresh()
+        return self.index
+
+    def get_config_js(self) -> Optional[StaticAsset]:
+        self.refresh()
+        return self.config_js
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "files": len(self.hashed_names) + (self.index is not None) + (self.config_js is not None),
+            "bytes": sum(len(self.static[name].body) for name in self.hashed_names),
+            "brotli": brotli is not None,
+            "watching": self.watch
+        }
+
+    @staticmethod
+    def _static_files(static_dir: str) -> List[str]:
+        names = []
+        for root, _, files in os.walk(static_dir):
+            for file_name in files:
+                names.append(os.path.relpath(os.path.join(root, file_name), static_dir).replace(os.sep, "/"))
+        return sorted(names)
+
+    @staticmethod
+    def _read(path: str, mtimes: Dict[str, float]) -> Optional[bytes]:
+        # Missing files are still watched, so creating them triggers a reload
+        mtimes[path] = os.path.getmtime(path) if os.path.exists(path) else 0.0
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _rewrite_references(html: str, hashed_names: Dict[str, str], config_js: StaticAsset) -> str:
+        """Point the page at hashed static names and version config.js by its content"""
+        def static_url(match: "re.Match") -> str:
+            name = hashed_names.get(match.group("name"), match.group("name"))
+            return f'{match.group("attr")}{match.group("slash")}static/{name}"'
+
+        html = STATIC_REFERENCE.sub(static_url, html)
+        return CONFIG_REFERENCE.sub(
+            lambda match: f'{match.group("attr")}{match.group("slash")}config.js?v={config_js.digest[:8]}"', html
+        )
+
+def _hashed_name(name: str, digest: str) -> str:
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{digest[:8]}{extension}"
+
+def _negotiate(accept_encoding: str, variants: Dict[str, Tuple[bytes, str]]) -> str:
+    """Prefer br, then gzip, among the encodings the client accepts (q=0 refuses)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                pass
+        if coding:
+            accepted[coding] = quality
+    for encoding in ("br", "gzip"):
+        if encoding in variants and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+asset_store = AssetStore()
@@ -5,6 +5,9 @@ Daily Briefing Agent - Web Interface Launcher
 
 Quick start script for the Daily Briefing Agent web interface.
 Handles dependency installation, environment setup, and server startup.
+
+    python start_web_interface.py                 # Development server with auto-reload
+    python start_web_interface.py --production    # One worker per CPU, shared caches
 """
 
 import os
@@ -24,8 +27,8 @@ def print_banner():
 
 def check_python_version():
     """Check Python version compatibility"""
-    if sys.version_info < (3, 8):
-        print("❌ Python 3.8 or higher is required")
+    if sys.version_info < (3, 10):
+        print("❌ Python 3.10 or higher is required")
         print(f"Current version: {sys.version}")
         sys.exit(1)
     print(f"✅ Python {sys.version.split()[0]} detected")
@@ -86,8 +89,8 @@ def check_environment():
     else:
         print("✅ All required environment variables found")
 
-def start_server():
-    """Start the web server"""
+def start_server(production=False):
+    """Start the web server (see backend/server.py for the launch modes)"""
     print("\n🌐 Starting web server...")
     
     backend_dir = Path(__file__).parent / "backend"
@@ -106,14 +109,11 @@ def start_server():
         print("   • Health Check: http://localhost:8000/api/v1/health")
         print("\n🔄 Starting server... (Ctrl+C to stop)")
         
-        # Start uvicorn server
-        subprocess.run([
-            sys.executable, "-m", "uvicorn", "app:app",
-            "--host", "0.0.0.0",
-            "--port", "8000",
-            "--reload",
-            "--log-level", "info"
-        ], env=env)
+        # Development reloads on code changes; production runs one worker per CPU
+        command = [sys.executable, "server.py", "--host", "0.0.0.0", "--port", "8000"]
+        if production:
+            command.append("--production")
+        subprocess.run(command, env=env)
         
     except KeyboardInterrupt:
         print("\n\n🛑 Server stopped by user")
@@ -133,8 +133,8 @@ def main():
     
     check_environment()
     
-    # Start the server
-    start_server()
+    # Start the server (--production: multiple workers with shared caches)
+    start_server(production="--production" in sys.argv)
 
 if __name__ == "__main__":
     main()